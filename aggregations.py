@@ -0,0 +1,132 @@
+"""
+Vectorized aggregations shared by the analyses. Every function works on
+whole DataFrame columns (or the exploded issue-label table, which is built
+once per dataset) instead of looping over rows in Python, so the cost
+grows linearly with the number of issues.
+"""
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+
+def explode_labels(issues_df):
+    """
+    Builds the long issue-label table with one row per (issue, label) pair.
+    'row' is the position of the issue in issues_df, 'label' the label name.
+    """
+    if issues_df.empty:
+        return pd.DataFrame({'row': np.array([], dtype=np.int64), 'label': pd.Series([], dtype=object)})
+    labels = issues_df['labels']
+    lengths = np.fromiter((len(x) for x in labels), dtype=np.int64, count=len(labels))
+    return pd.DataFrame({
+        'row': np.repeat(np.arange(len(issues_df), dtype=np.int64), lengths),
+        'label': pd.Series(list(chain.from_iterable(labels)), dtype=object),
+    })
+
+
+def label_counts(issue_labels):
+    """Number of issues carrying each label, most frequent first."""
+    return issue_labels['label'].value_counts()
+
+
+def events_by_author(events, author=None):
+    """Rows of the events table created by author, or all events if author is None."""
+    if author is None:
+        return events
+    return events[(events['author'] == author).to_numpy()]
+
+
+def closed_mask(issues_df):
+    """Boolean array of the issues that are closed and have a closing date."""
+    return ((issues_df['state'] == 'closed') & issues_df['closed_at'].notna()).to_numpy()
+
+
+def resolution_days(issues_df):
+    """
+    Whole days between creation and closing for every closed issue with
+    valid dates, in the order of issues_df.
+    """
+    mask = closed_mask(issues_df) & issues_df['created_at'].notna().to_numpy()
+    closed = issues_df[mask]
+    return (closed['closed_at'] - closed['created_at']).dt.days
+
+
+def monthly_opened_closed(issues_df):
+    """
+    Number of issues opened and closed in each calendar month (1-12),
+    summed over all years.
+    """
+    months = pd.RangeIndex(1, 13, name='month')
+    opened = issues_df['created_at'].dropna().dt.month.value_counts()
+    closed = issues_df.loc[closed_mask(issues_df), 'closed_at'].dt.month.value_counts()
+    return pd.DataFrame({
+        'opened': opened.reindex(months, fill_value=0),
+        'closed': closed.reindex(months, fill_value=0),
+    })
+
+
+def timedelta_ns(deltas):
+    """The timedelta Series deltas as an int64 array of nanoseconds."""
+    unit = np.datetime_data(deltas.dtype)[0]
+    ns_per_unit = int(np.timedelta64(1, unit) // np.timedelta64(1, 'ns'))
+    return deltas.to_numpy().view(np.int64) * ns_per_unit
+
+
+def exact_sums(keys, values):
+    """
+    Exact sum and count of the int64 array values for every distinct key,
+    sorted by key.
+
+    Each value is split into a high and low 32 bit half which are summed
+    separately, so long histories cannot overflow the int64 that a plain sum
+    would use. Tables of sums can be added and subtracted column by column
+    and stay exact; total() gives the sums as Python ints.
+    """
+    high, low = np.divmod(np.asarray(values, dtype=np.int64), 1 << 32)
+    sums = pd.DataFrame({'key': np.asarray(keys, dtype=object), 'high': high, 'low': low}) \
+        .groupby('key', sort=True).agg(high=('high', 'sum'), low=('low', 'sum'), count=('high', 'size'))
+    return sums.rename_axis(None)
+
+
+def total(sums):
+    """The exact totals of a table of exact_sums, as a list of Python ints."""
+    return [(int(h) << 32) + int(l) for h, l in zip(sums['high'], sums['low'])]
+
+
+def timedelta_sums(keys, deltas):
+    """
+    Exact nanosecond sum and count of the timedelta Series deltas for every
+    distinct key, sorted by key. See exact_sums.
+    """
+    return exact_sums(keys, timedelta_ns(deltas))
+
+
+def mean_timedeltas(sums):
+    """Means with nanosecond resolution of a table of timedelta_sums."""
+    means = [pd.Timedelta(int(t / int(n))) for t, n in zip(total(sums), sums['count'])]
+    return pd.Series(means, index=sums.index, dtype='timedelta64[ns]')
+
+
+def mean_timedelta_by(keys, deltas):
+    """
+    Mean of the timedelta Series deltas for every distinct key, sorted by key.
+    The means have nanosecond resolution like a sum of pd.Timedelta objects.
+    """
+    return mean_timedeltas(timedelta_sums(keys, deltas))
+
+
+def label_close_times(issues_df, issue_labels):
+    """
+    Average time from creation to closing of the closed issues carrying
+    each label, sorted alphabetically by label.
+    """
+    mask = closed_mask(issues_df) & issues_df['created_at'].notna().to_numpy()
+    close_time = (issues_df['closed_at'] - issues_df['created_at']).to_numpy()
+
+    # Keep the (issue, label) pairs whose issue is closed
+    rows = issue_labels['row'].to_numpy()
+    keep = mask[rows]
+    deltas = pd.Series(close_time[rows[keep]])
+    return mean_timedelta_by(issue_labels['label'].to_numpy()[keep], deltas).rename_axis('label')
@@ -1,16 +1,78 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import matplotlib.ticker as mticker
 from data_loader import DataLoader
+import config
+import profiling
+import rendering
 
 class Analysis:
-    def _init_(self):
-        """Initialize the Analysis class"""
-        pass
+    # Fields of the dataset the analysis reads, so only they are loaded
+    FIELDS = ['creator', 'state', 'created_at', 'labels', 'closed_at']
+
+    def __init__(self):
+        """
+        Initialize with the label and user parameters from config.
+        """
+        self.LABEL: str = config.get_parameter('label')
+        self.USER: str = config.get_parameter('user') or config.get_parameter('creator')
+
+    def run(self, dataset=None, renderer=None):
+        """
+        Filters the issues by the --label and/or --user given on the command line
+        and visualizes the result. A Dataset that was already loaded can be passed
+        in to share it with other analyses, and a renderer to collect the charts
+        of several analyses.
+        """
+        if self.LABEL is None and self.USER is None:
+            print("Please provide a --user or --label argument")
+            return
+
+        if dataset is None:
+            dataset = DataLoader(fields=self.FIELDS).load_dataset()  # This loads your issues data
+
+        with profiling.stage('aggregate'):
+            results = self.compute(dataset)
+        if results is not None:
+            with profiling.stage('render'):
+                rendering.render_with(renderer, self.render, results)
+
+    def compute(self, dataset):
+        """
+        Filters the issues by the configured label and/or user and analyzes them.
+        Returns the data the charts are drawn from, or None if there is nothing
+        to visualize. Raises ValueError if neither a label nor a user is set,
+        as the analysis is not meant to run over every issue.
+        """
+        if self.LABEL is None and self.USER is None:
+            raise ValueError("Please provide a user or label to filter the issues by")
+
+        # Filter the issues based on the provided label and creator
+        filtered_df = self.filter_issues(dataset.issues, label=self.LABEL, creator=self.USER, index=dataset.index)
+
+        # Perform the analysis on the filtered issues
+        return self.analyze(filtered_df)
+
+    def render(self, results, renderer):
+        """
+        Hands the charts of the analysis, drawn from the results of compute,
+        to the renderer.
+        """
+        renderer.chart('user_label_issue_counts', plot_user_label_issue_counts, results['user_label_issue_counts'])
+        renderer.chart('user_label_counts', plot_user_label_counts, results['user_label_counts'], results['creator'])
+
+    def filter_issues(self, df, label=None, creator=None, index=None):
+        """
+        Filter issues based on a specified label or creator. With the IssueIndex
+        of df the matching issues are looked up in its posting lists, so only
+        they are exploded, from the label matrix, instead of the whole frame.
+        """
+        if index is not None:
+            matches = index.query(label=label or None, creator=creator or None)
+            filtered_df = index.labels.take(matches.positions).explode(index.rows(matches))
+            if label:
+                filtered_df = filtered_df[filtered_df['labels'] == label]
+            print(f"Filtered {len(filtered_df)} issues for label '{label}' and creator '{creator}'")
+            return filtered_df
 
-    def filter_issues(self, df, label=None, creator=None):
-        """Filter issues based on a specified label or creator."""
         # Explode 'labels' column if it is a list, to handle multiple labels per issue
         if 'labels' in df.columns and df['labels'].apply(lambda x: isinstance(x, list)).any():
             df = df.explode('labels')
@@ -26,9 +88,18 @@ class Analysis:
         
     def analyze_and_visualize(self, filtered_df, df):
         """Perform analysis and create visualizations for filtered issues."""
+        results = self.analyze(filtered_df)
+        if results is not None:
+            self.visualize(results)
+
+    def analyze(self, filtered_df):
+        """
+        Perform the analysis of the filtered issues. Returns the data the
+        charts are drawn from, or None if there is nothing to visualize.
+        """
         if filtered_df.empty:
             print("No issues found for the specified label and/or creator. Analysis and visualization skipped.")
-            return
+            return None
         
         # Handle multiple labels in the 'labels' column
         if 'labels' in filtered_df.columns and filtered_df['labels'].apply(lambda x: isinstance(x, list)).any():
@@ -45,58 +116,65 @@ class Analysis:
             avg_time_to_close = closed_issues['time_to_close'].mean()
             print(f"Average time to close (days): {avg_time_to_close:.2f}")
 
-        # Visualization: Issues Opened vs Closed by User and Label
+        # Issues Opened vs Closed by User and Label
         opened_by_user_label = filtered_df.groupby(['creator', 'labels']).size().rename('opened_count')
         closed_by_user_label = closed_issues.groupby(['creator', 'labels']).size().rename('closed_count')
         user_label_counts = filtered_df.groupby('labels').size().sort_values(ascending=False)
+        creator = filtered_df['creator'].iloc[0]
 
         # Check the unique labels used by the creator
-        print(f"Unique labels used by {filtered_df['creator'].iloc[0]}: {user_label_counts.index.tolist()}")
+        print(f"Unique labels used by {creator}: {user_label_counts.index.tolist()}")
 
         if user_label_counts.empty:
-            print(f"No labels found for user '{filtered_df['creator'].iloc[0]}'.")
-            return
+            print(f"No labels found for user '{creator}'.")
+            return None
         # Combine opened and closed counts into a single DataFrame
         user_label_issue_counts = pd.concat([opened_by_user_label, closed_by_user_label], axis=1).fillna(0).astype(int)
 
         if user_label_issue_counts.empty:
             print("No data available for opened/closed issues by user and label. Plotting skipped.")
-            return
-
-        # Plotting opened vs closed issues per user and label
-        ax = user_label_issue_counts.plot(kind='bar', stacked=False, figsize=(14, 8), color=['skyblue', 'salmon'])
-        plt.title('Number of Issues Opened and Closed by User and Label')
-        plt.xlabel('User and Label')
-        plt.ylabel('Issue Count')
-        plt.legend(['Opened Issues', 'Closed Issues'])
-        plt.xticks(rotation=45)
-        plt.ylim(0, 5)  # Set y-axis limits to between 0 and 5 for better clarity
-        plt.grid(axis='y', linestyle='--', alpha=0.7)
-        plt.tight_layout()
-
-        # Ensure the y-axis only shows integer values
-        ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
-
-        plt.show()
-
-        # Now, to visualize the labels used by that particular user
-        # Filter only for the creator user and calculate the frequency of each label for that user
-        user_label_counts = filtered_df.groupby('labels').size().sort_values(ascending=False)
-
-        if user_label_counts.empty:
-            print(f"No labels found for user '{filtered_df['creator'].iloc[0]}'.")
-            return
-
-        # Plotting labels used by the user
-        plt.figure(figsize=(14, 8))
-        user_label_counts.plot(kind='bar', color='lightcoral')
-        plt.title(f'Labels Used by {filtered_df["creator"].iloc[0]}')
-        plt.xlabel('Labels')
-        plt.ylabel('Frequency')
-        plt.xticks(rotation=45, ha='right')
-        plt.tight_layout()
-        plt.show()
-
+            return None
+
+        return {
+            'creator': creator,
+            'user_label_issue_counts': user_label_issue_counts,
+            'user_label_counts': user_label_counts,
+        }
+
+    def visualize(self, results):
+        """Create the visualizations from the results of analyze."""
+        rendering.render_with(None, self.render, results)
+
+
+def plot_user_label_issue_counts(user_label_issue_counts):
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+    # Plotting opened vs closed issues per user and label
+    ax = user_label_issue_counts.plot(kind='bar', stacked=False, figsize=(14, 8), color=['skyblue', 'salmon'])
+    plt.title('Number of Issues Opened and Closed by User and Label')
+    plt.xlabel('User and Label')
+    plt.ylabel('Issue Count')
+    plt.legend(['Opened Issues', 'Closed Issues'])
+    plt.xticks(rotation=45)
+    plt.ylim(0, 5)  # Set y-axis limits to between 0 and 5 for better clarity
+    plt.grid(axis='y', linestyle='--', alpha=0.7)
+    plt.tight_layout()
+
+    # Ensure the y-axis only shows integer values
+    ax.yaxis.set_major_locator(mticker.MaxNLocator(integer=True))
+
+
+def plot_user_label_counts(user_label_counts, creator):
+    import matplotlib.pyplot as plt
+    # Now, to visualize the labels used by that particular user
+    # Plotting labels used by the user
+    plt.figure(figsize=(14, 8))
+    user_label_counts.plot(kind='bar', color='lightcoral')
+    plt.title(f'Labels Used by {creator}')
+    plt.xlabel('Labels')
+    plt.ylabel('Frequency')
+    plt.xticks(rotation=45, ha='right')
+    plt.tight_layout()
 
 
 def parse_args():
@@ -0,0 +1,69 @@
+"""
+Compares opening the columnar form of a synthetic export (columnar.py) with
+loading the same dataset from a warm on-disk cache, in compact form both, for
+every field and for the fields of each feature. Also reports the size on disk
+of the JSON export, the cache entry and the columnar directory.
+
+Run from the repository root with:
+    python -m benchmarks.bench_columnar [--count N]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.bench_pipeline import FEATURES, dataset_path, make_loader
+from cache import IssueCache
+from columnar import open_columnar, write_columnar
+
+
+def fastest(load, repeat=3):
+    """The fastest of repeat calls of load in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        load()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def size_mib(path):
+    """Size of the file or directory tree at path in MiB."""
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 2**20
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, names in os.walk(path) for name in names) / 2**20
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_columnar")
+    ap.add_argument('--count', '-n', type=int, default=100000,
+                    help='Number of synthetic issues to load')
+    args = ap.parse_args()
+
+    path = dataset_path(args.count, 0)
+    with tempfile.TemporaryDirectory() as work_dir:
+        cache_dir = os.path.join(work_dir, 'cache')
+        columnar_path = os.path.join(work_dir, 'issues.columnar')
+
+        def cached_loader(fields=None):
+            loader = make_loader(path, fields=fields)
+            loader.cache, loader.compact = IssueCache(cache_dir), True
+            return loader
+
+        dataset = cached_loader().load_dataset()
+        write_columnar(dataset, columnar_path)
+        print(f"{len(dataset.issues)} issues, {len(dataset.events)} events")
+        print(f"  on disk: JSON {size_mib(path):.1f} MiB, cache {size_mib(cache_dir):.1f} MiB, "
+              f"columnar {size_mib(columnar_path):.1f} MiB")
+        print(f"  {'load':<12}{'cache s':>10}{'columnar s':>12}")
+        loads = [('all', None)] + [(f'feature {feature}', cls.FIELDS) for feature, cls in FEATURES.items()]
+        for name, fields in loads:
+            cached = fastest(lambda: cached_loader(fields).load_dataset())
+            columnar = fastest(lambda: open_columnar(columnar_path, fields))
+            print(f"  {name:<12}{cached:>10.3f}{columnar:>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Compares the processed issues DataFrame with its compact form, in which
+the creator, state and closed_by columns are categoricals and the labels
+are held by a sparse LabelMatrix instead of a column of Python lists.
+Reports memory_usage(deep=True) per column and the time of label counts,
+a label filter and a per-label aggregate on both forms.
+
+Run from the repository root with:
+    python -m benchmarks.bench_compact_memory [--count N]
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_pipeline import dataset_path, make_loader
+from data_loader import compact_issues
+from label_matrix import LabelMatrix
+
+# Label used for the filter and the per-label aggregate
+LABEL = 'kind/bug'
+
+
+def best_time(fn, repeat=5):
+    """Fastest of repeat runs of fn, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_compact_memory")
+    ap.add_argument('--count', '-n', type=int, default=100000,
+                    help='Number of synthetic issues to load')
+    args = ap.parse_args()
+
+    issues_df = make_loader(dataset_path(args.count, 0)).load_dataset().issues
+    labels = LabelMatrix.from_lists(issues_df['labels'])
+    compact_df = compact_issues(issues_df)
+
+    full_usage = issues_df.memory_usage(deep=True)
+    compact_usage = compact_df.memory_usage(deep=True)
+    compact_usage['labels'] = labels.nbytes
+    print(f"{len(issues_df)} issues, {len(labels.indices)} labels of {len(labels.vocabulary)} distinct names")
+    print(f"  {'memory_usage(deep=True)':<24}{'full MiB':>12}{'compact MiB':>12}")
+    for column in full_usage.index:
+        print(f"  {column:<24}{full_usage[column] / 2**20:>12.2f}{compact_usage[column] / 2**20:>12.2f}")
+    print(f"  {'total':<24}{full_usage.sum() / 2**20:>12.2f}{compact_usage.sum() / 2**20:>12.2f}")
+
+    closed = (issues_df['state'] == 'closed').to_numpy()
+    operations = {
+        'label counts': (
+            lambda: issues_df['labels'].explode().value_counts(),
+            lambda: labels.counts(),
+        ),
+        'label filter': (
+            lambda: issues_df[issues_df['labels'].apply(lambda x: LABEL in x)],
+            lambda: compact_df[labels.mask(LABEL)],
+        ),
+        'closed per label': (
+            lambda: issues_df[closed]['labels'].explode().value_counts(),
+            lambda: labels.counts(closed),
+        ),
+    }
+    print(f"\n  {'operation':<24}{'full ms':>12}{'compact ms':>12}")
+    for name, (full, compact) in operations.items():
+        print(f"  {name:<24}{best_time(full) * 1000:>12.2f}{best_time(compact) * 1000:>12.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmarks the timestamp parsing of model.py against the dateutil
+per-call path it replaced.
+
+Run from the repository root with:
+    python -m benchmarks.bench_dates [--count N]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+from dateutil import parser
+
+from model import parse_date, parse_dates
+
+
+def make_timestamps(count, seed=0):
+    """GitHub style ISO-8601 timestamps spread over five years."""
+    rnd = random.Random(seed)
+    start = datetime(2019, 1, 1, tzinfo=timezone.utc)
+    return [(start + timedelta(seconds=rnd.randint(0, 5 * 365 * 86400))).isoformat()
+            for _ in range(count)]
+
+
+def best_of(fn, repeat=3):
+    """Best wall time of fn over a few runs, in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_dates")
+    ap.add_argument('--count', '-n', type=int, default=100000,
+                    help='Number of timestamps to parse')
+    args = ap.parse_args()
+
+    timestamps = make_timestamps(args.count)
+    column = pd.Series(timestamps, dtype=object)
+
+    results = {
+        'dateutil per call': best_of(lambda: [parser.parse(s) for s in timestamps]),
+        'parse_date per call': best_of(lambda: [parse_date(s) for s in timestamps]),
+        'pd.to_datetime column': best_of(lambda: pd.to_datetime(column, errors='coerce')),
+        'parse_dates column': best_of(lambda: parse_dates(column)),
+    }
+
+    baseline = results['dateutil per call']
+    print(f"Parsing {args.count} timestamps:")
+    for name, seconds in results.items():
+        print(f"  {name:<24}{seconds * 1000:>10.1f} ms{baseline / seconds:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+"""
+Times fetch_issues.py against the local mock API (benchmarks.mock_github)
+with a fixed latency per request: a cold fetch one request at a time and
+with concurrent requests, then a conditional fetch from the response cache
+after one issue got a comment. Checks that the written export is the
+synthetic export the mock serves, in the same JSON shape.
+
+Run from the repository root with:
+    python -m benchmarks.bench_fetch [--count N] [--latency SECONDS]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+from benchmarks.mock_github import REPOSITORY, MockApi, start_server
+from benchmarks.synthetic import generate_issues
+from fetch_issues import fetch
+
+
+def expected_export(api, count):
+    """The synthetic issues the mock serves as fetch_issues.py should write them, in creation order."""
+    issues = sorted(generate_issues(count), key=lambda issue: issue['created_date'])
+    for issue in issues:
+        issue['timeline_url'] = f"{api.base_url}/repos/{REPOSITORY}/issues/{issue['number']}/timeline"
+    return issues
+
+
+def run(api, output, concurrency, cache_dir=None):
+    """Fetches the mock's issues into output, returns the seconds taken and the client."""
+    start = time.perf_counter()
+    client = asyncio.run(fetch(REPOSITORY, output, api.base_url, concurrency=concurrency, cache_dir=cache_dir))
+    return time.perf_counter() - start, client
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_fetch")
+    ap.add_argument('--count', '-n', type=int, default=500,
+                    help='Number of synthetic issues served')
+    ap.add_argument('--latency', type=float, default=0.02,
+                    help='Seconds every response of the mock API is delayed by')
+    ap.add_argument('--concurrency', '-c', type=int, default=16,
+                    help='Requests in flight at once in the concurrent runs')
+    args = ap.parse_args()
+
+    api = MockApi(args.count, latency=args.latency)
+    server = start_server(api)
+    expected = expected_export(api, args.count)
+    with tempfile.TemporaryDirectory() as work_dir:
+        output = os.path.join(work_dir, 'issues.json')
+        cache_dir = os.path.join(work_dir, 'api')
+        print(f"{args.count} issues, {args.latency * 1000:.0f} ms per request")
+        print(f"  {'fetch':<24}{'seconds':>10}{'requests':>10}{'304':>8}  export")
+        runs = [('sequential', 1, None), (f'concurrency {args.concurrency}', args.concurrency, cache_dir)]
+        for name, concurrency, cache in runs:
+            seconds, client = run(api, output, concurrency, cache)
+            with open(output, 'r') as f:
+                matches = json.load(f) == expected
+            print(f"  {name:<24}{seconds:>10.2f}{client.requests:>10}{client.not_modified:>8}  "
+                  f"{'matches' if matches else 'DIFFERS'}")
+
+        # Only the commented issue and the page listing it changed
+        number = args.count // 2
+        when = '2024-10-02T12:00:00+00:00'
+        api.comment(number, 'user1', 'A new comment', when)
+        issue = next(issue for issue in expected if issue['number'] == number)
+        issue['updated_date'] = when
+        issue['events'].append({'event_type': 'commented', 'author': 'user1', 'event_date': when,
+                                'comment': 'A new comment'})
+        seconds, client = run(api, output, args.concurrency, cache_dir)
+        with open(output, 'r') as f:
+            matches = json.load(f) == expected
+        print(f"  {'conditional':<24}{seconds:>10.2f}{client.requests:>10}{client.not_modified:>8}  "
+              f"{'matches' if matches else 'DIFFERS'}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
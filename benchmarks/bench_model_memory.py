@@ -0,0 +1,98 @@
+"""
+Reports the memory held by model.Issue and model.Event objects, in bytes
+per issue and per event, next to the plain __dict__ based classes without
+string interning that the model used before.
+
+Run from the repository root with:
+    python -m benchmarks.bench_model_memory [--count N]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+
+from benchmarks.synthetic import generate_issues
+from model import Issue, Event, State, parse_date
+
+
+class LegacyEvent:
+    """The previous Event layout: a __dict__ per instance, strings as loaded."""
+
+    def __init__(self, jobj):
+        self.event_type = jobj.get('event_type')
+        self.author = jobj.get('author')
+        self.event_date = parse_date(jobj.get('event_date'))
+        self.label = jobj.get('label')
+        self.comment = jobj.get('comment')
+
+
+class LegacyIssue:
+    """The previous Issue layout: a __dict__ per instance, strings as loaded."""
+
+    def __init__(self, jobj):
+        self.url = jobj.get('url')
+        self.creator = jobj.get('creator')
+        self.labels = jobj.get('labels', [])
+        self.state = State[jobj['state']] if jobj.get('state') in State.__members__ else None
+        self.assignees = jobj.get('assignees', [])
+        self.title = jobj.get('title')
+        self.text = jobj.get('text')
+        self.number = int(jobj.get('number', '-1'))
+        self.created_date = parse_date(jobj.get('created_date'))
+        self.updated_date = parse_date(jobj.get('updated_date'))
+        self.timeline_url = jobj.get('timeline_url')
+        self.events = [LegacyEvent(jevent) for jevent in jobj.get('events', [])]
+
+
+def retained_bytes(text, build):
+    """
+    Bytes still allocated after decoding text, building the model objects
+    from it and dropping the decoded JSON again.
+    """
+    gc.collect()
+    tracemalloc.start()
+    raw = json.loads(text)
+    objects = build(raw)
+    del raw
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return current
+
+
+def measure(text, issue_cls, event_cls, issue_count, event_count):
+    """Bytes per event and per issue (excluding its events) for one model."""
+    events = retained_bytes(text, lambda raw: [event_cls(e) for issue in raw for e in issue['events']])
+    issues = retained_bytes(text, lambda raw: [issue_cls(issue) for issue in raw])
+    return {
+        'per_event': events / event_count,
+        'per_issue': (issues - events) / issue_count,
+        'total': issues,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_model_memory")
+    ap.add_argument('--count', '-n', type=int, default=50000,
+                    help='Number of synthetic issues to build')
+    args = ap.parse_args()
+
+    raw = list(generate_issues(args.count))
+    event_count = sum(len(issue['events']) for issue in raw)
+    text = json.dumps(raw)
+    del raw
+
+    before = measure(text, LegacyIssue, LegacyEvent, args.count, event_count)
+    after = measure(text, Issue, Event, args.count, event_count)
+
+    print(f"{args.count} issues with {event_count} events:")
+    print(f"  {'':<22}{'before':>12}{'after':>12}")
+    print(f"  {'bytes per event':<22}{before['per_event']:>12.0f}{after['per_event']:>12.0f}")
+    print(f"  {'bytes per issue':<22}{before['per_issue']:>12.0f}{after['per_issue']:>12.0f}")
+    print(f"  {'total MiB':<22}{before['total'] / 2**20:>12.1f}{after['total'] / 2**20:>12.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,209 @@
+"""
+Benchmarks every stage of the pipeline on synthetic Poetry-like exports of
+increasing size: load (json.load), parse (issue records and events),
+clean, index, rollup, timeline, and for every feature the aggregate (compute) and render
+steps. Wall time and peak traced memory are recorded for each stage and
+written as JSON so runs of different revisions can be compared.
+
+Run from the repository root with:
+    python -m benchmarks.bench_pipeline [--sizes 10000 100000 1000000] [--output results.json]
+    python -m benchmarks.bench_pipeline --compare old.json new.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+import tempfile
+
+import matplotlib
+matplotlib.use('Agg')
+import pandas as pd
+
+import config
+from analysis import Analysis
+from benchmarks.synthetic import write_issues
+from data_loader import DataLoader, Dataset, EventTableBuilder
+from issue_close_time_analysis import IssueCloseTimeAnalysis
+from month_issue_analysis import MonthIssueAnalysis
+from overall_analysis import OverallAnalysis
+from rendering import FileRenderer
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+DATA_DIR = os.path.join(os.path.dirname(__file__), 'data')
+
+FEATURES = {
+    0: OverallAnalysis,
+    1: Analysis,
+    2: MonthIssueAnalysis,
+    3: IssueCloseTimeAnalysis,
+}
+
+
+class StageTimer:
+    """
+    Records the wall time and, unless disabled, the peak traced memory of
+    named stages. Tracing memory slows Python code down, so timings taken
+    with --no-memory are the ones to compare for speed.
+    """
+
+    def __init__(self, trace_memory=True):
+        self.trace_memory = trace_memory
+        self.stages = []
+
+    def run(self, name, fn, feature=None):
+        gc.collect()
+        if self.trace_memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - start
+        peak = None
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+        self.stages.append({'stage': name, 'feature': feature, 'seconds': seconds, 'peak_bytes': peak})
+        print(f"  {name:<10}{'' if feature is None else feature:<10}{seconds:>10.3f} s"
+              + ('' if peak is None else f"{peak / 2**20:>10.1f} MiB"))
+        return result
+
+
+def dataset_path(size, seed):
+    """Path of the synthetic export of size issues, generated on first use."""
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f'issues_{size}_{seed}.json')
+    if not os.path.isfile(path):
+        print(f"Generating {size} synthetic issues into {path}")
+        write_issues(path, size, seed)
+    return path
+
+
+def make_loader(path, **options):
+    """A DataLoader reading path, without the on-disk cache, with further DataLoader options."""
+    config_path = os.path.join(DATA_DIR, 'bench_config.json')
+    with open(config_path, 'w') as f:
+        json.dump({'file_path': path}, f)
+    return DataLoader(config_path, use_cache=False, **options)
+
+
+def render(analysis, results):
+    """Renders the figures of a feature to PNG files in a single process."""
+    with tempfile.TemporaryDirectory() as output_dir:
+        renderer = FileRenderer(output_dir, workers=1)
+        analysis.render(results, renderer)
+        renderer.close()
+
+
+def bench_size(size, seed, trace_memory):
+    print(f"\n{size} issues")
+    timer = StageTimer(trace_memory)
+    loader = make_loader(dataset_path(size, seed))
+
+    raw = timer.run('load', loader.load_issues)
+
+    def parse():
+        events = EventTableBuilder()
+        records = []
+        for record, issue in enumerate(raw):
+            records.append(loader.process_issue(issue))
+            events.add(record, issue.get('events') or [])
+        return pd.DataFrame(records), events
+    frame, events = timer.run('parse', parse)
+    event_count = sum(len(issue.get('events') or []) for issue in raw)
+    del raw
+
+    def clean():
+        issues_df = loader.clean_issues(frame)
+        return Dataset(issues_df, events.build(issues_df))
+    dataset = timer.run('clean', clean)
+    del frame, events
+
+    timer.run('index', lambda: dataset.index)
+    timer.run('rollup', lambda: dataset.rollups)
+    timer.run('timeline', lambda: dataset.timeline)
+
+    for feature, analysis_cls in FEATURES.items():
+        analysis = analysis_cls()
+        results = timer.run('aggregate', lambda: analysis.compute(dataset), feature)
+        if results is not None:
+            timer.run('render', lambda: render(analysis, results), feature)
+
+    return {'issues': size, 'events': event_count, 'stages': timer.stages}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old_path, new_path):
+    """Prints the time and memory of each stage of two result files side by side."""
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    def by_stage(results):
+        return {(run['issues'], stage['stage'], stage['feature']): stage
+                for run in results['runs'] for stage in run['stages']}
+    old_stages, new_stages = by_stage(old), by_stage(new)
+
+    print(f"{'issues':>10} {'stage':<10}{'feature':<8}{'old s':>10}{'new s':>10}{'speedup':>9}{'old MiB':>10}{'new MiB':>10}")
+    for key in new_stages:
+        if key not in old_stages:
+            continue
+        size, stage, feature = key
+        before, after = old_stages[key], new_stages[key]
+        line = (f"{size:>10} {stage:<10}{'' if feature is None else feature:<8}"
+                f"{before['seconds']:>10.3f}{after['seconds']:>10.3f}{before['seconds'] / max(after['seconds'], 1e-9):>8.1f}x")
+        if before['peak_bytes'] is not None and after['peak_bytes'] is not None:
+            line += f"{before['peak_bytes'] / 2**20:>10.1f}{after['peak_bytes'] / 2**20:>10.1f}"
+        print(line)
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_pipeline")
+    ap.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                    help='Numbers of issues to benchmark')
+    ap.add_argument('--seed', type=int, default=0,
+                    help='Seed of the synthetic data')
+    ap.add_argument('--output', '-o', type=str, default='bench_results.json',
+                    help='File the JSON results are written to')
+    ap.add_argument('--no-memory', action='store_true',
+                    help='Do not trace memory, for undistorted timings')
+    ap.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'),
+                    help='Compare two result files instead of running')
+    ap.add_argument('--user', type=str, default='user0',
+                    help='User for the user/label feature')
+    ap.add_argument('--label', type=str, default='kind/bug',
+                    help='Label for the user/label feature')
+    args = ap.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    config.set_parameter('user', args.user)
+    config.set_parameter('label', args.label)
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'trace_memory': not args.no_memory,
+        'runs': [bench_size(size, args.seed, not args.no_memory) for size in args.sizes],
+    }
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Compares loading every field of the issues with loading only the fields
+each feature declares in its FIELDS. For the full load and each projection,
+reports the time to process and clean the issues (and flatten the events,
+if loaded) from the already json.load-ed export, and the memory_usage(deep=True)
+of the resulting issues and events tables.
+
+Run from the repository root with:
+    python -m benchmarks.bench_projection [--count N]
+"""
+
+import argparse
+import time
+
+from benchmarks.bench_pipeline import FEATURES, dataset_path, make_loader
+from data_loader import EventTableBuilder
+
+
+def load(loader, raw, repeat=3):
+    """The issues and events tables of the raw issues, and the fastest of repeat loads in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        events = EventTableBuilder() if loader.has('events') else None
+        issues_df = loader.process_issues(raw, events)
+        events_df = events.build(issues_df) if events is not None else None
+        times.append(time.perf_counter() - start)
+    return issues_df, events_df, min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser("bench_projection")
+    ap.add_argument('--count', '-n', type=int, default=100000,
+                    help='Number of synthetic issues to load')
+    args = ap.parse_args()
+
+    path = dataset_path(args.count, 0)
+    raw = make_loader(path).load_issues()
+    print(f"{len(raw)} issues")
+    print(f"  {'load':<12}{'seconds':>10}{'issues MiB':>12}{'events MiB':>12}  fields")
+    loads = [('all', None)] + [(f'feature {feature}', cls.FIELDS) for feature, cls in FEATURES.items()]
+    for name, fields in loads:
+        loader = make_loader(path, fields=fields)
+        issues_df, events_df, seconds = load(loader, raw)
+        issues_mib = issues_df.memory_usage(deep=True).sum() / 2**20
+        events_mib = 0 if events_df is None else events_df.memory_usage(deep=True).sum() / 2**20
+        print(f"  {name:<12}{seconds:>10.3f}{issues_mib:>12.2f}{events_mib:>12.2f}  "
+              f"{', '.join(loader.fields or ['all'])}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,236 @@
+"""
+Local stand-in for the parts of the GitHub REST API that fetch_issues.py
+reads, serving synthetic issues (benchmarks.synthetic) over HTTP/1.1:
+
+    GET /repos/python-poetry/poetry/issues?state=&sort=&direction=&since=&page=&per_page=
+    GET /repos/python-poetry/poetry/issues/<n>/timeline?page=&per_page=
+
+Like the API, it paginates with Link headers, answers conditional requests
+with 304 Not Modified using ETag and Last-Modified validators, counts the
+other requests against a rate limit that resets every window seconds, and
+lists a few pull requests among the issues. Every response can be delayed by
+a fixed latency to stand in for the network.
+
+Run from the repository root with:
+    python -m benchmarks.mock_github [--count 1000] [--port 8612] [--latency 0.05]
+and fetch from it with:
+    python fetch_issues.py python-poetry/poetry issues.json --api-url http://127.0.0.1:8612
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from benchmarks.synthetic import generate_issues
+
+DEFAULT_PORT = 8612
+
+# The repository the issues are served as, others are not found
+REPOSITORY = 'python-poetry/poetry'
+
+# Every this many issues, a pull request is listed as well
+PULL_REQUEST_EVERY = 20
+
+
+def _api_date(value):
+    """An export timestamp in the API's 'Z' form."""
+    return value.replace('+00:00', 'Z') if value else value
+
+
+def _datetime(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class MockApi:
+    """
+    The issues, pull requests and timelines served, in the API's JSON shape,
+    and the rate limit and request counts of the server.
+    """
+
+    def __init__(self, count, seed=0, rate_limit=5000, window=3600, latency=0.0):
+        self.issues, self.timelines = [], {}
+        self.base_url = None
+        for issue in generate_issues(count, seed):
+            self.add_issue(issue)
+            if issue['number'] % PULL_REQUEST_EVERY == 0:
+                self.issues.append({'number': count + issue['number'] // PULL_REQUEST_EVERY, 'title': 'Pull request',
+                                    'user': {'login': issue['creator']}, 'state': 'open', 'labels': [],
+                                    'assignees': [], 'created_at': _api_date(issue['created_date']),
+                                    'updated_at': _api_date(issue['created_date']), 'pull_request': {}})
+        self.rate_limit, self.window, self.latency = rate_limit, window, latency
+        self.remaining, self.reset_at = rate_limit, time.time() + window
+        self.requests, self.not_modified = 0, 0
+        self.lock = threading.Lock()
+
+    def add_issue(self, issue):
+        """Adds an issue given in the JSON shape of the export."""
+        number = issue['number']
+        self.issues.append({
+            'number': number,
+            'html_url': issue['url'],
+            'title': issue['title'],
+            'body': issue['text'],
+            'user': {'login': issue['creator']},
+            'labels': [{'name': label} for label in issue['labels']],
+            'state': issue['state'],
+            'assignees': [{'login': assignee} for assignee in issue['assignees']],
+            'created_at': _api_date(issue['created_date']),
+            'updated_at': _api_date(issue['updated_date']),
+        })
+        timeline = []
+        for event in issue['events']:
+            item = {'event': event['event_type'], 'actor': {'login': event['author']},
+                    'created_at': _api_date(event['event_date'])}
+            if 'label' in event:
+                item['label'] = {'name': event['label'], 'color': 'ededed'}
+            if event['event_type'] == 'commented':
+                item['user'], item['body'] = item['actor'], event.get('comment')
+            timeline.append(item)
+        self.timelines[number] = timeline
+
+    def comment(self, number, author, body, when):
+        """Adds a comment to an issue at when, an ISO 8601 UTC time, which updates the issue."""
+        issue = next(issue for issue in self.issues if issue['number'] == number)
+        issue['updated_at'] = _api_date(when)
+        self.timelines[number].append({'event': 'commented', 'actor': {'login': author}, 'user': {'login': author},
+                                       'created_at': _api_date(when), 'body': body})
+
+    def issue_json(self, issue):
+        url = f"{self.base_url}/repos/{REPOSITORY}/issues/{issue['number']}"
+        return dict(issue, url=url, timeline_url=f'{url}/timeline')
+
+    def take_request(self, conditional):
+        """Counts a request against the rate limit, returns whether it is allowed."""
+        with self.lock:
+            self.requests += 1
+            if time.time() >= self.reset_at:
+                self.remaining, self.reset_at = self.rate_limit, time.time() + self.window
+            # Like the API, a request answered with 304 is free
+            if conditional:
+                self.not_modified += 1
+                return True
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Answers the requests of fetch_issues.py from the MockApi of the server."""
+
+    protocol_version = 'HTTP/1.1'
+    # The headers and body are written separately, keep-alive clients would wait on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        api = self.server.api
+        if api.latency:
+            time.sleep(api.latency)
+        url = urlsplit(self.path)
+        query = {name: values[0] for name, values in parse_qs(url.query).items()}
+        issues = url.path == f'/repos/{REPOSITORY}/issues'
+        timeline = re.fullmatch(rf'/repos/{REPOSITORY}/issues/(\d+)/timeline', url.path)
+        if issues:
+            items = list(api.issues)
+            if query.get('since'):
+                since = _datetime(query['since'])
+                items = [issue for issue in items if _datetime(issue['updated_at']) >= since]
+            items.sort(key=lambda issue: issue['created_at'], reverse=query.get('direction', 'desc') == 'desc')
+            items = [api.issue_json(issue) for issue in items]
+        elif timeline and int(timeline.group(1)) in api.timelines:
+            items = api.timelines[int(timeline.group(1))]
+        else:
+            self.send_json(404, {'message': 'Not Found'})
+            return
+
+        per_page = min(int(query.get('per_page', 30)), 100)
+        page = int(query.get('page', 1))
+        last = max(1, -(-len(items) // per_page))
+        items = items[(page - 1) * per_page:page * per_page]
+        body = json.dumps(items).encode('utf-8')
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        dates = [_datetime(item.get('updated_at') or item['created_at']) for item in items]
+        last_modified = format_datetime(max(dates), usegmt=True) if dates else None
+
+        conditional = self.headers.get('If-None-Match') == etag
+        if self.headers.get('If-None-Match') is None and self.headers.get('If-Modified-Since') and last_modified:
+            conditional = parsedate_to_datetime(self.headers['If-Modified-Since']) >= max(dates)
+        if not api.take_request(conditional):
+            self.send_json(403, {'message': 'API rate limit exceeded'})
+            return
+        headers = {'ETag': etag}
+        if last_modified:
+            headers['Last-Modified'] = last_modified
+        if last > 1:
+            link = f'{api.base_url}{url.path}?' + urlencode(dict(query, page=last))
+            headers['Link'] = f'<{link}>; rel="last"'
+        if conditional:
+            self.send_json(304, None, headers)
+        else:
+            self.send_json(200, items, headers, body)
+
+    def send_json(self, status, body, headers=None, data=None):
+        api = self.server.api
+        if data is None:
+            data = b'' if status == 304 else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('X-RateLimit-Limit', str(api.rate_limit))
+        self.send_header('X-RateLimit-Remaining', str(max(api.remaining, 0)))
+        self.send_header('X-RateLimit-Reset', str(int(api.reset_at)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if status != 304:
+            self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def start_server(api, host='127.0.0.1', port=0):
+    """Serves api on host:port (a free port if 0) in a background thread and returns the server."""
+    server = ThreadingHTTPServer((host, port), MockHandler)
+    server.daemon_threads = True
+    server.api = api
+    api.base_url = f'http://{host}:{server.server_address[1]}'
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    ap = argparse.ArgumentParser("mock_github")
+    ap.add_argument('--count', '-n', type=int, default=1000,
+                    help='Number of synthetic issues served')
+    ap.add_argument('--port', '-p', type=int, default=DEFAULT_PORT,
+                    help=f'Port to listen on (default: {DEFAULT_PORT})')
+    ap.add_argument('--latency', type=float, default=0.0,
+                    help='Seconds every response is delayed by')
+    ap.add_argument('--rate-limit', type=int, default=5000,
+                    help='Requests allowed per window, 304 responses excluded')
+    ap.add_argument('--window', type=float, default=3600,
+                    help='Seconds after which the rate limit resets')
+    args = ap.parse_args()
+
+    api = MockApi(args.count, rate_limit=args.rate_limit, window=args.window, latency=args.latency)
+    server = start_server(api, port=args.port)
+    print(f"Serving {args.count} synthetic issues on {api.base_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Generates synthetic issues that look like the Poetry export read by
+DataLoader: Zipf distributed creators and labels, a realistic number of
+events per issue and issues that get closed, reopened and closed again.
+"""
+
+import bisect
+import itertools
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+LABELS = [
+    'kind/bug', 'status/triage', 'kind/feature', 'status/duplicate', 'kind/question',
+    'area/docs', 'area/solver', 'area/installer', 'status/waiting-on-response', 'area/cli',
+    'status/confirmed', 'area/venv', 'status/needs-reproduction', 'area/build-system', 'area/publishing',
+    'kind/enhancement', 'area/config', 'area/windows', 'good first issue', 'area/plugin-api',
+    'status/wontfix', 'area/lock', 'area/sources', 'status/external-issue', 'area/deps',
+    'kind/refactor', 'area/error-handling', 'area/auth', 'area/scripts', 'status/accepted',
+]
+
+COMMENT_EVENTS = ['commented', 'mentioned', 'subscribed', 'referenced', 'cross-referenced']
+
+START_DATE = datetime(2018, 3, 1, tzinfo=timezone.utc)
+END_DATE = datetime(2024, 10, 1, tzinfo=timezone.utc)
+
+
+class ZipfSampler:
+    """
+    Draws items with a probability proportional to 1 / rank ** exponent, so a
+    few items are very common and most are rare.
+    """
+
+    def __init__(self, items, exponent=1.1):
+        self.items = list(items)
+        self.cum_weights = list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, len(self.items) + 1)))
+
+    def sample(self, rnd):
+        return self.items[bisect.bisect(self.cum_weights, rnd.random() * self.cum_weights[-1])]
+
+    def sample_distinct(self, rnd, count):
+        picked = []
+        while len(picked) < min(count, len(self.items)):
+            item = self.sample(rnd)
+            if item not in picked:
+                picked.append(item)
+        return picked
+
+
+def _timestamp(date):
+    return date.strftime('%Y-%m-%dT%H:%M:%S+00:00')
+
+
+def generate_issues(count, seed=0, reopen_rate=0.08, close_rate=0.8):
+    """
+    Lazily yields count issue dictionaries in the JSON shape of the export.
+    The same seed always produces the same issues.
+    """
+    rnd = random.Random(seed)
+    creators = ZipfSampler([f'user{i}' for i in range(max(50, count // 15))])
+    labels = ZipfSampler(LABELS)
+    span = (END_DATE - START_DATE).total_seconds()
+
+    for number in range(1, count + 1):
+        # Creation dates grow denser over time, like a project gaining users
+        created = START_DATE + timedelta(seconds=int(span * rnd.random() ** 0.7))
+        creator = creators.sample(rnd)
+        issue_labels = labels.sample_distinct(rnd, min(4, int(rnd.expovariate(0.9))))
+
+        events = []
+        when = created
+        for label in issue_labels:
+            when += timedelta(minutes=rnd.randint(1, 600))
+            events.append({'event_type': 'labeled', 'author': creators.sample(rnd),
+                           'event_date': _timestamp(when), 'label': label})
+
+        # Closed issues are sometimes reopened and closed again
+        closes = 0
+        if rnd.random() < close_rate:
+            closes = 1
+            while closes < 4 and rnd.random() < reopen_rate:
+                closes += 1
+        transitions = (['closed', 'reopened'] * closes)[:closes * 2 - 1]
+
+        state = 'open'
+        for transition in transitions + [None]:
+            # Comments and mentions happen before every close and reopen
+            for _ in range(int(rnd.expovariate(0.3))):
+                when += timedelta(minutes=rnd.randint(5, 3 * 24 * 60))
+                event_type = rnd.choice(COMMENT_EVENTS)
+                event = {'event_type': event_type, 'author': creators.sample(rnd), 'event_date': _timestamp(when)}
+                if event_type == 'commented':
+                    event['comment'] = f'Comment on issue {number}'
+                events.append(event)
+            if transition is None:
+                break
+            when += timedelta(seconds=int(rnd.lognormvariate(13, 1.5)))
+            events.append({'event_type': transition, 'author': creators.sample(rnd), 'event_date': _timestamp(when)})
+            state = 'closed' if transition == 'closed' else 'open'
+
+        yield {
+            'url': f'https://github.com/python-poetry/poetry/issues/{number}',
+            'creator': creator,
+            'labels': issue_labels,
+            'state': state,
+            'assignees': [],
+            'title': f'Synthetic issue {number}',
+            'text': f'Body of synthetic issue {number}',
+            'number': number,
+            'created_date': _timestamp(created),
+            'updated_date': _timestamp(when),
+            'timeline_url': f'https://api.github.com/repos/python-poetry/poetry/issues/{number}/timeline',
+            'events': events,
+        }
+
+
+def write_issues(path, count, seed=0):
+    """
+    Writes count synthetic issues to path as a JSON array, one issue at a
+    time so even a million issues never have to fit in memory.
+    """
+    with open(path, 'w') as f:
+        f.write('[\n')
+        for i, issue in enumerate(generate_issues(count, seed)):
+            if i:
+                f.write(',\n')
+            f.write(json.dumps(issue))
+        f.write('\n]\n')
@@ -0,0 +1,142 @@
+"""
+On-disk cache of the processed issues DataFrame so repeat runs over the
+same export skip the JSON parsing and data cleaning entirely.
+
+Each cached frame is stored as a pickle of the DataFrame (numpy column
+blocks, so it loads without any parsing) next to a small JSON key file.
+The key records the source file's path, size, mtime and a fingerprint of
+its content; a cache entry is only used when all of them still match.
+Files ingested into an entry with DataLoader.ingest are listed in its key
+as well, without affecting whether it matches.
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+# Bump whenever DataLoader's processing changes so stale frames are rebuilt
+CACHE_VERSION = 7
+
+# Size of each block hashed for the content fingerprint
+FINGERPRINT_BLOCK_SIZE = 1 << 16
+
+DEFAULT_CACHE_DIR = '.cache'
+
+
+class IssueCache:
+    """
+    Stores and retrieves processed DataFrames keyed by their source file.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+
+    def _entry_path(self, source_path, variant, suffix):
+        entry = f'{os.path.abspath(source_path)}\0{variant}'
+        name = hashlib.sha1(entry.encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f'{name}{suffix}')
+
+    def fingerprint(self, source_path, size):
+        """
+        Hashes the first, middle and last block of the file. Reading the
+        whole multi-GB export would defeat the purpose of the cache, while
+        these samples catch rewrites that keep the size and mtime.
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        with open(source_path, 'rb') as f:
+            for offset in sorted({0, max(0, size // 2 - FINGERPRINT_BLOCK_SIZE // 2),
+                                  max(0, size - FINGERPRINT_BLOCK_SIZE)}):
+                f.seek(offset)
+                digest.update(f.read(FINGERPRINT_BLOCK_SIZE))
+        return digest.hexdigest()
+
+    def key(self, source_path, variant=None):
+        """
+        Builds the key that identifies the current content of source_path.
+        The optional variant distinguishes frames built with different
+        loader options from the same file.
+        """
+        stat = os.stat(source_path)
+        return {
+            'version': CACHE_VERSION,
+            'path': os.path.abspath(source_path),
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'fingerprint': self.fingerprint(source_path, stat.st_size),
+            'variant': variant,
+        }
+
+    def load(self, source_path, variant=None):
+        """
+        Returns the cached DataFrame for source_path, or None when there is
+        no entry or the entry no longer matches the file.
+        """
+        key_path = self._entry_path(source_path, variant, '.json')
+        data_path = self._entry_path(source_path, variant, '.pkl')
+        if not (os.path.isfile(key_path) and os.path.isfile(data_path)):
+            return None
+        try:
+            with open(key_path, 'r') as f:
+                stored_key = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # Files ingested on top of the source do not invalidate the entry
+        stored_key.pop('updates', None)
+        if stored_key != self.key(source_path, variant):
+            return None
+        try:
+            return pd.read_pickle(data_path)
+        except Exception:
+            # A corrupt or incompatible entry is simply rebuilt
+            return None
+
+    def updates(self, source_path, variant=None):
+        """The files ingested into the entry of source_path since it was built."""
+        try:
+            with open(self._entry_path(source_path, variant, '.json'), 'r') as f:
+                stored_key = json.load(f)
+        except (OSError, ValueError):
+            return []
+        updates = stored_key.pop('updates', [])
+        return updates if stored_key == self.key(source_path, variant) else []
+
+    def store(self, source_path, df, variant=None, update=None):
+        """
+        Writes df, a DataFrame or any other picklable object such as the
+        Rollups of a dataset, to the cache. Files are written under temporary names and
+        moved into place so a concurrent reader never sees a partial entry.
+        When df is the entry with the file update ingested into it, update
+        is recorded in the key on top of the files ingested before.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        key_path = self._entry_path(source_path, variant, '.json')
+        data_path = self._entry_path(source_path, variant, '.pkl')
+        tmp_suffix = f'.{os.getpid()}.tmp'
+
+        key = self.key(source_path, variant)
+        if update is not None:
+            update_stat = os.stat(update)
+            key['updates'] = self.updates(source_path, variant) + [{
+                'path': os.path.abspath(update),
+                'size': update_stat.st_size,
+                'mtime_ns': update_stat.st_mtime_ns,
+            }]
+
+        pd.to_pickle(df, data_path + tmp_suffix, protocol=5)
+        with open(key_path + tmp_suffix, 'w') as f:
+            json.dump(key, f)
+        # Drop the old key first and publish the new one last, so a key on
+        # disk always refers to complete data
+        if os.path.isfile(key_path):
+            os.remove(key_path)
+        os.replace(data_path + tmp_suffix, data_path)
+        os.replace(key_path + tmp_suffix, key_path)
+
+    def clear(self, source_path, variant=None):
+        """Removes the cache entry of source_path, if any."""
+        for suffix in ('.json', '.pkl'):
+            path = self._entry_path(source_path, variant, suffix)
+            if os.path.isfile(path):
+                os.remove(path)
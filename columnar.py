@@ -0,0 +1,209 @@
+"""
+Memory-mappable columnar form of a dataset. A directory holds one .npy file
+per array and a meta.json with the vocabularies and sizes:
+
+    number, created_at, updated_at, closed_at    one value per issue, dates as
+                                                 int64 epoch values (NaT as the
+                                                 minimum int64)
+    creator, state, closed_by, repository        integer codes per issue into a
+                                                 vocabulary, -1 if missing
+    title_offsets, title_bytes, title_missing    the titles as one UTF-8 blob
+    label_indptr, label_indices                  the LabelMatrix of the issues
+    event_indptr                                 the events of issue i are rows
+                                                 event_indptr[i]:event_indptr[i + 1]
+    event_type, author, label, event_date        one value per event, codes into
+                                                 vocabularies and int64 dates
+
+DataLoader opens such a directory given as file_path with np.load(mmap_mode='r'):
+the arrays are backed by the page cache and read lazily, so the processes
+analyzing the same dataset share one copy of it. The dataset comes back in
+the compact form (categoricals and a label matrix), which keeps the arrays
+as they are instead of allocating strings; only the titles are decoded.
+
+Convert the dataset of config.json (a JSON export, or several) with:
+    python columnar.py OUTPUT_DIR
+"""
+
+import argparse
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+import profiling
+from data_loader import (CATEGORICAL_COLUMNS, DATE_COLUMNS, ISSUE_COLUMNS, DataLoader, Dataset,
+                         compact_issues, empty_events_table, repository_runs)
+from label_matrix import LabelMatrix
+from timeline import issue_positions
+
+# Bump whenever the layout changes
+COLUMNAR_VERSION = 1
+
+META_FILE = 'meta.json'
+
+# Columns of the events table held as codes into a vocabulary
+EVENT_CODED_COLUMNS = ['event_type', 'author', 'label']
+
+
+def is_columnar(path):
+    """Whether path is a directory written by write_columnar."""
+    return os.path.isdir(path) and os.path.isfile(os.path.join(path, META_FILE))
+
+
+def _epoch(dates):
+    """The datetime Series dates as int64 epoch values and their unit."""
+    # An empty events table has object columns
+    dates = pd.to_datetime(dates, utc=True)
+    return np.asarray(dates.array.asi8), dates.dt.unit
+
+
+def _codes(values):
+    """The categorical codes and categories of values, categorical or not."""
+    values = values.astype('category')
+    return np.asarray(values.cat.codes), values.cat.categories.tolist()
+
+
+def write_columnar(dataset, path):
+    """
+    Writes the issues, label matrix and events of dataset to the directory
+    path, replacing what is there. The arrays are written to a sibling
+    directory first, so a reader never opens a partial dataset.
+    """
+    issues = compact_issues(dataset.issues) if not dataset.compact else dataset.issues
+    labels = dataset.label_matrix
+    arrays, vocabularies, units = {}, {}, {}
+
+    arrays['number'] = np.asarray(issues['number'])
+    for column in DATE_COLUMNS:
+        arrays[column], units[column] = _epoch(issues[column])
+    for column in CATEGORICAL_COLUMNS + ['repository']:
+        if column in issues.columns:
+            arrays[column], vocabularies[column] = _codes(issues[column])
+    titles = issues['title']
+    encoded = [title.encode('utf-8') if isinstance(title, str) else b'' for title in titles]
+    arrays['title_offsets'] = np.concatenate([[0], np.cumsum([len(title) for title in encoded])]).astype(np.int64)
+    arrays['title_bytes'] = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+    arrays['title_missing'] = titles.isna().to_numpy()
+    arrays['label_indptr'], arrays['label_indices'] = labels.indptr, labels.indices
+    vocabularies['labels'] = labels.vocabulary.tolist()
+
+    # The events are grouped by issue, in the order of the issues
+    events = dataset.events
+    positions = issue_positions(issues, events)
+    order = np.argsort(positions, kind='stable')
+    order = order[positions[order] >= 0]
+    events = events.iloc[order]
+    counts = np.bincount(positions[order], minlength=len(issues))
+    arrays['event_indptr'] = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+    for column in EVENT_CODED_COLUMNS:
+        arrays[column], vocabularies[column] = _codes(events[column])
+    arrays['event_date'], units['event_date'] = _epoch(events['event_date'])
+
+    meta = {
+        'version': COLUMNAR_VERSION,
+        'issues': len(issues),
+        'events': len(events),
+        'columns': [column for column in issues.columns if column in ISSUE_COLUMNS or column == 'repository'],
+        'units': units,
+        'vocabularies': vocabularies,
+    }
+    staging = path.rstrip(os.sep) + f'.{os.getpid()}.tmp'
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f'{name}.npy'), np.ascontiguousarray(array))
+    with open(os.path.join(staging, META_FILE), 'w') as f:
+        json.dump(meta, f)
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(staging, path)
+
+
+def open_columnar(path, fields=None):
+    """
+    Opens the dataset written to the directory path by write_columnar, in
+    compact form, with only the FIELDS in fields if given. The arrays are
+    memory-mapped; the pandas columns wrap them without copying, except for
+    the titles, which are decoded, and the event numbers, which are expanded
+    from the per-issue event offsets.
+    """
+    with open(os.path.join(path, META_FILE), 'r') as f:
+        meta = json.load(f)
+    if meta.get('version') != COLUMNAR_VERSION:
+        raise ValueError(f"{path} holds version {meta.get('version')} of the columnar format, "
+                         f"expected {COLUMNAR_VERSION}; convert the export again")
+
+    def array(name):
+        # A plain ndarray view of the mapping, pandas would keep the memmap subclass
+        return np.asarray(np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r'))
+
+    def dates(name):
+        return pd.Series(array(name), dtype=f"datetime64[{meta['units'][name]}, UTC]", copy=False)
+
+    def categorical(name, codes=None):
+        categories = pd.Index(meta['vocabularies'][name])
+        codes = array(name) if codes is None else codes
+        return pd.Categorical.from_codes(codes, dtype=pd.CategoricalDtype(categories), validate=False)
+
+    def has(field):
+        # The repository of each issue is kept whatever the fields
+        return fields is None or field in fields or field == 'repository'
+
+    columns = {}
+    with profiling.stage('load'):
+        for column in meta['columns']:
+            if column == 'labels' or not has(column):
+                continue
+            if column == 'number':
+                columns[column] = array(column)
+            elif column in DATE_COLUMNS:
+                columns[column] = dates(column)
+            elif column == 'title':
+                offsets, blob, missing = array('title_offsets'), array('title_bytes'), array('title_missing')
+                columns[column] = pd.Series([None if missing[i] else bytes(blob[offsets[i]:offsets[i + 1]]).decode('utf-8')
+                                             for i in range(meta['issues'])], dtype='str')
+            else:
+                columns[column] = categorical(column)
+        issues = pd.DataFrame(columns, copy=False)
+
+        labels = None
+        if has('labels'):
+            labels = LabelMatrix(array('label_indptr'), array('label_indices'), pd.Index(meta['vocabularies']['labels']))
+
+        events, lengths = empty_events_table(), np.zeros(meta['issues'], dtype=np.int64)
+        if has('events'):
+            lengths = np.diff(array('event_indptr'))
+            events = pd.DataFrame({
+                'number': np.repeat(array('number'), lengths),
+                'event_type': categorical('event_type'),
+                'author': categorical('author'),
+                'event_date': dates('event_date'),
+                'label': categorical('label'),
+            }, copy=False)
+        if 'repository' in issues.columns:
+            events['repository'] = categorical('repository', np.repeat(array('repository'), lengths))
+
+    # The issues and events of each repository were written as one run of rows
+    shards = repository_runs(issues, events) if 'repository' in issues.columns else None
+    return Dataset(issues, events, labels, shards, fields)
+
+
+def main():
+    ap = argparse.ArgumentParser("columnar.py")
+    ap.add_argument('output', type=str,
+                    help='Directory the columnar dataset is written to; set it as file_path to load it')
+    args = ap.parse_args()
+
+    loader = DataLoader()
+    dataset = loader.load_dataset()
+    if dataset.issues.empty:
+        print(f"No issues found in {', '.join(loader.file_paths)}, nothing written.")
+        return
+    write_columnar(dataset, args.output)
+    print(f"Wrote {len(dataset.issues)} issues and {len(dataset.events)} events to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
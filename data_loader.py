@@ -1,9 +1,650 @@
+import copy
+import glob
 import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from functools import cached_property
+from itertools import islice
+
+import numpy as np
 import pandas as pd
+from pandas.api.types import union_categoricals
+
+import aggregations
+import config
+import profiling
+from issue_index import IssueIndex
+from label_matrix import LabelMatrix
+from rollups import Rollups
+from timeline import STATE_EVENTS, Timeline, issue_positions
+from model import intern_str, parse_date, parse_dates, pack_dates, unpack_dates
+from cache import IssueCache, DEFAULT_CACHE_DIR
+
+# Size of the blocks read from disk while streaming the issues file
+STREAM_READ_SIZE = 1 << 20
+
+# Number of processed issues collected before they are turned into a DataFrame chunk
+DEFAULT_CHUNK_SIZE = 10000
+
+# Columns of the long-format events table, one row per event
+EVENT_COLUMNS = ['number', 'event_type', 'author', 'event_date', 'label']
+
+# Cache variants under which the events table and the rollups are stored
+EVENTS_CACHE_VARIANT = 'events'
+ROLLUPS_CACHE_VARIANT = 'rollups'
+
+# Issue columns holding timestamps and columns with few distinct strings,
+# which the parallel workers send back in packed form
+DATE_COLUMNS = ['created_at', 'updated_at', 'closed_at']
+CODED_COLUMNS = ['creator', 'state', 'closed_by']
+
+# Columns with few distinct strings, held as categoricals by compact datasets
+CATEGORICAL_COLUMNS = ['creator', 'state', 'closed_by']
+
+# Fields a dataset can be loaded with: the issue columns in the order
+# process_issue builds them, and the events table
+ISSUE_COLUMNS = ['number', 'creator', 'title', 'state', 'created_at', 'updated_at', 'labels', 'closed_by', 'closed_at']
+FIELDS = ISSUE_COLUMNS + ['events']
+
+# Key of the raw issue each issue column is copied from
+RAW_KEYS = {
+    'number': 'number',
+    'creator': 'creator',
+    'title': 'title',
+    'state': 'state',
+    'created_at': 'created_date',
+    'updated_at': 'updated_date',
+    'labels': 'labels',
+}
+
+
+def empty_events_table():
+    return pd.DataFrame({column: pd.Series([], dtype=object) for column in EVENT_COLUMNS})
+
+
+def _union_categoricals(columns):
+    """The columns concatenated as one categorical, also when some are entirely missing."""
+    columns = [column.astype('category') for column in columns]
+    # A column without values has no categories to infer their dtype from, take that of the others
+    dtype = next((column.cat.categories.dtype for column in columns if len(column.cat.categories)), None)
+    if dtype is not None:
+        columns = [column if len(column.cat.categories) else column.cat.set_categories(pd.Index([], dtype=dtype))
+                   for column in columns]
+    return union_categoricals(columns)
+
+
+def concat_events(tables):
+    """Concatenates events tables, keeping the string columns categorical."""
+    return pd.DataFrame({
+        column: _union_categoricals([table[column] for table in tables])
+        if column in ('event_type', 'author', 'label')
+        else pd.concat([table[column] for table in tables], ignore_index=True).array
+        for column in EVENT_COLUMNS
+    })
+
+
+def compact_issues(df):
+    """
+    The issues df with the CATEGORICAL_COLUMNS as categoricals and without
+    the labels column, whose lists are held by a LabelMatrix instead.
+    """
+    columns = [column for column in CATEGORICAL_COLUMNS if column in df.columns]
+    return df.drop(columns='labels', errors='ignore').astype({column: 'category' for column in columns})
+
+
+def expand_issues(df, labels):
+    """The compact issues df back in the form process_issues produces, see compact_issues."""
+    columns = [column for column in CATEGORICAL_COLUMNS if column in df.columns]
+    df = df.astype({column: df[column].cat.categories.dtype for column in columns})
+    # process_issue puts the labels after the columns that precede them in ISSUE_COLUMNS
+    before = ISSUE_COLUMNS[:ISSUE_COLUMNS.index('labels')]
+    df.insert(sum(column in before for column in df.columns), 'labels', labels.to_lists())
+    return df
+
+
+def projected_fields(fields):
+    """
+    The fields to load, in the order of FIELDS and always with the issue
+    number and created_at, which the issues are sorted by, or None to load
+    every field.
+    """
+    if fields is None:
+        return None
+    unknown = [field for field in fields if field not in FIELDS]
+    if unknown:
+        raise ValueError(f"Unknown fields {unknown}, expected some of {FIELDS}")
+    return tuple(field for field in FIELDS if field in ('number', 'created_at') or field in fields)
+
+
+def projection_variant(variant, fields):
+    """The cache variant under which the variant of a projection to fields is stored."""
+    if fields is None:
+        return variant
+    return f"{variant or 'issues'}[{','.join(fields)}]"
+
+
+def _pack_strings(values):
+    """Integer codes plus the distinct values, with -1 for missing values."""
+    codes, uniques = pd.factorize(np.array(values, dtype=object))
+    return codes.astype(np.int32), list(uniques)
+
+
+def _unpack_strings(packed):
+    codes, uniques = packed
+    # Code -1 picks the trailing None
+    return np.array(uniques + [None], dtype=object)[codes]
+
+
+def _process_batch(loader, batch, with_events):
+    """
+    Worker side of the parallel mode. Processes a batch of raw issues and
+    returns compact columns (coded strings, packed dates) instead of the
+    per-issue records.
+    """
+    records = [loader.process_issue(issue) for issue in batch]
+    names = list(records[0]) if records else []
+
+    result = {'size': len(batch), 'names': names, 'columns': {}, 'dates': {}, 'events': None}
+    for name in names:
+        values = [record[name] for record in records]
+        if name in DATE_COLUMNS:
+            result['dates'][name] = pack_dates(values)
+        elif name in CODED_COLUMNS:
+            result['columns'][name] = _pack_strings(values)
+        else:
+            result['columns'][name] = values
+
+    if with_events:
+        events = EventTableBuilder()
+        for record, issue in enumerate(batch):
+            events.add(record, issue.get('events') or [])
+        result['events'] = {
+            'record': np.array(events.records, dtype=np.int64),
+            'event_type': _pack_strings(events.event_types),
+            'author': _pack_strings(events.authors),
+            'event_date': pack_dates(events.event_dates),
+            'label': _pack_strings(events.labels),
+        }
+    return result
+
+
+def time_range(since=None, until=None):
+    """
+    A (since, until) range of UTC timestamps, since inclusive and until
+    exclusive, from anything pd.Timestamp accepts. Either end may be None,
+    both None gives None. Naive timestamps are taken as UTC.
+    """
+    if since is None and until is None:
+        return None
+    bounds = []
+    for bound in (since, until):
+        if bound is not None:
+            # config.get_parameter decodes a bound such as 2024 to an int, which
+            # pd.Timestamp would take as nanoseconds since the epoch
+            if not isinstance(bound, (datetime, np.datetime64)):
+                bound = str(bound)
+            bound = pd.Timestamp(bound)
+            bound = bound.tz_localize('UTC') if bound.tz is None else bound.tz_convert('UTC')
+        bounds.append(bound)
+    return tuple(bounds)
+
+
+def _utc_key(value):
+    """
+    A raw timestamp as a 'YYYY-MM-DDTHH:MM:SS' string in UTC, which sorts like
+    the instant it stands for, or None if it cannot be parsed. GitHub's UTC
+    timestamps are cut to that form without parsing them.
+    """
+    if isinstance(value, str) and len(value) in (20, 25) and value[19:] in ('Z', '+00:00'):
+        return value[:19]
+    date = parse_date(value)
+    if date is None:
+        return None
+    if date.tzinfo is not None:
+        date = pd.Timestamp(date).tz_convert('UTC').tz_localize(None)
+    return date.isoformat(timespec='seconds')[:19]
+
+
+def _range_keys(bounds):
+    """The (since, until) range as _utc_key strings, None for an open end."""
+    if bounds is None:
+        return None
+    return tuple(None if bound is None else bound.tz_localize(None).isoformat(timespec='seconds')
+                 for bound in bounds)
+
+
+def _within(key, keys):
+    return key is not None and (keys[0] is None or key >= keys[0]) and (keys[1] is None or key < keys[1])
+
+
+def _datetime_keys(dates):
+    """The datetime Series dates as a naive datetime64 array in UTC."""
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_convert(None)
+    return dates.to_numpy()
+
+
+def _range_mask(keys, bounds):
+    """Boolean array of the datetime64 keys within the (since, until) bounds; NaT never is."""
+    mask = ~np.isnat(keys)
+    if bounds[0] is not None:
+        mask &= keys >= bounds[0].tz_localize(None).to_datetime64()
+    if bounds[1] is not None:
+        mask &= keys < bounds[1].tz_localize(None).to_datetime64()
+    return mask
+
+
+def _load_shard(loader, path):
+    """
+    Loads the dataset of one shard file in a worker process of
+    DataLoader.load_sharded_dataset, with its rollups built.
+    """
+    loader = copy.copy(loader)
+    loader.file_path, loader.file_paths = path, [path]
+    # The shards already keep every core busy
+    loader.workers = 1
+    loader.compact = False
+    dataset = loader.load_dataset()
+    rollups = dataset.rollups if not dataset.issues.empty else None
+    # A columnar shard opens in compact form, the shards are combined in the regular one
+    return dataset.to_frame(), dataset.events, rollups
+
+
+def _repository_column(shards, rows):
+    """Categorical naming the repository of every row, given the rows (slices) of each shard."""
+    codes = np.repeat(np.arange(len(shards)), [part.stop - part.start for part in rows])
+    return pd.Categorical.from_codes(codes, categories=list(shards))
+
+
+def repository_runs(issues, events):
+    """
+    The shards of a dataset whose issues and events are in runs of one
+    repository each, as the rows (slices) of each repository and no rollups.
+    """
+    shards = {}
+    issue_codes, event_codes = issues['repository'].cat.codes.to_numpy(), events['repository'].cat.codes.to_numpy()
+    for code, name in enumerate(issues['repository'].cat.categories):
+        issue_rows, event_rows = np.flatnonzero(issue_codes == code), np.flatnonzero(event_codes == code)
+        if len(issue_rows):
+            shards[name] = (slice(int(issue_rows[0]), int(issue_rows[-1]) + 1),
+                            slice(int(event_rows[0]), int(event_rows[-1]) + 1) if len(event_rows) else slice(0, 0),
+                            None)
+    return shards
+
+
+def repository_names(paths):
+    """
+    The repositories the shard files at paths hold, named after each file
+    without its extension. Shards of the same name in different folders are
+    told apart by as many of their folders as needed, joined with '-' so the
+    names can be used in file names, e.g. a-poetry and b-poetry.
+    """
+    parts = [os.path.splitext(os.path.abspath(path))[0].split(os.sep) for path in paths]
+    for depth in range(1, max(len(part) for part in parts) + 1):
+        names = ['-'.join(filter(None, part[-depth:])) for part in parts]
+        if len(set(names)) == len(names):
+            return names
+    # The same file given twice
+    return [f'{part[-1]}-{i + 1}' for i, part in enumerate(parts)]
+
+
+def _batches(issues, size):
+    iterator = iter(issues)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class Dataset:
+    """
+    The processed data of one issues export. It is loaded once and handed to
+    every analysis run in the same process so the load and cleaning work is
+    only paid once.
+    """
+
+    def __init__(self, issues, events=None, labels=None, shards=None, fields=None):
+        self.issues = issues
+        # Long-format events table with the EVENT_COLUMNS
+        self.events = events if events is not None else empty_events_table()
+        if labels is not None:
+            self.label_matrix = labels
+        # For a dataset of several repositories, the rows of the issues and
+        # events of each repository and its rollups, by repository name
+        self.shards = shards or {}
+        # The FIELDS the dataset was loaded with, None if all of them
+        self.fields = fields
+
+    def has(self, field):
+        """Whether the dataset was loaded with the field, one of FIELDS."""
+        return self.fields is None or field in self.fields
+
+    @cached_property
+    def sorted_by_created(self):
+        """
+        Whether the issues are sorted by created_at, those without a date
+        last, as DataLoader.sort_issues leaves them.
+        """
+        keys = _datetime_keys(self.issues['created_at'])
+        dated = keys[:int((~np.isnat(keys)).sum())]
+        return bool(not np.isnat(dated).any() and (dated[1:] >= dated[:-1]).all())
+
+    def between(self, created=None, closed=None):
+        """
+        The dataset of the issues created within the created range and closed
+        within the closed range, both (since, until) ranges of time_range or
+        None. While the issues are sorted by created_at, the created range is
+        found by binary search and taken as a slice of the rows.
+        """
+        if self.issues.empty or (created is None and closed is None):
+            return self
+        rows = np.arange(len(self.issues))
+        selection = rows
+        if created is not None:
+            keys = _datetime_keys(self.issues['created_at'])
+            if self.sorted_by_created:
+                # Only the dated rows are searched, NaT sorts last
+                keys = keys[:int((~np.isnat(keys)).sum())]
+                since, until = (None if bound is None else bound.tz_localize(None).to_datetime64().astype(keys.dtype)
+                                for bound in created)
+                start = 0 if since is None else int(np.searchsorted(keys, since))
+                stop = len(keys) if until is None else max(start, int(np.searchsorted(keys, until)))
+                rows, selection = rows[start:stop], slice(start, stop)
+            else:
+                rows = selection = rows[_range_mask(keys, created)]
+        if closed is not None:
+            keys = _datetime_keys(self.issues['closed_at'].iloc[selection])
+            rows = selection = rows[aggregations.closed_mask(self.issues.iloc[selection]) & _range_mask(keys, closed)]
+
+        issues = self.issues.iloc[selection].reset_index(drop=True)
+        events = self.events[issue_positions(issues, self.events) >= 0].reset_index(drop=True)
+        labels = self.label_matrix.take(rows) if 'label_matrix' in self.__dict__ else None
+        # The rows of each repository stay in one run, their rollups are rebuilt on use
+        shards = repository_runs(issues, events) if self.shards else None
+        dataset = Dataset(issues, events, labels, shards, fields=self.fields)
+        if 'sorted_by_created' in self.__dict__:
+            # A subset in the same order is sorted if the whole was
+            dataset.sorted_by_created = self.sorted_by_created
+        return dataset
+
+    def repositories(self):
+        """The names of the repositories of a sharded dataset, empty otherwise."""
+        return list(self.shards)
+
+    def repository(self, name):
+        """
+        The dataset of a single repository of a sharded dataset. Its rows
+        are slices of the combined tables, not copies.
+        """
+        issue_rows, event_rows, rollups = self.shards[name]
+        labels = None
+        if 'label_matrix' in self.__dict__:
+            labels = self.label_matrix.take(np.arange(issue_rows.start, issue_rows.stop))
+        dataset = Dataset(self.issues.iloc[issue_rows].reset_index(drop=True),
+                          self.events.iloc[event_rows].reset_index(drop=True), labels, fields=self.fields)
+        if rollups is not None:
+            dataset.rollups = rollups
+        return dataset
+
+    @property
+    def compact(self):
+        """Whether the issues are in the compact form of compact_issues."""
+        return self.has('labels') and 'labels' not in self.issues.columns
+
+    @cached_property
+    def label_matrix(self):
+        """The LabelMatrix of the issues, built on first use."""
+        with profiling.stage('labels'):
+            return LabelMatrix.from_lists(self.issues['labels'])
+
+    @cached_property
+    def issue_labels(self):
+        """The exploded issue-label table, built on first use."""
+        return self.label_matrix.issue_labels()
+
+    @cached_property
+    def index(self):
+        """The label/creator/state IssueIndex, built on first use."""
+        with profiling.stage('index'):
+            return IssueIndex(self.issues, self.label_matrix)
+
+    @cached_property
+    def rollups(self):
+        """The materialized summary tables, built on first use."""
+        with profiling.stage('rollup'):
+            # A dataset loaded without some fields gets the tables of the others
+            return Rollups.build(self.issues, self.events if self.has('events') else None,
+                                 self.label_matrix if self.has('labels') else None)
+
+    @cached_property
+    def timeline(self):
+        """The open intervals, reopens and label history of the issues, built on first use."""
+        with profiling.stage('timeline'):
+            return Timeline.build(self.issues, self.events, self.label_matrix if self.has('labels') else None)
+
+    def compacted(self):
+        """
+        The dataset with its issues in compact form: categorical string
+        columns and the labels only in the label matrix. The rollups are
+        carried over if they were built.
+        """
+        if self.compact or self.issues.empty:
+            return self
+        with profiling.stage('compact'):
+            dataset = Dataset(compact_issues(self.issues), self.events,
+                              self.label_matrix if self.has('labels') else None, self.shards, self.fields)
+        if 'rollups' in self.__dict__:
+            dataset.rollups = self.rollups
+        return dataset
+
+    def to_frame(self):
+        """The issues in the form process_issues produces, with the labels column."""
+        if not self.compact:
+            return self.issues
+        return expand_issues(self.issues, self.label_matrix)
+
+    def upsert(self, updates, update_events=None):
+        """
+        Merges updates, cleaned issues with one row per number, and their
+        events into the dataset. New issues are appended; an issue already in
+        the dataset is replaced in place only if its updated_at moved forward.
+        The label matrix and index are patched if they were built, so
+        the work grows with the size of the update, not of the dataset.
+
+        Returns the numbers of the replaced and of the appended issues.
+        """
+        if update_events is None:
+            update_events = empty_events_table()
+        if updates.empty:
+            return [], []
+        if self.issues.empty:
+            self.issues = updates.reset_index(drop=True)
+            self.events = update_events
+            for name in ('label_matrix', 'issue_labels', 'index', 'rollups', 'sorted_by_created', 'timeline'):
+                self.__dict__.pop(name, None)
+            return [], list(updates['number'])
+
+        issues = self.issues
+        positions = pd.Index(issues['number']).get_indexer(updates['number'])
+        existing = positions >= 0
+
+        # Only versions that are newer than the stored one replace it
+        stored = issues['updated_at'].array.take(positions[existing])
+        incoming = updates['updated_at'].array[existing]
+        forward = np.asarray((incoming > stored) | (stored.isna() & ~incoming.isna()))
+        replaced_rows = np.flatnonzero(existing)[forward]
+        replaced_positions = positions[replaced_rows]
+        added_rows = np.flatnonzero(~existing)
+
+        labels_built, index_built = 'label_matrix' in self.__dict__, 'index' in self.__dict__
+        # Checked again when needed, new or changed issues may be out of order
+        self.__dict__.pop('sorted_by_created', None)
+        # Labels of the replaced and added issues, in that order
+        changed_labels = LabelMatrix.from_lists(updates['labels'].take(np.concatenate([replaced_rows, added_rows])))
+        if self.compact:
+            updates = compact_issues(updates)
+            # Extend the categories of the dataset by the new values of the updates
+            for column in CATEGORICAL_COLUMNS:
+                new_values = updates[column].cat.categories.difference(issues[column].cat.categories)
+                issues[column] = issues[column].cat.add_categories(new_values)
+            updates = updates.astype({column: issues[column].dtype for column in CATEGORICAL_COLUMNS})
+        replaced, added = updates.iloc[replaced_rows], updates.iloc[added_rows]
+
+        if index_built:
+            self.index.remove(replaced_positions)
+        replaced_numbers, added_numbers = list(replaced['number']), list(added['number'])
+        replaced_events = self.events['number'].isin(replaced_numbers).to_numpy()
+        if 'rollups' in self.__dict__:
+            # Take out the contribution of the old versions of the replaced issues
+            old_labels = self.label_matrix.take(replaced_positions) if labels_built else None
+            self.rollups = self.rollups.combine(
+                Rollups.build(issues.iloc[replaced_positions], self.events[replaced_events], old_labels), sign=-1)
+
+        for column in issues.columns:
+            issues.iloc[replaced_positions, issues.columns.get_loc(column)] = replaced[column].array
+        if not added.empty:
+            start = issues.index.max() + 1
+            added = added.astype(issues.dtypes.to_dict()).set_axis(pd.RangeIndex(start, start + len(added)))
+            issues = pd.concat([issues, added])
+            self.issues = issues
+        added_positions = np.arange(len(issues) - len(added), len(issues), dtype=np.int64)
+        changed_positions = np.concatenate([replaced_positions, added_positions])
+
+        if labels_built:
+            self.label_matrix = self.label_matrix.update(changed_positions, changed_labels)
+        self.__dict__.pop('issue_labels', None)
+        # The timeline is rebuilt from the updated events when it is next used
+        self.__dict__.pop('timeline', None)
+        if index_built:
+            self.index.insert(issues, self.label_matrix, changed_positions)
+
+        # The events of a replaced issue are replaced by those of its new version
+        new_events = update_events[update_events['number'].isin(replaced_numbers + added_numbers).to_numpy()]
+        self.events = concat_events([self.events[~replaced_events], new_events])
+        if 'rollups' in self.__dict__:
+            self.rollups = self.rollups.combine(Rollups.build(issues.iloc[changed_positions], new_events, changed_labels))
+        return replaced_numbers, added_numbers
+
+
+def sort_issues(df):
+    """
+    The processed issues df sorted by created_at, issues without a date last,
+    so Dataset.between finds a range of creation dates by binary search.
+    """
+    if df.empty:
+        return df
+    return df.sort_values('created_at', kind='stable', na_position='last').reset_index(drop=True)
+
+
+class EventTableBuilder:
+    """
+    Flattens the events of the issues into the long-format events table while
+    the issues are processed. Events are collected column by column and turned
+    into a DataFrame chunk whenever flush is called. The dates of every chunk
+    are kept packed (pack_dates) and parsed together in build, so they get the
+    dtype parse_dates gives the whole column however it is chunked.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.dates = []
+        self._start_chunk()
+
+    def _start_chunk(self):
+        self.records, self.event_types, self.authors, self.event_dates, self.labels = [], [], [], [], []
+
+    # Add the events of the issue at position record of the processed issues
+    def add(self, record, events):
+        for event in events:
+            self.records.append(record)
+            self.event_types.append(intern_str(event.get('event_type')))
+            self.authors.append(intern_str(event.get('author')))
+            self.event_dates.append(event.get('event_date'))
+            self.labels.append(intern_str(event.get('label')))
+
+    def flush(self):
+        if self.records:
+            self.chunks.append(pd.DataFrame({
+                'record': np.array(self.records, dtype=np.int64),
+                'event_type': pd.Series(self.event_types, dtype=object),
+                'author': pd.Series(self.authors, dtype=object),
+                'label': pd.Series(self.labels, dtype=object),
+            }))
+            self.dates.append(pack_dates(self.event_dates))
+            self._start_chunk()
+
+    # Build the events table for the issues kept in the cleaned issues DataFrame,
+    # whose index holds the position of each issue in the processed issues
+    def build(self, issues_df):
+        self.flush()
+        events = pd.concat(self.chunks, ignore_index=True) if self.chunks else None
+        dates, self.chunks, self.dates = self.dates, [], []
+        # The parallel mode adds a chunk even when the issues have no events
+        if events is None or events.empty or issues_df.empty:
+            return empty_events_table()
+        events['event_date'] = unpack_dates(dates)
+
+        # Events of duplicate or invalid issues that were dropped are dropped too
+        positions = issues_df.index.get_indexer(events['record'])
+        kept = positions >= 0
+        events = events[kept]
+        return pd.DataFrame({
+            'number': issues_df['number'].to_numpy()[positions[kept]],
+            'event_type': events['event_type'].astype('category').array,
+            'author': events['author'].astype('category').array,
+            'event_date': events['event_date'].array,
+            'label': events['label'].astype('category').array,
+        })
+
 
 class DataLoader:
-    def __init__(self, config_path='config.json'):
-        self.file_path = self.get_file_path(config_path)
+    def __init__(self, config_path='config.json', stream=None, chunk_size=None, use_cache=None, workers=None,
+                 compact=None, created=None, closed=None, fields=None):
+        # file_path is one issues file, or a list or glob of shard files of several repositories
+        self.file_paths = self.get_file_paths(config_path)
+        self.file_path = self.file_paths[0]
+        # Streaming mode parses the issues one at a time instead of json.load-ing the whole file
+        self.stream = stream if stream is not None else bool(config.get_parameter('stream'))
+        self.chunk_size = chunk_size or config.get_parameter('chunk_size', DEFAULT_CHUNK_SIZE)
+        # More than one worker processes the issues in a process pool, 0 uses every core
+        if workers is None:
+            workers = config.get_parameter('workers', 1)
+        self.workers = int(workers) if int(workers) > 0 else os.cpu_count()
+        # The processed DataFrame is cached on disk unless disabled with "cache": false
+        if use_cache is None:
+            use_cache = config.get_parameter('cache') is not False
+        self.cache = IssueCache(config.get_parameter('cache_dir', DEFAULT_CACHE_DIR)) if use_cache else None
+        # Compact mode holds the loaded dataset with categorical columns and a label matrix
+        self.compact = compact if compact is not None else bool(config.get_parameter('compact_issues'))
+        # Only the issues created (--since, --until) and closed within these time_range
+        # ranges are loaded, the others are skipped while the file is read
+        if created is None:
+            created = time_range(config.get_parameter('since'), config.get_parameter('until'))
+        self.created = created
+        self.closed = closed
+        # Only these FIELDS are extracted and converted, None loads all of them. The
+        # closing dates a closed range is checked against are kept so cached data can be sliced.
+        if fields is not None and closed is not None:
+            fields = set(fields) | {'state', 'closed_at'}
+        self.fields = projected_fields(fields)
+
+    def has(self, field):
+        """Whether the field, one of FIELDS, is loaded."""
+        return self.fields is None or field in self.fields
+
+    @property
+    def columnar(self):
+        """Whether file_path is a dataset converted by columnar.py rather than a JSON export."""
+        from columnar import is_columnar
+        return is_columnar(self.file_path)
+
+    @property
+    def ranged(self):
+        """Whether only a time range of the issues is loaded."""
+        return self.created is not None or self.closed is not None
 
     # Load the file path from config.json
     def get_file_path(self, config_path):
@@ -11,73 +652,522 @@ class DataLoader:
             config = json.load(f)
         return config['file_path']
 
-    # Load the issues from the JSON file
-    def load_issues(self):
-        with open(self.file_path, 'r') as f:
+    # The shard files given by the file_path of config.json: a single path, a glob
+    # pattern or a list of either, sorted within each pattern
+    def get_file_paths(self, config_path):
+        file_path = self.get_file_path(config_path)
+        paths = []
+        for pattern in file_path if isinstance(file_path, list) else [file_path]:
+            # A pattern matching nothing is kept, so opening it reports the missing file
+            matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else []
+            paths.extend(path for path in matches or [pattern] if path not in paths)
+        return paths
+
+    # The raw issues are read from one file, the shards of a multi-repository dataset
+    # are only combined once processed, by load_dataset or load_and_process_issues
+    def _check_single_file(self, path):
+        if path is None and len(self.file_paths) > 1:
+            raise ValueError(f"file_path names {len(self.file_paths)} files ({', '.join(self.file_paths)}); "
+                             "read their issues with load_dataset or load_and_process_issues, or pass the path of one")
+
+    # Load the issues from the JSON file, or from another file in the same format
+    def load_issues(self, path=None):
+        self._check_single_file(path)
+        with open(path or self.file_path, 'r') as f:
             issues = json.load(f)
         return issues
 
-    # Helper function to find who closed the issue and when
+    # Lazily yield the issues of the JSON file one at a time so only the
+    # issue being parsed (plus one read block) is held in memory
+    def iter_issues(self, path=None):
+        self._check_single_file(path)
+        path = path or self.file_path
+        decoder = json.JSONDecoder()
+        with open(path, 'r') as f:
+            buffer = f.read(STREAM_READ_SIZE)
+            eof = not buffer
+            pos = self._skip_whitespace(buffer, 0)
+
+            # The export is a single top-level JSON array
+            while pos >= len(buffer) and not eof:
+                buffer = f.read(STREAM_READ_SIZE)
+                eof = not buffer
+                pos = self._skip_whitespace(buffer, 0)
+            if pos >= len(buffer):
+                return
+            if buffer[pos] != '[':
+                raise ValueError(f"Expected a JSON array of issues in {path}")
+            pos += 1
+
+            while True:
+                # Skip separators between issues, reading more data when we run out
+                pos = self._skip_whitespace(buffer, pos, separators=',')
+                if pos >= len(buffer):
+                    if eof:
+                        raise ValueError(f"Unexpected end of file in {path}")
+                    chunk = f.read(STREAM_READ_SIZE)
+                    eof = not chunk
+                    buffer, pos = chunk, 0
+                    continue
+                if buffer[pos] == ']':
+                    return
+
+                try:
+                    issue, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The issue is split across read blocks, pull in the next one
+                    if eof:
+                        raise
+                    chunk = f.read(STREAM_READ_SIZE)
+                    eof = not chunk
+                    buffer, pos = buffer[pos:] + chunk, 0
+                    continue
+
+                yield issue
+                pos = end
+
+    @staticmethod
+    def _skip_whitespace(buffer, pos, separators=''):
+        skip = ' \t\r\n' + separators
+        while pos < len(buffer) and buffer[pos] in skip:
+            pos += 1
+        return pos
+
+    # Helper function to find who closed the issue and when: the close that left it
+    # closed. As in Timeline, the closed and reopened events are taken in the order of
+    # their dates, whatever their order in the file, and only count when they change
+    # the state, so this is the close of Timeline.final_close.
     def get_closing_event(self, events):
+        state_events = []
         for event in events:
+            if event.get("event_type") in STATE_EVENTS:
+                date = _utc_key(event.get("event_date"))
+                if date is not None:
+                    state_events.append((date, event))
+        closing = None
+        # Sorted by date only, events of the same date keep their order
+        for _, event in sorted(state_events, key=lambda state_event: state_event[0]):
             if event.get("event_type") == "closed":
-                return event.get("author"), event.get("event_date")
-        return None, None
-    
-    # Process the issues and return them as a pandas DataFrame
-    def process_issues(self, issues):
-        processed_issues = []
+                # Closing an issue that is already closed changes nothing
+                closing = closing or event
+            else:
+                closing = None
+        if closing is None:
+            return None, None
+        return closing.get("author"), closing.get("event_date")
+
+    # Skip the raw issues without a number or created or closed outside the requested
+    # ranges, before they are processed. The dates are compared as UTC strings, not
+    # parsed. As select_issues keeps the first issue of a number, a later duplicate is
+    # skipped even if the first one was out of range.
+    def select_in_range(self, issues):
+        created, closed = _range_keys(self.created), _range_keys(self.closed)
+        seen = set()
         for issue in issues:
-            # Extract the closed event author and date if the state is closed
+            number = issue.get('number')
+            if number is None or number in seen:
+                continue
+            seen.add(number)
+            if created is not None and not _within(_utc_key(issue.get('created_date')), created):
+                continue
+            if closed is not None:
+                if issue.get('state') != 'closed':
+                    continue
+                _, closed_at = self.get_closing_event(issue.get('events', []))
+                if not _within(_utc_key(closed_at), closed):
+                    continue
+            yield issue
+
+    # Turn a single raw issue into the flat record used for the DataFrame
+    def process_issue(self, issue):
+        if self.fields is not None:
+            return self.process_fields(issue)
+
+        # Extract the closed event author and date if the state is closed
+        closed_by, closed_at = None, None
+        if issue.get('state') == 'closed':
+            closed_by, closed_at = self.get_closing_event(issue.get("events", []))
+
+        return {
+            'number': issue.get('number'),
+            'creator': issue.get('creator'),
+            'title': issue.get('title'),
+            'state': issue.get('state'),
+            'created_at': issue.get('created_date'),
+            'updated_at': issue.get('updated_date'),
+            'labels': issue.get('labels', []),
+            'closed_by': closed_by,          # Add closed_by column
+            'closed_at': closed_at           # Add closed_at column
+        }
+
+    # Projected version of process_issue, which copies only the loaded fields and
+    # only looks for the closing event if closed_by or closed_at is loaded
+    def process_fields(self, issue):
+        record = {field: issue.get(RAW_KEYS[field]) for field in self.fields if field in RAW_KEYS}
+        if self.has('closed_by') or self.has('closed_at'):
             closed_by, closed_at = None, None
             if issue.get('state') == 'closed':
                 closed_by, closed_at = self.get_closing_event(issue.get("events", []))
-            
-            processed_issue = {
-                'number': issue.get('number'),
-                'creator': issue.get('creator'),
-                'title': issue.get('title'),
-                'state': issue.get('state'),
-                'created_at': issue.get('created_date'),
-                'updated_at': issue.get('updated_date'),
-                'labels': issue.get('labels', []),
-                'closed_by': closed_by,          # Add closed_by column
-                'closed_at': closed_at           # Add closed_at column
-            }
-            processed_issues.append(processed_issue)
-        
-        # Convert to DataFrame for better visualization
-        df = pd.DataFrame(processed_issues)
-        
-        # Data cleaning
+            if self.has('closed_by'):
+                record['closed_by'] = closed_by
+            if self.has('closed_at'):
+                record['closed_at'] = closed_at
+        return record
+
+    # Process the issues and return them as a pandas DataFrame. The issues can be
+    # a list or any iterable (e.g. iter_issues), in which case the DataFrame is
+    # built in chunks of chunk_size records. If an EventTableBuilder is passed,
+    # the events of every issue are flattened into it in the same pass.
+    def process_issues(self, issues, events=None):
+        if self.workers > 1:
+            return self.process_issues_parallel(issues, events)
+
+        with profiling.stage('parse'):
+            if isinstance(issues, list):
+                processed_issues = []
+                for record, issue in enumerate(issues):
+                    processed_issues.append(self.process_issue(issue))
+                    if events is not None:
+                        events.add(record, issue.get('events') or [])
+                # Convert to DataFrame for better visualization
+                df = pd.DataFrame(processed_issues)
+            else:
+                chunks = []
+                processed_issues = []
+                for record, issue in enumerate(issues):
+                    processed_issues.append(self.process_issue(issue))
+                    if events is not None:
+                        events.add(record, issue.get('events') or [])
+                    if len(processed_issues) >= self.chunk_size:
+                        chunks.append(pd.DataFrame(processed_issues))
+                        processed_issues = []
+                        if events is not None:
+                            events.flush()
+                if processed_issues:
+                    chunks.append(pd.DataFrame(processed_issues))
+                # A chunk whose strings are all missing has object columns, the dtypes are
+                # inferred again over all chunks to give those of the list path
+                df = pd.concat(chunks, ignore_index=True).infer_objects() if chunks else pd.DataFrame()
+
+        with profiling.stage('clean'):
+            return self.clean_issues(df)
+
+    # Parallel version of process_issues. Batches of chunk_size issues are processed
+    # by a pool of worker processes and their columns merged in the original order,
+    # giving exactly the DataFrame (and events table) of the serial path.
+    def process_issues_parallel(self, issues, events=None):
+        with profiling.stage('parse'):
+            parts = []
+            with ProcessPoolExecutor(self.workers) as executor:
+                # Only a few batches are in flight at a time to keep memory bounded
+                pending = deque()
+                for batch in _batches(issues, self.chunk_size):
+                    pending.append(executor.submit(_process_batch, self, batch, events is not None))
+                    if len(pending) >= 2 * self.workers:
+                        parts.append(pending.popleft().result())
+                while pending:
+                    parts.append(pending.popleft().result())
+
+            columns = {}
+            for name in (parts[0]['names'] if parts else []):
+                if name in DATE_COLUMNS:
+                    # Dates are parsed after the rows have been selected, like clean_issues does
+                    columns[name] = None
+                elif name in CODED_COLUMNS:
+                    columns[name] = list(np.concatenate([_unpack_strings(part['columns'][name]) for part in parts]))
+                else:
+                    columns[name] = [value for part in parts for value in part['columns'][name]]
+            df = pd.DataFrame(columns)
+        if df.empty:
+            return self.clean_issues(df)
+
+        with profiling.stage('clean'):
+            df = self.select_issues(df)
+            positions = df.index.to_numpy()
+            for name in DATE_COLUMNS:
+                if name not in df.columns:
+                    continue
+                df[name] = unpack_dates([part['dates'][name] for part in parts], positions, df.index)
+
+            if events is not None:
+                offsets = np.cumsum([0] + [part['size'] for part in parts])
+                merged = [part['events'] for part in parts]
+                events.chunks.append(pd.DataFrame({
+                    'record': np.concatenate([e['record'] + offset for e, offset in zip(merged, offsets)]),
+                    'event_type': np.concatenate([_unpack_strings(e['event_type']) for e in merged]),
+                    'author': np.concatenate([_unpack_strings(e['author']) for e in merged]),
+                    'label': np.concatenate([_unpack_strings(e['label']) for e in merged]),
+                }))
+                events.dates.extend(e['event_date'] for e in merged)
+
+            return self.convert_issues(df)
+
+    # Data cleaning of the processed issues DataFrame
+    def clean_issues(self, df):
         if not df.empty:
-            df = df[df['number'].notnull()]
-            df = df.drop_duplicates(subset='number')
-            df['created_at'] = pd.to_datetime(df['created_at'], errors='coerce')
-            df['updated_at'] = pd.to_datetime(df['updated_at'], errors='coerce')
-            df['closed_at'] = pd.to_datetime(df['closed_at'], errors='coerce')
+            df = self.select_issues(df)
+            df = self.convert_issues(df)
+        else:
+            print("Empty DataFrame after processing.")
+
+        return df
+
+    # Drop issues without a number and duplicate issues
+    def select_issues(self, df):
+        df = df[df['number'].notnull()]
+        return df.drop_duplicates(subset='number')
+
+    # Convert the columns of the selected issues to their final types, those that were loaded
+    def convert_issues(self, df):
+        dates = [column for column in DATE_COLUMNS if column in df.columns]
+        for column in dates:
+            df[column] = parse_dates(df[column])
+        # A column of naive dates, e.g. closed_at when no issue is closed, is taken to
+        # be in UTC when the other columns have a time zone, so they can be subtracted
+        tz = next((df[column].dt.tz for column in dates if df[column].dt.tz is not None), None)
+        if tz is not None:
+            for column in dates:
+                if df[column].dt.tz is None:
+                    df[column] = df[column].dt.tz_localize('UTC').dt.tz_convert(tz)
+        if 'closed_by' in df.columns:
             df['closed_by'] = df['closed_by'].str.strip().str.lower()
+        if 'labels' in df.columns:
             df['labels'] = df['labels'].apply(lambda x: x if isinstance(x, list) else [])
+        if 'title' in df.columns:
             df['title'] = df['title'].str.strip().str.lower()
+        if 'state' in df.columns:
             df['state'] = df['state'].str.strip().str.lower()
-        else:
-            print("Empty DataFrame after processing.")
-        
         return df
 
     def load_and_process_issues(self):
+        if len(self.file_paths) > 1:
+            return self.load_sharded_dataset().to_frame()
+        if self.columnar:
+            return self.load_columnar_dataset().to_frame()
+        # Reuse the cleaned DataFrame of a previous run if the file is unchanged
+        if self.cache is not None:
+            cached_df = self.load_cached_issues()
+            if cached_df is not None:
+                return Dataset(cached_df).between(self.created, self.closed).issues
+
+        processed_df = sort_issues(self._load_and_process_issues())
+        if self.cache is not None and not processed_df.empty and not self.ranged:
+            self.cache.store(self.file_path, processed_df, projection_variant(None, self.fields))
+        return processed_df
+
+    # The cached issues, projected to the loaded fields, or None. A projection is
+    # taken from the cached whole dataset if there is one, which also holds the
+    # ingested updates, else from the entry stored by a load of the same fields.
+    def load_cached_issues(self):
+        cached_df = self.cache.load(self.file_path)
+        if self.fields is None:
+            return cached_df
+        if cached_df is None:
+            return self.cache.load(self.file_path, projection_variant(None, self.fields))
+        return cached_df[[column for column in self.fields if column in ISSUE_COLUMNS]]
+
+    # Load and process the issues together with their flattened events table
+    def load_issues_and_events(self):
+        if self.cache is not None:
+            with profiling.stage('load'):
+                cached_df = self.load_cached_issues()
+                cached_events = empty_events_table()
+                if cached_df is not None and self.has('events'):
+                    cached_events = self.cache.load(self.file_path, EVENTS_CACHE_VARIANT)
+            if cached_df is not None and cached_events is not None:
+                if not self.ranged:
+                    return cached_df, cached_events
+                # The cache holds the whole file, sorted, of which the range is sliced
+                dataset = Dataset(cached_df, cached_events).between(self.created, self.closed)
+                return dataset.issues, dataset.events
+
+        # The events are only flattened if the events table is loaded
+        events = EventTableBuilder() if self.has('events') else None
+        processed_df = self._load_and_process_issues(events)
+        with profiling.stage('events'):
+            events_df = events.build(processed_df) if events is not None else empty_events_table()
+            processed_df = sort_issues(processed_df)
+        # Only the whole file is cached, not a part of it
+        if self.cache is not None and not processed_df.empty and not self.ranged:
+            with profiling.stage('store'):
+                self.cache.store(self.file_path, processed_df, projection_variant(None, self.fields))
+                if events is not None:
+                    self.cache.store(self.file_path, events_df, EVENTS_CACHE_VARIANT)
+        return processed_df, events_df
+
+    def _load_and_process_issues(self, events=None):
+        # Stream the issues straight into the chunked DataFrame builder
+        if self.stream:
+            processed_df = self.process_issues(self.select_in_range(self.iter_issues()), events)
+            if processed_df.empty:
+                print("No issues found in the requested time range." if self.ranged
+                      else "No issues found in the JSON file.")
+            return processed_df
+
         # Load and process issues
-        issues = self.load_issues()
-        
+        with profiling.stage('load'):
+            issues = self.load_issues()
+
         # Check if issues were loaded correctly
         if not issues:
             print("No issues found in the JSON file.")
             return pd.DataFrame()  # Return an empty DataFrame if no issues found
-        
+
+        # The same selection as while streaming, so both modes build the same frame
+        issues = list(self.select_in_range(issues))
+        if not issues:
+            print("No issues found in the requested time range." if self.ranged
+                  else "No issues with a number found in the JSON file.")
+            return pd.DataFrame()
+
         # Process the issues and return the DataFrame
-        processed_df = self.process_issues(issues)
+        processed_df = self.process_issues(issues, events)
         return processed_df
 
+    # Load and process the issues into a Dataset that can be shared by several analyses
+    def load_dataset(self):
+        if len(self.file_paths) > 1:
+            return self.load_sharded_dataset()
+        if self.columnar:
+            return self.load_columnar_dataset()
+        dataset = Dataset(*self.load_issues_and_events(), fields=self.fields)
+        # The rollups are materialized once per version of the whole dataset. Those of
+        # all fields serve a projection too, which otherwise has its own with fewer tables.
+        if self.cache is not None and not dataset.issues.empty and not self.ranged:
+            variant = projection_variant(ROLLUPS_CACHE_VARIANT, self.fields)
+            with profiling.stage('load'):
+                rollups = self.cache.load(self.file_path, ROLLUPS_CACHE_VARIANT)
+                if rollups is None and self.fields is not None:
+                    rollups = self.cache.load(self.file_path, variant)
+            if rollups is not None:
+                dataset.rollups = rollups
+            else:
+                rollups = dataset.rollups
+                with profiling.stage('store'):
+                    self.cache.store(self.file_path, rollups, variant)
+        # The cache holds the full form, which is compacted after loading
+        if self.compact:
+            dataset = dataset.compacted()
+        return dataset
+
+    # Open the memory-mapped dataset that columnar.py converted the export into. It
+    # needs no parsing or cache, and comes in compact form whatever compact is set to.
+    def load_columnar_dataset(self):
+        from columnar import open_columnar
+        dataset = open_columnar(self.file_path, self.fields)
+        return dataset.between(self.created, self.closed)
+
+    # Load the shard files concurrently, one per worker process, and combine them into
+    # a single Dataset with a categorical 'repository' column. The tables of every
+    # shard are concatenated once, and the rollups of the shards are added up.
+    def load_sharded_dataset(self):
+        names = repository_names(self.file_paths)
+        workers = int(config.get_parameter('shard_workers') or 0) or os.cpu_count()
+        with profiling.stage('shards'):
+            if min(workers, len(self.file_paths)) > 1:
+                with ProcessPoolExecutor(min(workers, len(self.file_paths))) as executor:
+                    loaded = list(executor.map(_load_shard, [self] * len(self.file_paths), self.file_paths))
+            else:
+                loaded = [_load_shard(self, path) for path in self.file_paths]
+
+        shards, issue_tables, event_tables = {}, [], []
+        issue_start = event_start = 0
+        for name, (issues, events, rollups) in zip(names, loaded):
+            if issues.empty:
+                print(f"No issues found in the shard of {name}.")
+                continue
+            shards[name] = (slice(issue_start, issue_start + len(issues)),
+                            slice(event_start, event_start + len(events)), rollups)
+            issue_start += len(issues)
+            event_start += len(events)
+            issue_tables.append(issues)
+            event_tables.append(events)
+        if not shards:
+            return Dataset(pd.DataFrame())
+
+        with profiling.stage('combine'):
+            issues = pd.concat(issue_tables, ignore_index=True)
+            issues['repository'] = _repository_column(shards, [table for table, _, _ in shards.values()])
+            events = concat_events(event_tables)
+            events['repository'] = _repository_column(shards, [table for _, table, _ in shards.values()])
+            dataset = Dataset(issues, events, shards=shards, fields=self.fields)
+            rollups = [rollups for _, _, rollups in shards.values()]
+            dataset.rollups = rollups[0]
+            for other in rollups[1:]:
+                dataset.rollups = dataset.rollups.combine(other)
+        if self.compact:
+            dataset = dataset.compacted()
+        return dataset
+
+    # Read an update file, either a delta with only the changed issues or a newer
+    # full snapshot, and return the cleaned issues that are new or newer than in
+    # issues_df together with their events table. Unchanged issues are filtered
+    # out before processing, and of an issue repeated in the file the newest
+    # version is kept.
+    def load_updates(self, path, issues_df):
+        issues = self.iter_issues(path) if self.stream else self.load_issues(path)
+        if issues_df.empty:
+            stored_numbers, stored_updated = pd.Index([]), None
+        else:
+            stored_numbers, stored_updated = pd.Index(issues_df['number']), issues_df['updated_at'].array
+
+        candidates = []
+        for batch in _batches(issues, self.chunk_size):
+            numbers = pd.Index([issue.get('number') for issue in batch], dtype=object)
+            updated = parse_dates([issue.get('updated_date') for issue in batch]).array
+            keep = np.asarray(numbers.notna())
+            if stored_updated is not None:
+                positions = stored_numbers.get_indexer(numbers)
+                stored = stored_updated.take(positions, allow_fill=True)
+                keep &= (positions < 0) | np.asarray((updated > stored) | (stored.isna() & ~updated.isna()))
+            candidates.extend(issue for issue, kept in zip(batch, keep) if kept)
+
+        events = EventTableBuilder()
+        records = []
+        for record, issue in enumerate(candidates):
+            records.append(self.process_issue(issue))
+            events.add(record, issue.get('events') or [])
+        if not records:
+            return pd.DataFrame(), empty_events_table()
+
+        updates_df = self.convert_issues(pd.DataFrame(records))
+        # Keep the newest version of each issue, the later one on equal updated_at
+        updates_df = updates_df.sort_values('updated_at', kind='stable', na_position='first') \
+            .drop_duplicates(subset='number', keep='last').sort_index()
+        return updates_df, events.build(updates_df)
+
+    # Upsert the issues of an update file into dataset (the stored dataset if not
+    # given) and store the result, so later runs start from the updated dataset
+    def ingest(self, path, dataset=None):
+        if len(self.file_paths) > 1:
+            print(f"Not ingesting {path}: updates are ingested into a single repository's file, "
+                  "not into a dataset of several shards.")
+            return dataset
+        if self.columnar:
+            print(f"Not ingesting {path}: {self.file_path} is a converted columnar dataset, "
+                  "ingest into the JSON export and convert it again.")
+            return dataset
+        if self.ranged or self.fields is not None:
+            print(f"Not ingesting {path}: updates are ingested into the whole dataset, "
+                  "not into a time range or some of the fields of it.")
+            return dataset
+        if dataset is None:
+            dataset = self.load_dataset()
+        with profiling.stage('ingest'):
+            updates_df, update_events = self.load_updates(path, dataset.issues)
+            replaced, added = dataset.upsert(updates_df, update_events)
+        print(f"Ingested {path}: {len(replaced)} updated and {len(added)} new issues")
+
+        if self.cache is None:
+            print("The cache is disabled, the ingested issues are not stored.")
+        elif replaced or added:
+            with profiling.stage('store'):
+                # Issues added out of created_at order are sorted into place for the next load
+                self.cache.store(self.file_path, sort_issues(dataset.to_frame()), update=path)
+                self.cache.store(self.file_path, dataset.events, EVENTS_CACHE_VARIANT, update=path)
+                self.cache.store(self.file_path, dataset.rollups, ROLLUPS_CACHE_VARIANT, update=path)
+        return dataset
+
 # Example of how to use the DataLoader class
 if __name__ == '__main__':
     data_loader = DataLoader()
@@ -0,0 +1,57 @@
+"""
+The analyses that can be run, by feature number. Both run.py and the query
+server (server.py) select analyses through this table.
+"""
+
+import importlib
+
+
+# Analyses that can be selected with the --feature flag, as the module and
+# class each is loaded from. A module is only imported when its feature is
+# selected, so listing features or --help do not pay for pandas or matplotlib.
+FEATURES = {
+    0: ('overall_analysis', 'OverallAnalysis', 'Analysis of labels'),
+    1: ('analysis', 'Analysis', 'Analysis of closed issues by user and label'),
+    2: ('month_issue_analysis', 'MonthIssueAnalysis', 'Analysis of opened and closed tickets based on months'),
+    3: ('issue_close_time_analysis', 'IssueCloseTimeAnalysis', 'Analysis of average time it takes to close various issue types'),
+}
+
+
+def load_feature(feature):
+    """Imports the module of a feature and returns its analysis class."""
+    module, cls, _ = FEATURES[feature]
+    return getattr(importlib.import_module(module), cls)
+
+
+def parse_features(values):
+    """
+    Converts the values of the --feature flag into the list of features to
+    run, in the order given. "all" selects every feature.
+    """
+    features = []
+    for value in values:
+        if value == 'all':
+            features.extend(f for f in FEATURES if f not in features)
+            continue
+        try:
+            feature = int(value)
+        except ValueError:
+            feature = None
+        if feature not in FEATURES:
+            raise ValueError(f"Unknown feature '{value}', expected one of {sorted(FEATURES)} or 'all'")
+        if feature not in features:
+            features.append(feature)
+    return features
+
+
+def required_fields(analyses):
+    """
+    The fields of the dataset that the analysis classes read, as declared by
+    their FIELDS, or None (every field) if one of them declares none.
+    """
+    fields = []
+    for analysis in analyses:
+        if getattr(analysis, 'FIELDS', None) is None:
+            return None
+        fields.extend(field for field in analysis.FIELDS if field not in fields)
+    return fields
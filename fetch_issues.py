@@ -0,0 +1,408 @@
+"""
+Builds the issues export that DataLoader reads from a GitHub-style REST API.
+The issues of the repository are listed page by page and the timeline of
+every issue (its timeline_url) is fetched for its events, all concurrently:
+
+    GET /repos/<owner>/<repo>/issues?state=all    the issues, pull requests skipped
+    GET <timeline_url of each issue>               its events
+
+The requests share a pool of keep-alive connections and at most concurrency
+of them are in flight. When the API reports that the rate limit is used up,
+every request waits until it resets. The responses are kept in a cache with
+their ETag and Last-Modified validators and are requested again
+conditionally, so unchanged pages and timelines come back as 304 Not Modified,
+which does not count against the rate limit. The issues are listed in the
+order they were created, so the pages of old issues stay the same as new
+issues are added.
+
+The export is written in the JSON shape of model.Issue.from_json. With
+--since, only the issues updated since then are fetched, which makes a delta
+file for run.py --ingest.
+
+Run from the repository root with:
+    python fetch_issues.py python-poetry/poetry poetry_issues.json [--since 2024-06-01]
+
+The API is https://api.github.com unless api_url is set in config.json, and
+the token is taken from github_token or the GITHUB_TOKEN environment variable.
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timezone
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import config
+from cache import DEFAULT_CACHE_DIR
+from model import parse_date
+
+DEFAULT_API_URL = 'https://api.github.com'
+
+# Requests in flight at once, also the number of pooled connections
+DEFAULT_CONCURRENCY = 8
+
+# Items per page, the API's maximum
+PER_PAGE = 100
+
+# Attempts of a request that fails with a server or connection error, and
+# the seconds waited before the first retry, doubled before each next one
+MAX_ATTEMPTS = 5
+RETRY_DELAY = 1.0
+
+REQUEST_TIMEOUT = 60
+
+HEADERS = {
+    'Accept': 'application/vnd.github+json',
+    'Accept-Encoding': 'gzip',
+    'User-Agent': 'enpm611-issue-export',
+    'X-GitHub-Api-Version': '2022-11-28',
+}
+
+
+class ApiError(Exception):
+    """A request to the API that did not succeed."""
+
+
+class ConnectionPool:
+    """
+    Keep-alive HTTP connections to the API hosts, each used by one request at
+    a time. The blocking requests run in a thread pool so the event loop can
+    wait for many of them at once; the pool is only touched from the loop.
+    """
+
+    def __init__(self, size, timeout=REQUEST_TIMEOUT):
+        self.timeout = timeout
+        # Idle connections by (scheme, host)
+        self.idle = {}
+        self.executor = ThreadPoolExecutor(max_workers=size)
+
+    def _connect(self, scheme, host):
+        connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+        return connection_class(host, timeout=self.timeout)
+
+    @staticmethod
+    def _send(connection, path, headers):
+        connection.request('GET', path, headers=headers)
+        response = connection.getresponse()
+        body = response.read()
+        if response.getheader('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return response.status, response.headers, body, response.will_close
+
+    async def get(self, url, headers):
+        """Sends GET url and returns the status, headers and body of the response."""
+        parts = urlsplit(url)
+        host = (parts.scheme, parts.netloc)
+        idle = self.idle.setdefault(host, [])
+        connection = idle.pop() if idle else self._connect(*host)
+        path = parts.path + (f'?{parts.query}' if parts.query else '')
+        try:
+            status, response_headers, body, will_close = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._send, connection, path, headers)
+        except BaseException:
+            connection.close()
+            raise
+        if will_close:
+            connection.close()
+        else:
+            idle.append(connection)
+        return status, response_headers, body
+
+    def close(self):
+        for connections in self.idle.values():
+            for connection in connections:
+                connection.close()
+        self.idle = {}
+        self.executor.shutdown()
+
+
+class ResponseCache:
+    """
+    The last successful response to each URL with its validators, one JSON
+    file per URL, so the URL can be requested conditionally on the next run.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.json')
+
+    def load(self, url):
+        """The cached entry of url, a dict with 'etag', 'last_modified', 'link' and 'body', or None."""
+        try:
+            with open(self._path(url), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, url, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self._path(url)
+        # Moved into place so a concurrent run never reads a partial entry
+        tmp_path = path + f'.{os.getpid()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+
+class ApiClient:
+    """
+    Rate limit aware client of the API that returns the JSON of GET
+    requests, conditionally if the response cache holds the URL.
+    """
+
+    def __init__(self, api_url, token=None, concurrency=DEFAULT_CONCURRENCY, cache=None):
+        self.api_url = api_url.rstrip('/')
+        self.headers = dict(HEADERS)
+        if token:
+            self.headers['Authorization'] = f'Bearer {token}'
+        self.pool = ConnectionPool(concurrency)
+        self.slots = asyncio.Semaphore(concurrency)
+        self.cache = cache
+        # Epoch time until which no request is sent, set when the rate limit is used up
+        self.resume_at = 0.0
+        self.reported_resume_at = 0.0
+        self.requests = 0
+        self.not_modified = 0
+
+    async def _wait_for_rate_limit(self):
+        while self.resume_at > time.time():
+            if self.reported_resume_at != self.resume_at:
+                self.reported_resume_at = self.resume_at
+                print(f"Rate limit reached, waiting {self.resume_at - time.time():.0f} s for it to reset")
+            await asyncio.sleep(self.resume_at - time.time())
+
+    def _update_rate_limit(self, status, headers):
+        """Notes when requests have to wait, returns whether this response was rate limited."""
+        retry_after = headers.get('Retry-After')
+        used_up = headers.get('X-RateLimit-Remaining') == '0' and headers.get('X-RateLimit-Reset')
+        if retry_after:
+            self.resume_at = max(self.resume_at, time.time() + float(retry_after))
+        elif used_up:
+            # Reset is in epoch seconds, the extra second covers clock skew
+            self.resume_at = max(self.resume_at, float(headers['X-RateLimit-Reset']) + 1)
+        return status in (403, 429) and bool(retry_after or used_up)
+
+    async def get(self, url, params=None):
+        """
+        The decoded JSON of GET url (absolute, or a path of the API) with the
+        query params, and the Link header of the response. Server errors,
+        dropped connections and rate limited responses are retried.
+        """
+        if not url.startswith(('http://', 'https://')):
+            url = self.api_url + url
+        if params:
+            url += ('&' if '?' in url else '?') + urlencode(params)
+        entry = self.cache.load(url) if self.cache is not None else None
+        headers = dict(self.headers)
+        if entry is not None:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        error = None
+        for attempt in range(MAX_ATTEMPTS):
+            async with self.slots:
+                # Checked once a slot is free, the limit may have run out while queued
+                await self._wait_for_rate_limit()
+                try:
+                    status, response_headers, body = await self.pool.get(url, headers)
+                except (OSError, http.client.HTTPException) as e:
+                    status, error = None, e
+            if status is None:
+                await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+                continue
+            self.requests += 1
+            if self._update_rate_limit(status, response_headers):
+                error = f'rate limited ({status})'
+                continue
+            if status == 304 and entry is not None:
+                self.not_modified += 1
+                return entry['body'], entry.get('link')
+            if status == 200:
+                data = json.loads(body)
+                link = response_headers.get('Link')
+                if self.cache is not None and (response_headers.get('ETag') or response_headers.get('Last-Modified')):
+                    self.cache.store(url, {'etag': response_headers.get('ETag'),
+                                           'last_modified': response_headers.get('Last-Modified'),
+                                           'link': link, 'body': data})
+                return data, link
+            error = f'{status} {body[:200].decode("utf-8", "replace")}'
+            if status < 500:
+                break
+            await asyncio.sleep(RETRY_DELAY * 2 ** attempt)
+        raise ApiError(f"GET {url} failed: {error}")
+
+    async def get_pages(self, url, params=None):
+        """
+        Every item of the paginated list at url. The first page tells the
+        number of the last one, then the other pages are requested at once.
+        """
+        params = dict(params or {}, per_page=PER_PAGE)
+        items, link = await self.get(url, dict(params, page=1))
+        last = last_page(link)
+        pages = await asyncio.gather(*(self.get(url, dict(params, page=page)) for page in range(2, last + 1)))
+        for page, _ in pages:
+            items.extend(page)
+        # A first page that did not change comes with the Link header of the
+        # previous run, the list may have grown past the last page it gave
+        page = pages[-1][0] if pages else items
+        while len(page) == PER_PAGE:
+            last += 1
+            page, _ = await self.get(url, dict(params, page=last))
+            items.extend(page)
+        return items
+
+    def close(self):
+        self.pool.close()
+
+
+def last_page(link):
+    """The number of the last page given by a Link header, 1 without one."""
+    match = re.search(r'<([^>]*)>;\s*rel="last"', link or '')
+    if match is None:
+        return 1
+    return int(parse_qs(urlsplit(match.group(1)).query).get('page', ['1'])[0])
+
+
+def _date(value):
+    """An API timestamp in the '+00:00' form of the export."""
+    if isinstance(value, str) and value.endswith('Z'):
+        return value[:-1] + '+00:00'
+    return value
+
+
+def api_time(value):
+    """A time given on the command line as a UTC timestamp of the API, or None. Naive times are UTC."""
+    date = parse_date(value)
+    if date is None:
+        return None
+    date = date.replace(tzinfo=timezone.utc) if date.tzinfo is None else date.astimezone(timezone.utc)
+    return date.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _login(user):
+    return user.get('login') if isinstance(user, dict) else user
+
+
+def export_event(item):
+    """A timeline item in the JSON shape of model.Event."""
+    event = {
+        'event_type': item.get('event'),
+        'author': _login(item.get('actor') or item.get('user')),
+        'event_date': _date(item.get('created_at') or item.get('submitted_at')),
+    }
+    if isinstance(item.get('label'), dict):
+        event['label'] = item['label'].get('name')
+    if item.get('event') == 'commented':
+        event['comment'] = item.get('body')
+    return event
+
+
+def export_issue(issue, timeline):
+    """An issue and its timeline items in the JSON shape of model.Issue."""
+    return {
+        'url': issue.get('html_url') or issue.get('url'),
+        'creator': _login(issue.get('user')),
+        'labels': [label.get('name') if isinstance(label, dict) else label for label in issue.get('labels') or []],
+        'state': issue.get('state'),
+        'assignees': [_login(assignee) for assignee in issue.get('assignees') or []],
+        'title': issue.get('title'),
+        'text': issue.get('body'),
+        'number': issue.get('number'),
+        'created_date': _date(issue.get('created_at')),
+        'updated_date': _date(issue.get('updated_at')),
+        'timeline_url': issue.get('timeline_url'),
+        'events': [export_event(item) for item in timeline],
+    }
+
+
+async def fetch_issues(client, repository, since=None):
+    """The issues of repository, 'owner/name', with their events, in the JSON shape of the export."""
+    params = {'state': 'all', 'sort': 'created', 'direction': 'asc'}
+    if since:
+        params['since'] = since
+    issues = await client.get_pages(f'/repos/{repository}/issues', params)
+    issues = [issue for issue in issues if 'pull_request' not in issue]
+    timelines = await asyncio.gather(*(client.get_pages(issue['timeline_url']) for issue in issues))
+    return [export_issue(issue, timeline) for issue, timeline in zip(issues, timelines)]
+
+
+def write_export(issues, path):
+    """Writes the issues to path as a JSON array, replacing the file only once it is complete."""
+    tmp_path = path + f'.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        f.write('[\n')
+        for i, issue in enumerate(issues):
+            if i:
+                f.write(',\n')
+            f.write(json.dumps(issue))
+        f.write('\n]\n')
+    os.replace(tmp_path, path)
+
+
+async def fetch(repository, output, api_url, token=None, concurrency=DEFAULT_CONCURRENCY, cache_dir=None, since=None):
+    """Fetches the issues of repository into the export file output and returns the client used."""
+    cache = ResponseCache(cache_dir) if cache_dir else None
+    client = ApiClient(api_url, token, concurrency, cache)
+    try:
+        issues = await fetch_issues(client, repository, since)
+    finally:
+        client.close()
+    write_export(issues, output)
+    print(f"Wrote {len(issues)} issues and {sum(len(issue['events']) for issue in issues)} events to {output} "
+          f"({client.requests} requests, {client.not_modified} not modified)")
+    return client
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("fetch_issues.py")
+    ap.add_argument('repository', type=str,
+                    help='Repository to fetch the issues of, as owner/name')
+    ap.add_argument('output', type=str,
+                    help='JSON file the issues are written to')
+    ap.add_argument('--since', type=str, required=False,
+                    help='Only fetch the issues updated since this ISO 8601 time, e.g. for run.py --ingest')
+    ap.add_argument('--concurrency', '-c', type=int, required=False,
+                    help=f'Requests in flight at once (default: {DEFAULT_CONCURRENCY})')
+    ap.add_argument('--api-url', type=str, required=False,
+                    help=f'Base URL of the API (default: {DEFAULT_API_URL})')
+    ap.add_argument('--no-cache', action='store_true',
+                    help='Request everything unconditionally and do not store the responses')
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    api_url = args.api_url or config.get_parameter('api_url', DEFAULT_API_URL)
+    token = config.get_parameter('github_token') or os.environ.get('GITHUB_TOKEN')
+    concurrency = args.concurrency or int(config.get_parameter('fetch_concurrency', DEFAULT_CONCURRENCY))
+    cache_dir = None
+    if not args.no_cache and config.get_parameter('cache') is not False:
+        cache_dir = os.path.join(config.get_parameter('cache_dir', DEFAULT_CACHE_DIR), 'api')
+
+    since = api_time(args.since) if args.since else None
+    if args.since and since is None:
+        print(f"Cannot read the time '{args.since}' of --since, expected e.g. 2024-06-01 or 2024-06-01T12:00:00Z")
+        return
+
+    start = time.perf_counter()
+    try:
+        asyncio.run(fetch(args.repository, args.output, api_url, token, concurrency, cache_dir, since))
+    except ApiError as e:
+        print(f"Fetching the issues of {args.repository} failed, {args.output} was not written: {e}")
+        return
+    print(f"Fetched in {time.perf_counter() - start:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,83 +1,138 @@
-import matplotlib.pyplot as plt
 import pandas as pd
 from data_loader import DataLoader
+import aggregations
 import config
+import profiling
+import rendering
 
 class IssueCloseTimeAnalysis:
     """
     Analyzes GitHub issues by calculating the average time to close each issue type. Ignores non closed issues and those without a close time.
     """
+    # Fields of the dataset the analysis reads, so only they are loaded
+    FIELDS = ['creator', 'state', 'created_at', 'labels', 'closed_at', 'events']
     
     def __init__(self):
         """
         Constructor
         """
-        # Parameter is passed in via command line (--user), unused in this analysis
+        # Parameter is passed in via command line (--user), selects the creator whose close time percentiles are shown
         self.USER: str = config.get_parameter('user')
 
-    def run(self):
+    def run(self, dataset=None, renderer=None):
         """
-        Starting point for this analysis.
+        Starting point for this analysis. A Dataset that was already loaded
+        can be passed in to share it with other analyses, and a renderer to
+        collect the charts of several analyses.
         """
         # Use the DataLoader to load and process issues
-        data_loader = DataLoader()
-        issues_df = data_loader.load_and_process_issues()
+        if dataset is None:
+            dataset = DataLoader(fields=self.FIELDS).load_dataset()
+
+        with profiling.stage('aggregate'):
+            results = self.compute(dataset)
+        if results is not None:
+            with profiling.stage('render'):
+                rendering.render_with(renderer, self.render, results)
+
+    def compute(self, dataset):
+        """
+        Computes and prints the average and percentile close times of each
+        label. Returns the data the charts are drawn from, or None if there is
+        nothing to analyze.
+        """
+        issues_df = dataset.issues
 
         # Check if issues were loaded correctly
         if issues_df.empty:
             print("No issues found to analyze.")
-            return
-
-        # Get only closed issues so we can analyze the close time, ignores missing times for close_at
-        closed_issues_df = issues_df[issues_df['state'] == 'closed']
-        closed_issues_df = closed_issues_df.dropna(subset=['closed_at'])
-
-        # Calculate the close time
-        closed_issues_df['close_time'] = closed_issues_df['closed_at'] - closed_issues_df['created_at']
-
-        # Get unique labels across all issues
-        unique_labels = set(label for sublist in closed_issues_df['labels'] for label in sublist)
-
-        # Create a dictionary to store DataFrames for each label
-        label_dfs = {}
+            return None
 
-        for label in unique_labels:
-            # Filter rows that contain the current label
-            label_dfs[label] = closed_issues_df[closed_issues_df['labels'].apply(lambda x: label in x)].reset_index(drop=True)
-
-        label_close_times = {label: [] for label in unique_labels}
-        # For each issue, add its close time to the corresponding label(s)
-        
-        for index, row in closed_issues_df.iterrows():
-            for label in row['labels']:
-                label_close_times[label].append(row['close_time'])
-
-        # Calculate the average close time for each label
-        average_close_times = {label: pd.to_timedelta(sum(times, pd.Timedelta(0)) / len(times)) for label, times in label_close_times.items()}
+        # Average close time of the closed issues for each label, ignores missing times for close_at.
+        # Labels come back sorted alphabetically.
+        average_close_times = dataset.rollups.label_close_times()
 
         # Display the average close time for each label
         for label, avg_close_time in average_close_times.items():
             print(f"Average Close Time for label '{label}': {avg_close_time}")
 
-        # Sort the labels alphabetically
-        sorted_labels = sorted(average_close_times.keys())
-
-        #convert to days (86400 seconds in 1 day)
-        average_times_in_days = [avg_time.total_seconds() / 86400 for avg_time in average_close_times.values()]
-
-        # Create the plot
-        plt.figure(figsize=(10, 6))
-        plt.bar(sorted_labels, average_times_in_days, color='skyblue')
-
-        # Add labels and title
-        plt.xlabel('Label')
-        plt.ylabel('Average Close Time (days)')
-        plt.title('Average Close Time for Each Label')
-        plt.xticks(rotation=45, ha='right')  # Rotate labels for better visibility
-
-        # Display the plot
-        plt.tight_layout()
-        plt.show()
+        # p50/p90/p99 close times from the log-bucket sketches, within 1% of the exact values
+        close_time_quantiles = dataset.rollups.close_time_quantiles('label')
+        for label, (p50, p90, p99) in close_time_quantiles.iterrows():
+            print(f"Close Time percentiles for label '{label}': p50 {p50}, p90 {p90}, p99 {p99}")
+
+        if self.USER is not None:
+            creator_quantiles = dataset.rollups.close_time_quantiles('creator')
+            if self.USER in creator_quantiles.index:
+                p50, p90, p99 = creator_quantiles.loc[self.USER]
+                print(f"Close Time percentiles for issues created by '{self.USER}': p50 {p50}, p90 {p90}, p99 {p99}")
+            else:
+                print(f"No closed issues created by '{self.USER}'.")
+
+        # Reopened issues from the event timeline: their close time runs to the final
+        # close, while they were only open for the sum of their open intervals
+        timeline = dataset.timeline
+        closed = aggregations.closed_mask(issues_df)
+        reopened = closed & (timeline.reopen_counts > 0)
+        if reopened.any():
+            time_open = timeline.time_open()[reopened].mean().round('s')
+            time_to_close = pd.Timedelta((issues_df['closed_at'] - issues_df['created_at']).to_numpy()[reopened].mean()).round('s')
+            print(f"{reopened.sum()} of {closed.sum()} closed issues were reopened before their final close. "
+                  f"They were open for {time_open} on average, of {time_to_close} from creation to the final close.")
+        # Number of closed issues by the number of times they were reopened
+        reopen_counts = pd.Series(timeline.reopen_counts[closed]).value_counts().sort_index()
+
+        return {'average_close_times': average_close_times, 'close_time_quantiles': close_time_quantiles,
+                'reopen_counts': reopen_counts.rename_axis('reopens').rename('issues')}
+
+    def render(self, results, renderer):
+        """
+        Hands the charts of the analysis, drawn from the results of compute,
+        to the renderer.
+        """
+        renderer.chart('label_average_close_times', plot_average_close_times, results['average_close_times'])
+        # Without closed issues there are no percentiles to draw
+        if not results['close_time_quantiles'].empty:
+            renderer.chart('label_close_time_percentiles', plot_close_time_quantiles, results['close_time_quantiles'])
+
+
+def plot_average_close_times(average_close_times):
+    import matplotlib.pyplot as plt
+    sorted_labels = average_close_times.index.tolist()
+
+    #convert to days (86400 seconds in 1 day)
+    average_times_in_days = (average_close_times.dt.total_seconds() / 86400).tolist()
+
+    # Create the plot
+    plt.figure(figsize=(10, 6))
+    plt.bar(sorted_labels, average_times_in_days, color='skyblue')
+
+    # Add labels and title
+    plt.xlabel('Label')
+    plt.ylabel('Average Close Time (days)')
+    plt.title('Average Close Time for Each Label')
+    plt.xticks(rotation=45, ha='right')  # Rotate labels for better visibility
+    plt.tight_layout()
+
+
+def plot_close_time_quantiles(close_time_quantiles):
+    import matplotlib.pyplot as plt
+    labels = close_time_quantiles.index.tolist()
+    width = 0.8 / len(close_time_quantiles.columns)
+
+    # One bar per percentile next to each other for every label, in days
+    plt.figure(figsize=(10, 6))
+    for i, q in enumerate(close_time_quantiles.columns):
+        days = close_time_quantiles[q].dt.total_seconds() / 86400
+        plt.bar([x + i * width for x in range(len(labels))], days, width=width, label=f'p{q * 100:g}')
+
+    plt.xlabel('Label')
+    plt.ylabel('Close Time (days)')
+    plt.title('Close Time Percentiles for Each Label')
+    plt.xticks([x + width * (len(close_time_quantiles.columns) - 1) / 2 for x in range(len(labels))],
+               labels, rotation=45, ha='right')
+    plt.legend()
+    plt.tight_layout()
 
 if __name__ == '__main__':
     # Invoke run method when running this module directly
@@ -0,0 +1,164 @@
+"""
+Inverted index over the processed issues DataFrame. Posting lists map each
+label, creator and state to the sorted row positions of the issues that
+carry it, so filters are answered by combining posting lists instead of
+scanning and exploding the whole frame on every call.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+class IssueSet:
+    """
+    A set of issues, stored as sorted row positions into the indexed
+    DataFrame. Sets combine with & (AND), | (OR), - (AND NOT) and ~ (NOT).
+    """
+
+    def __init__(self, positions, size):
+        self.positions = positions
+        # Number of issues in the index, needed to complement a set
+        self.size = size
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __and__(self, other):
+        small, large = sorted((self.positions, other.positions), key=len)
+        if not len(small) or not len(large):
+            return IssueSet(small[:0], self.size)
+        # Look up each position of the smaller list in the larger one
+        found = np.searchsorted(large, small).clip(max=len(large) - 1)
+        return IssueSet(small[large[found] == small], self.size)
+
+    def __or__(self, other):
+        return IssueSet(np.union1d(self.positions, other.positions), self.size)
+
+    def __sub__(self, other):
+        return IssueSet(self.positions[~np.isin(self.positions, other.positions, assume_unique=True)], self.size)
+
+    def __invert__(self):
+        mask = np.ones(self.size, dtype=bool)
+        mask[self.positions] = False
+        return IssueSet(np.flatnonzero(mask), self.size)
+
+
+def _posting_lists(keys, positions):
+    """Groups positions by key into a dict of sorted position arrays."""
+    codes, uniques = pd.factorize(keys)
+    valid = codes >= 0
+    codes, positions = codes[valid], positions[valid]
+    # A stable sort keeps the positions of each key in ascending order
+    order = np.argsort(codes, kind='stable')
+    bounds = np.cumsum(np.bincount(codes, minlength=len(uniques)))[:-1]
+    return dict(zip(uniques, np.split(positions[order], bounds)))
+
+
+class IssueIndex:
+    """
+    Posting lists from label, creator and state to issues, built once per
+    dataset. Lookups return IssueSet objects which can be combined freely and
+    turned back into DataFrame rows with rows().
+    """
+
+    def __init__(self, issues_df, labels):
+        self.issues_df = issues_df
+        # The LabelMatrix of issues_df, whose columns are the label posting lists
+        self.labels = labels
+        self.size = len(issues_df)
+        self.empty = np.array([], dtype=np.int64)
+
+        all_positions = np.arange(self.size, dtype=np.int64)
+        self.by_label = labels.postings()
+        if self.size:
+            self.by_creator = _posting_lists(issues_df['creator'].to_numpy(), all_positions)
+            self.by_state = _posting_lists(issues_df['state'].to_numpy(), all_positions)
+        else:
+            self.by_creator, self.by_state = {}, {}
+
+    def _keys(self, positions):
+        """
+        The posting dicts paired with the keys and positions of the issues at
+        positions, with one (label, position) pair per label of an issue.
+        """
+        rows = self.issues_df.iloc[positions]
+        labels = self.labels.take(positions)
+        return [
+            (self.by_label, labels.names(), positions[labels.entry_rows()]),
+            (self.by_creator, rows['creator'].to_numpy(), positions),
+            (self.by_state, rows['state'].to_numpy(), positions),
+        ]
+
+    def remove(self, positions):
+        """
+        Removes the issues at positions from the posting lists. Called before
+        their rows are replaced, while issues_df still holds the old values.
+        """
+        for postings, keys, key_positions in self._keys(positions):
+            for key, removed in _posting_lists(keys, key_positions).items():
+                remaining = np.setdiff1d(postings[key], removed, assume_unique=True)
+                if len(remaining):
+                    postings[key] = remaining
+                else:
+                    del postings[key]
+
+    def insert(self, issues_df, labels, positions):
+        """
+        Adds the issues at positions of issues_df, the updated DataFrame which
+        may have grown by new issues, to the posting lists. labels is the
+        LabelMatrix of issues_df.
+        """
+        self.issues_df = issues_df
+        self.labels = labels
+        self.size = len(issues_df)
+        for postings, keys, key_positions in self._keys(positions):
+            for key, added in _posting_lists(keys, key_positions).items():
+                postings[key] = np.union1d(postings.get(key, self.empty), added)
+
+    def _lookup(self, postings, keys):
+        """Issues matching any of keys, which is a single key or a list of keys."""
+        if isinstance(keys, (list, tuple, set)):
+            result = self.none()
+            for key in keys:
+                result = result | self._lookup(postings, key)
+            return result
+        return IssueSet(postings.get(keys, self.empty), self.size)
+
+    def label(self, labels):
+        """Issues carrying the label, or any of a list of labels."""
+        return self._lookup(self.by_label, labels)
+
+    def creator(self, creators):
+        """Issues created by the creator, or any of a list of creators."""
+        return self._lookup(self.by_creator, creators)
+
+    def state(self, states):
+        """Issues in the state, or any of a list of states."""
+        return self._lookup(self.by_state, states)
+
+    def all(self):
+        return IssueSet(np.arange(self.size, dtype=np.int64), self.size)
+
+    def none(self):
+        return IssueSet(self.empty, self.size)
+
+    def query(self, label=None, creator=None, state=None):
+        """
+        Issues matching every given filter (AND). Each filter is a single
+        value or a list of values of which any may match (OR).
+        """
+        filters = [self._lookup(postings, keys) for postings, keys in
+                   ((self.by_label, label), (self.by_creator, creator), (self.by_state, state))
+                   if keys is not None]
+        if not filters:
+            return self.all()
+        # Intersect the shortest posting lists first
+        filters.sort(key=len)
+        result = filters[0]
+        for other in filters[1:]:
+            result = result & other
+        return result
+
+    def rows(self, issue_set):
+        """The DataFrame rows of the issues in issue_set, in their original order."""
+        return self.issues_df.iloc[issue_set.positions]
@@ -0,0 +1,178 @@
+"""
+Sparse issue x label multi-hot matrix. Row i holds the labels of the i-th
+issue of the DataFrame as integer codes into a vocabulary of label names,
+stored in compressed sparse row (CSR) form: the codes of row i are
+indices[indptr[i]:indptr[i + 1]], in the order the issue lists them.
+
+Compared to a column of Python lists this takes a few bytes per
+(issue, label) pair, and label counts, label filters and per-label
+aggregates become array operations over the codes.
+"""
+
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+
+class LabelMatrix:
+    """
+    The labels of a sequence of issues. Build it with from_lists from the
+    labels column of an issues DataFrame.
+    """
+
+    def __init__(self, indptr, indices, vocabulary):
+        self.indptr = indptr
+        self.indices = indices
+        # Label name of each code
+        self.vocabulary = vocabulary
+
+    @classmethod
+    def from_lists(cls, labels, vocabulary=None):
+        """
+        Builds the matrix of an iterable of label lists. Codes of an existing
+        vocabulary are reused, labels not in it are appended to it.
+        """
+        labels = list(labels)
+        lengths = np.fromiter((len(x) for x in labels), dtype=np.int64, count=len(labels))
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        names = np.array(list(chain.from_iterable(labels)), dtype=object)
+        if vocabulary is None:
+            codes, uniques = pd.factorize(names)
+            vocabulary = pd.Index(uniques)
+        else:
+            codes = vocabulary.get_indexer(names)
+            unknown = codes < 0
+            if unknown.any():
+                new_codes, new_names = pd.factorize(names[unknown])
+                codes[unknown] = new_codes + len(vocabulary)
+                vocabulary = vocabulary.append(pd.Index(new_names))
+        return cls(indptr, codes.astype(np.int32), vocabulary)
+
+    def __len__(self):
+        return len(self.indptr) - 1
+
+    @property
+    def shape(self):
+        return len(self), len(self.vocabulary)
+
+    @property
+    def nbytes(self):
+        """Memory held by the matrix, including the vocabulary strings."""
+        return self.indptr.nbytes + self.indices.nbytes + self.vocabulary.memory_usage(deep=True)
+
+    def lengths(self):
+        """Number of labels of each issue."""
+        return np.diff(self.indptr)
+
+    def entry_rows(self):
+        """The row of each stored (issue, label) pair."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.lengths())
+
+    def names(self):
+        """The label name of each stored (issue, label) pair, as an object array."""
+        return self.vocabulary.to_numpy()[self.indices]
+
+    def issue_labels(self):
+        """
+        The long issue-label table with one row per (issue, label) pair, as
+        aggregations.explode_labels builds it from the labels column.
+        """
+        return pd.DataFrame({
+            'row': self.entry_rows(),
+            'label': pd.Series(self.names(), dtype=object),
+        })
+
+    def to_lists(self):
+        """The labels of each issue as a list of Python lists."""
+        names = self.names().tolist()
+        return [names[start:end] for start, end in zip(self.indptr[:-1].tolist(), self.indptr[1:].tolist())]
+
+    def take(self, positions):
+        """The matrix of the issues at positions, sharing the vocabulary."""
+        positions = np.asarray(positions, dtype=np.int64)
+        starts, lengths = self.indptr[positions], self.lengths()[positions]
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        # Position of each selected entry in indices: its row start plus its offset in the row
+        offsets = np.arange(indptr[-1], dtype=np.int64) - np.repeat(indptr[:-1], lengths)
+        return LabelMatrix(indptr, self.indices[np.repeat(starts, lengths) + offsets], self.vocabulary)
+
+    def update(self, positions, other):
+        """
+        The matrix with the rows at positions replaced by the rows of other,
+        in order. Positions from len(self) on append new rows, which have to
+        follow the existing ones without gaps.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        size = max(len(self), int(positions.max()) + 1) if len(positions) else len(self)
+        other = LabelMatrix.from_lists(other.to_lists(), self.vocabulary)
+
+        lengths = np.zeros(size, dtype=np.int64)
+        lengths[:len(self)] = self.lengths()
+        lengths[positions] = other.lengths()
+        replaced = np.zeros(size, dtype=bool)
+        replaced[positions] = True
+
+        # Kept entries and the entries of other, stably ordered by their new row
+        old_rows = self.entry_rows()
+        keep = ~replaced[old_rows]
+        rows = np.concatenate([old_rows[keep], positions[other.entry_rows()]])
+        codes = np.concatenate([self.indices[keep], other.indices])
+        order = np.argsort(rows, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        return LabelMatrix(indptr, codes[order], other.vocabulary)
+
+    def code_counts(self, mask=None):
+        """
+        Number of issues carrying each label code, counting only the issues
+        where the boolean array mask is set, if given.
+        """
+        codes = self.indices if mask is None else self.indices[mask[self.entry_rows()]]
+        return np.bincount(codes, minlength=len(self.vocabulary))
+
+    def counts(self, mask=None):
+        """Number of issues carrying each label, most frequent first, like value_counts."""
+        counts = self.code_counts(mask)
+        # Codes are numbered in order of first appearance, so a stable sort
+        # breaks ties the way value_counts does
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0]
+        return pd.Series(counts[order], index=self.vocabulary[order], name='count')
+
+    def mask(self, labels):
+        """Boolean array of the issues carrying the label, or any of a list of labels."""
+        if not isinstance(labels, (list, tuple, set)):
+            labels = [labels]
+        codes = self.vocabulary.get_indexer(list(labels))
+        hits = np.isin(self.indices, codes[codes >= 0])
+        mask = np.zeros(len(self), dtype=bool)
+        mask[self.entry_rows()[hits]] = True
+        return mask
+
+    def postings(self):
+        """
+        The sorted positions of the issues carrying each label, i.e. the
+        columns of the matrix, as a dict from label name to position array.
+        """
+        rows = self.entry_rows()
+        # A stable sort by code keeps the rows of each label in ascending order
+        order = np.argsort(self.indices, kind='stable')
+        counts = self.code_counts()
+        columns = np.split(rows[order], np.cumsum(counts)[:-1])
+        return {label: column for label, column, count in zip(self.vocabulary, columns, counts) if count}
+
+    def explode(self, df):
+        """
+        The rows of df, the issues of this matrix, repeated once per label with
+        the label in a 'labels' column, like df.explode('labels'). An issue
+        without labels keeps a single row with a missing label.
+        """
+        lengths = self.lengths()
+        repeats = np.maximum(lengths, 1)
+        starts = np.cumsum(repeats) - repeats
+        labels = np.full(int(repeats.sum()), np.nan, dtype=object)
+        rows = self.entry_rows()
+        labels[starts[rows] + np.arange(len(rows)) - np.repeat(self.indptr[:-1], lengths)] = self.names()
+        exploded = df.iloc[np.repeat(np.arange(len(df)), repeats)].copy()
+        exploded['labels'] = labels
+        return exploded
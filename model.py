@@ -3,12 +3,170 @@ Implements a runtime data model that can be used to access
 the properties contained in the issues JSON.
 """
 
+import sys
 from typing import List, Dict, Set, Tuple
 from enum import Enum
 from datetime import datetime
 from dateutil import parser
 
 
+def intern_str(value):
+    """
+    Interns strings that repeat across issues and events (authors, labels,
+    event types) so every occurrence shares a single string object.
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+def parse_date(date_str):
+    """
+    Parses a single timestamp, returning None if parsing fails. GitHub
+    timestamps are strict ISO-8601 and take the fast datetime.fromisoformat
+    path; anything else falls back to the much slower dateutil parser.
+    """
+    if not date_str:
+        return None
+    if isinstance(date_str, str):
+        try:
+            # Older Pythons' fromisoformat does not accept the 'Z' suffix
+            if date_str[-1] == 'Z':
+                return datetime.fromisoformat(date_str[:-1] + '+00:00')
+            return datetime.fromisoformat(date_str)
+        except ValueError:
+            pass
+    try:
+        return parser.parse(date_str)
+    except (ValueError, TypeError, OverflowError):
+        return None
+
+
+_UTC_SUFFIXES = ('Z', '+00:00')
+_DEFAULT_UNIT = None
+
+
+def _parse_utc_timestamps(values):
+    """
+    Fast path of parse_dates for columns whose timestamps all have GitHub's
+    'YYYY-MM-DDTHH:MM:SS+00:00' (or 'Z') shape: numpy parses them natively
+    once the UTC offset is dropped. Returns None if any value differs.
+    """
+    import numpy as np
+
+    heads = []
+    for value in values:
+        if value is None or value != value:
+            heads.append('NaT')
+        elif isinstance(value, str) and len(value) in (20, 25) and value[19:] in _UTC_SUFFIXES:
+            heads.append(value[:19])
+        else:
+            return None
+    try:
+        return np.array(heads, dtype='datetime64[s]')
+    except ValueError:
+        return None
+
+
+def parse_dates(date_strs):
+    """
+    Parses a whole list or pandas Series of timestamps in one vectorized
+    call and returns a datetime Series (NaT where parsing fails), with the
+    same dtype pd.to_datetime would produce. Values that are not ISO-8601
+    are retried one by one with parse_date.
+    """
+    import pandas as pd
+
+    values = date_strs if isinstance(date_strs, pd.Series) else pd.Series(date_strs, dtype=object)
+    if pd.api.types.is_datetime64_any_dtype(values.dtype):
+        return values
+
+    utc_times = _parse_utc_timestamps(values)
+    if utc_times is not None and len(utc_times) and not pd.isna(utc_times).all():
+        return _utc_series(utc_times, values.index)
+
+    try:
+        parsed = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    except ValueError:
+        # Different UTC offsets, or offsets next to naive timestamps: convert
+        # everything to UTC, taking naive values to be UTC like the fallbacks
+        parsed = pd.to_datetime(values, format='ISO8601', errors='coerce', utc=True)
+
+    odd = parsed.isna() & values.notna()
+    if odd.any():
+        fallback = pd.Series([parse_date(v) for v in values[odd]], index=values.index[odd], dtype=object)
+        tz = getattr(parsed.dtype, 'tz', None)
+        if tz is not None:
+            # Naive fallbacks are taken to be UTC, like GitHub's own timestamps
+            fallback = pd.to_datetime(fallback, utc=True, errors='coerce').dt.tz_convert(tz)
+        else:
+            fallback = pd.to_datetime(fallback.map(lambda d: d.replace(tzinfo=None) if d else d), errors='coerce')
+        parsed = parsed.copy()
+        parsed[odd] = fallback.astype(parsed.dtype)
+    return parsed
+
+
+def _utc_series(utc_times, index):
+    """Series of the UTC datetime64[s] array with the dtype pd.to_datetime would give it."""
+    import pandas as pd
+
+    parsed = pd.Series(utc_times, index=index).dt.tz_localize('UTC')
+    return parsed.astype(f'datetime64[{_default_unit()}, UTC]')
+
+
+def pack_dates(date_strs):
+    """
+    Compact form of a list of timestamps for sending between processes:
+    an int64 array of UTC epoch seconds when every timestamp has GitHub's
+    UTC shape, otherwise the list of strings itself.
+    """
+    utc_times = _parse_utc_timestamps(date_strs)
+    if utc_times is not None:
+        return utc_times.view('int64')
+    return list(date_strs)
+
+
+def unpack_dates(parts, positions=None, index=None):
+    """
+    Parses the concatenation of several pack_dates results, or only the
+    given positions of it, into exactly the Series parse_dates returns for
+    the original strings.
+    """
+    import numpy as np
+    import pandas as pd
+
+    if all(isinstance(part, np.ndarray) for part in parts):
+        seconds = np.concatenate(parts) if parts else np.array([], dtype=np.int64)
+        utc_times = seconds.view('datetime64[s]')
+        if positions is not None:
+            utc_times = utc_times[positions]
+        if len(utc_times) and not np.isnat(utc_times).all():
+            return _utc_series(utc_times, index)
+        return parse_dates(pd.Series([None] * len(utc_times), index=index, dtype=object))
+
+    # Some timestamps need the general parser: turn the epoch parts back into
+    # equivalent ISO-8601 strings and parse everything together
+    values = []
+    for part in parts:
+        if isinstance(part, np.ndarray):
+            utc_times = part.view('datetime64[s]')
+            strings = np.char.add(np.datetime_as_string(utc_times), '+00:00').astype(object)
+            strings[np.isnat(utc_times)] = None
+            values.extend(strings)
+        else:
+            values.extend(part)
+    if positions is not None:
+        values = [values[position] for position in positions]
+    return parse_dates(pd.Series(values, index=index, dtype=object))
+
+
+def _default_unit():
+    """The resolution pd.to_datetime picks for whole-second timestamps."""
+    global _DEFAULT_UNIT
+    if _DEFAULT_UNIT is None:
+        import pandas as pd
+        _DEFAULT_UNIT = pd.to_datetime(['2000-01-01T00:00:00+00:00']).unit
+    return _DEFAULT_UNIT
+
+
 class State(str, Enum):
     """
     Whether issue is open or closed.
@@ -18,6 +176,8 @@ class State(str, Enum):
 
 
 class Event:
+    # Slots instead of a per-instance __dict__, there are many events per issue
+    __slots__ = ('event_type', 'author', 'event_date', 'label', 'comment')
     
     def __init__(self, jobj:any):
         self.event_type:str = None
@@ -30,17 +190,16 @@ class Event:
             self.from_json(jobj)
     
     def from_json(self, jobj:any):
-        self.event_type = jobj.get('event_type')
-        self.author = jobj.get('author')
-        try:
-            self.event_date = parser.parse(jobj.get('event_date'))
-        except:
-            pass
-        self.label = jobj.get('label')
+        self.event_type = intern_str(jobj.get('event_type'))
+        self.author = intern_str(jobj.get('author'))
+        self.event_date = parse_date(jobj.get('event_date'))
+        self.label = intern_str(jobj.get('label'))
         self.comment = jobj.get('comment')
         
         
 class Issue:
+    __slots__ = ('url', 'creator', 'labels', 'state', 'assignees', 'title', 'text', 'number',
+                 'created_date', 'updated_date', 'timeline_url', 'events')
     
     def __init__(self, jobj:any=None):
         self.url:str = None
@@ -50,7 +209,7 @@ class Issue:
         self.assignees:List[str] = []
         self.title:str = None
         self.text:str = None
-        self.number: int = id if id is not None else -1  # Assign id to number
+        self.number: int = -1
         self.created_date:datetime = None
         self.updated_date:datetime = None
         self.timeline_url:str = None
@@ -61,8 +220,8 @@ class Issue:
     
     def from_json(self, jobj: any):
         self.url = jobj.get('url')
-        self.creator = jobj.get('creator')
-        self.labels = jobj.get('labels', [])
+        self.creator = intern_str(jobj.get('creator'))
+        self.labels = [intern_str(label) for label in jobj.get('labels') or []]
         
         # Handle state assignment
         state_value = jobj.get('state')
@@ -71,7 +230,7 @@ class Issue:
         else:
             self.state = None  # or a default state, if applicable
         
-        self.assignees = jobj.get('assignees', [])
+        self.assignees = [intern_str(assignee) for assignee in jobj.get('assignees') or []]
         self.title = jobj.get('title')
         self.text = jobj.get('text')
 
@@ -90,9 +249,4 @@ class Issue:
 
     def _parse_date(self, date_str):
         """Helper method to parse dates, returning None if parsing fails."""
-        if date_str:
-            try:
-                return parser.parse(date_str)
-            except (ValueError, TypeError):
-                return None
-        return None
\ No newline at end of file
+        return parse_date(date_str)
@@ -1,17 +1,18 @@
-from typing import List
-import matplotlib.pyplot as plt
-import pandas as pd
-from datetime import datetime
-from dateutil import parser
-
 from data_loader import DataLoader  # Ensure the import is correct
-from model import Issue, Event  # Ensure you have defined these classes appropriately
 import config
+import profiling
+import rendering
+import timeseries
+
+# Number of periods the rolling rates of the time series are averaged over
+DEFAULT_WINDOW = 3
 
 class MonthIssueAnalysis:
     """
     Implements an example analysis of GitHub issues and outputs the result of that analysis.
     """
+    # Fields of the dataset the analysis reads, so only they are loaded
+    FIELDS = ['state', 'created_at', 'closed_at', 'events']
     
     def __init__(self):
         """
@@ -19,59 +20,105 @@ class MonthIssueAnalysis:
         """
         # Parameter is passed in via command line (--user)
         self.USER: str = config.get_parameter('user')
+        # Period of the time series and number of periods of its rolling rates (--frequency, --window)
+        self.FREQUENCY: str = config.get_parameter('frequency', 'month')
+        self.WINDOW: int = int(config.get_parameter('window', DEFAULT_WINDOW))
+        if self.WINDOW < 1:
+            raise ValueError(f"The rolling window must be at least 1 {self.FREQUENCY}, got {self.WINDOW}")
 
-    def run(self):
+    def run(self, dataset=None, renderer=None):
         """
-        Starting point for this analysis.
+        Starting point for this analysis. A Dataset that was already loaded
+        can be passed in to share it with other analyses, and a renderer to
+        collect the charts of several analyses.
         """
         # Use the DataLoader to load and process issues
-        data_loader = DataLoader()
-        issues_df = data_loader.load_and_process_issues()
+        if dataset is None:
+            dataset = DataLoader(fields=self.FIELDS).load_dataset()
+
+        with profiling.stage('aggregate'):
+            results = self.compute(dataset)
+        if results is not None:
+            with profiling.stage('render'):
+                rendering.render_with(renderer, self.render, results)
+
+    def compute(self, dataset):
+        """
+        Counts the events and the issues opened and closed per month. Returns
+        the data the chart is drawn from, or None if there is nothing to analyze.
+        """
+        issues_df = dataset.issues
 
         # Check if issues were loaded correctly
         if issues_df.empty:
             print("No issues found to analyze.")
-            return
+            return None
         
-        # Convert DataFrame to list of Issue objects
-        issues: List[Issue] = [Issue(row.to_dict()) for index, row in issues_df.iterrows()]
-
         ### BASIC STATISTICS
         # Calculate the total number of events for a specific user (if specified in command line args)
-        total_events: int = 0
-        for issue in issues:
-            total_events += len([e for e in issue.events if self.USER is None or e.author == self.USER])
+        total_events: int = dataset.rollups.event_count(self.USER)
         
-        output: str = f'Found {total_events} events across {len(issues)} issues'
+        output: str = f'Found {total_events} events across {len(issues_df)} issues'
         if self.USER is not None:
             output += f' for {self.USER}.'
         else:
             output += '.'
         print('\n\n' + output + '\n\n')
-        ###BAR CHART
-        #Display a graph of every months open and closed issues
-        opened_issue_month = []
-        for index, issue in issues_df.iterrows():
-            if issue['created_at'].month:
-                if not pd.isna(issue['created_at'].month):
-                    created_at = issue['created_at'].month
-                    opened_issue_month.append(created_at)
-        closed_issue_month = []
-        for index, issue in issues_df.iterrows():
-            if issue['closed_at'].month and issue.get('state') == 'closed': #and statement to ensure no nan's are appeneded
-                if not pd.isna(issue['closed_at'].month):  
-                    closed_at = issue['closed_at'].month
-                    closed_issue_month.append(closed_at)
-        
-        if opened_issue_month and closed_issue_month:
-            # Plotting the distribution of resolution times
-            plt.hist([opened_issue_month, closed_issue_month],bins=range(1,14), align='left', edgecolor='black', label= ['Opened Issues','Closed Issues'])
-            plt.title("Distribution of Open/Closed Issues Per Month")
-            plt.legend(loc='upper right')
-            plt.xlabel("Months")
-            plt.ylabel("Number of Issues")
-            plt.xticks(range(1,13))
-            plt.show()
+
+        # Opened and closed issues and the open backlog per period of every year
+        series = timeseries.opened_closed(issues_df, self.FREQUENCY)
+        rates = timeseries.rolling_rates(series, self.WINDOW)
+        if not series.empty:
+            peak = series['backlog'].idxmax()
+            print(f"Open backlog: {series['backlog'].iloc[-1]} issues at the end, "
+                  f"peak of {series['backlog'].max()} in the {self.FREQUENCY} of {peak.date()}")
+            print(f"Last {self.WINDOW} {self.FREQUENCY}s: {rates['opened'].iloc[-1]:.1f} opened and "
+                  f"{rates['closed'].iloc[-1]:.1f} closed per {self.FREQUENCY}")
+
+        return {'monthly_counts': dataset.rollups.monthly_opened_closed(), 'series': series, 'rates': rates}
+
+    def render(self, results, renderer):
+        """
+        Hands the chart of the analysis, drawn from the results of compute,
+        to the renderer.
+        """
+        monthly_counts = results['monthly_counts']
+        if monthly_counts['opened'].sum() and monthly_counts['closed'].sum():
+            renderer.chart('monthly_opened_closed', plot_monthly_counts, monthly_counts)
+        if not results['series'].empty:
+            renderer.chart('backlog_over_time', plot_backlog, results['series'], results['rates'])
+
+
+def plot_monthly_counts(monthly_counts):
+    import matplotlib.pyplot as plt
+    ###BAR CHART
+    #Display a graph of every months open and closed issues
+    # Plotting the distribution of resolution times, the per month counts are used as weights
+    plt.figure()
+    months = monthly_counts.index.to_numpy()
+    plt.hist([months, months], weights=[monthly_counts['opened'], monthly_counts['closed']], bins=range(1,14), align='left', edgecolor='black', label= ['Opened Issues','Closed Issues'])
+    plt.title("Distribution of Open/Closed Issues Per Month")
+    plt.legend(loc='upper right')
+    plt.xlabel("Months")
+    plt.ylabel("Number of Issues")
+    plt.xticks(range(1,13))
+
+def plot_backlog(series, rates):
+    import matplotlib.pyplot as plt
+    # Rolling opened and closed rates per period, with the open backlog on a second axis
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.plot(rates.index, rates['opened'], label='Opened (rolling mean)', color='#4c72b0')
+    ax.plot(rates.index, rates['closed'], label='Closed (rolling mean)', color='#55a868')
+    ax.set_xlabel(series.index.name.capitalize())
+    ax.set_ylabel(f"Issues per {series.index.name}")
+    backlog_ax = ax.twinx()
+    backlog_ax.step(series.index, series['backlog'], where='post', label='Open backlog', color='#c44e52')
+    backlog_ax.set_ylabel("Open issues")
+    lines = ax.get_legend_handles_labels()
+    backlog_lines = backlog_ax.get_legend_handles_labels()
+    ax.legend(lines[0] + backlog_lines[0], lines[1] + backlog_lines[1], loc='upper left')
+    plt.title("Opened and Closed Issues and Open Backlog Over Time")
+    plt.tight_layout()
 
 if __name__ == '__main__':
     # Invoke run method when running this module directly
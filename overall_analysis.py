@@ -1,13 +1,7 @@
-from typing import List
-import matplotlib.pyplot as plt
-import pandas as pd
-from datetime import datetime
-from dateutil import parser
 from data_loader import DataLoader  # Ensure the import is correct
-from matplotlib.dates import DateFormatter
-from model import Issue, Event  # Ensure you have defined these classes appropriately
+import profiling
+import rendering
 import config
-import warnings
 
 COLOR_PALETTE = {
     "bar": "#4c72b0",
@@ -18,10 +12,15 @@ COLOR_PALETTE = {
     "state_transition": "#2ca02c"
 }
 
+# Number of creators shown in the top issue creators chart
+TOP_N_CREATORS = 30
+
 class OverallAnalysis:
     """
     Performs an analysis of GitHub issues and outputs the results.
     """
+    # Fields of the dataset the analysis reads, so only they are loaded
+    FIELDS = ['creator', 'state', 'created_at', 'labels', 'closed_at', 'events']
     
     def __init__(self):
         """
@@ -29,98 +28,137 @@ class OverallAnalysis:
         """
         self.USER: str = config.get_parameter('user')
 
-    def run(self):
+    def run(self, dataset=None, renderer=None):
         """
-        Main method to start the analysis.
+        Main method to start the analysis. A Dataset that was already loaded
+        can be passed in to share it with other analyses, and a renderer to
+        collect the charts of several analyses.
         """
         # Load and process issues using DataLoader
-        data_loader = DataLoader()
-        issues_df = data_loader.load_and_process_issues()
+        if dataset is None:
+            dataset = DataLoader(fields=self.FIELDS).load_dataset()
+
+        with profiling.stage('aggregate'):
+            results = self.compute(dataset)
+        if results is not None:
+            with profiling.stage('render'):
+                rendering.render_with(renderer, self.render, results)
+
+    def compute(self, dataset):
+        """
+        Computes the statistics of the analysis and prints the textual ones.
+        Returns the data the charts are drawn from, or None if there is nothing
+        to analyze.
+        """
+        issues_df = dataset.issues
 
         # Check if any issues were loaded
         if issues_df.empty:
             print("No issues found to analyze.")
-            return
+            return None
         
-        # Convert DataFrame to list of Issue objects
-        issues: List[Issue] = [Issue(row.to_dict()) for _, row in issues_df.iterrows()]
+        # Every statistic is read from the materialized rollups of the dataset
+        rollups = dataset.rollups
 
         ### BASIC STATISTICS
         # Calculate the total number of events
-        total_events = sum(len(issue.events) for issue in issues)
-        
-        print(f'\n\nFound {total_events} events across {len(issues)} issues.\n\n')
+        total_events = rollups.event_count()
         
-        ### BAR CHART: Top 50 Issue Creators
-        top_n = 30
-        plt.figure(figsize=(10, 8))
-        issues_df['creator'].value_counts().nlargest(top_n).plot(kind="bar", color=COLOR_PALETTE["bar"])
-        plt.title(f"Top {top_n} Issue Creators")
-        plt.xlabel("Creator Names")
-        plt.ylabel("Number of Issues Created")
-        plt.xticks(rotation=25, ha="right")  # Rotate x-axis labels for readability
-        plt.tight_layout()
-        plt.show()
-
-        ### PIE CHART: Issue State Distribution
-        plt.figure(figsize=(8, 8))
-        state_counts = issues_df['state'].value_counts()
-        state_counts.plot(kind="pie", autopct='%1.1f%%', startangle=140, colors=COLOR_PALETTE["pie"], title="Issue State Distribution")
-        plt.ylabel("")  # Hide y-axis label for a cleaner look
-        plt.show()
-
-        ### BAR CHART: Top 10 Labels Used
-        labels = pd.Series([label for labels in issues_df['labels'] for label in labels])
-        label_counts = labels.value_counts().nlargest(10)
-        plt.figure(figsize=(10, 6))
-        label_counts.plot(kind="bar", color=COLOR_PALETTE["label_bar"])
-        plt.title("Top 10 Labels Used in Issues")
-        plt.xlabel("Label")
-        plt.ylabel("Frequency")
-        plt.xticks(rotation=45, ha="right")
-        plt.tight_layout()
-        plt.show()
-
-        ### HISTOGRAM: Time to Resolution for Closed Issues
-        times_to_resolve = []
-        for index, issue in issues_df.iterrows():
-            if issue['state'] == 'closed' and issue['created_at'] and issue['closed_at']:
-                if not pd.isna(issue['closed_at'].month):
-                    created_at = issue['created_at']
-                    closed_at = issue['closed_at']
-                    times_to_resolve.append((closed_at - created_at).days)
+        print(f'\n\nFound {total_events} events across {len(issues_df)} issues.\n\n')
+
+        results = {
+            'top_creators': rollups.top_creators(TOP_N_CREATORS),
+            'state_counts': rollups.state_counts(),
+            'label_counts': rollups.label_counts().nlargest(10),
+        }
+
+        ### Time to Resolution for Closed Issues
+        # Sketch of the whole days to resolution, with the exact count and sum
+        resolution = rollups.resolution_days()
+        results['resolution_days'] = resolution.histogram()
         
-        if times_to_resolve:
-            avg_time_to_resolve = sum(times_to_resolve) / len(times_to_resolve)
+        if resolution.count:
+            avg_time_to_resolve = resolution.mean()
+            results['avg_time_to_resolve'] = avg_time_to_resolve
             print(f"\nAverage Time to Resolve Issues: {avg_time_to_resolve:.2f} days\n")
-
-            # Plot distribution of resolution times
-            plt.figure(figsize=(10, 6))
-            plt.hist(times_to_resolve, bins=20, color=COLOR_PALETTE["hist"], edgecolor='black')
-            plt.title("Distribution of Time to Resolve Issues")
-            plt.xlabel("Days to Resolution")
-            plt.ylabel("Frequency")
-            plt.axvline(avg_time_to_resolve, color='red', linestyle='--', linewidth=1, label=f'Average: {avg_time_to_resolve:.2f} days')
-            plt.legend()
-            plt.tight_layout()
-            plt.show()
+            p50, p90, p99 = resolution.quantiles()
+            print(f"Time to Resolve Issues: p50 {p50:.1f}, p90 {p90:.1f}, p99 {p99:.1f} days\n")
         else:
             print("No closed issues with valid dates found for time-to-resolution analysis.")
         
-        
-        warnings.filterwarnings("ignore", message=".*Converting to PeriodArray/Index representation will drop timezone information.*")
-        issues_df['created_date'] = pd.to_datetime(issues_df['created_at'])
-        issues_df['month'] = issues_df['created_date'].dt.to_period('M')
-        monthly_issue_count = issues_df['month'].value_counts().sort_index()
-
-        plt.figure(figsize=(10, 6))
-        monthly_issue_count.plot(kind="line", color=COLOR_PALETTE["time_series"], marker='o')
-        plt.title("Number of Issues Created Per year")
-        plt.xlabel("Year")
-        plt.ylabel("Number of Issues Created")
-        plt.xticks(rotation=45)
-        plt.tight_layout()
-        plt.show()
+        results['monthly_issue_count'] = rollups.monthly_issue_count()
+        return results
+
+    def render(self, results, renderer):
+        """
+        Hands the charts of the analysis, drawn from the results of compute,
+        to the renderer.
+        """
+        renderer.chart('overall_top_creators', plot_top_creators, results['top_creators'])
+        renderer.chart('overall_state_distribution', plot_state_distribution, results['state_counts'])
+        renderer.chart('overall_top_labels', plot_top_labels, results['label_counts'])
+        if 'avg_time_to_resolve' in results:
+            renderer.chart('overall_time_to_resolve', plot_time_to_resolve,
+                           results['resolution_days'], results['avg_time_to_resolve'])
+        renderer.chart('overall_issues_per_month', plot_issues_per_month, results['monthly_issue_count'])
+
+
+def plot_top_creators(top_creators):
+    import matplotlib.pyplot as plt
+    ### BAR CHART: Top 50 Issue Creators
+    top_n = TOP_N_CREATORS
+    plt.figure(figsize=(10, 8))
+    top_creators.plot(kind="bar", color=COLOR_PALETTE["bar"])
+    plt.title(f"Top {top_n} Issue Creators")
+    plt.xlabel("Creator Names")
+    plt.ylabel("Number of Issues Created")
+    plt.xticks(rotation=25, ha="right")  # Rotate x-axis labels for readability
+    plt.tight_layout()
+
+
+def plot_state_distribution(state_counts):
+    import matplotlib.pyplot as plt
+    ### PIE CHART: Issue State Distribution
+    plt.figure(figsize=(8, 8))
+    state_counts.plot(kind="pie", autopct='%1.1f%%', startangle=140, colors=COLOR_PALETTE["pie"], title="Issue State Distribution")
+    plt.ylabel("")  # Hide y-axis label for a cleaner look
+
+
+def plot_top_labels(label_counts):
+    import matplotlib.pyplot as plt
+    ### BAR CHART: Top 10 Labels Used
+    plt.figure(figsize=(10, 6))
+    label_counts.plot(kind="bar", color=COLOR_PALETTE["label_bar"])
+    plt.title("Top 10 Labels Used in Issues")
+    plt.xlabel("Label")
+    plt.ylabel("Frequency")
+    plt.xticks(rotation=45, ha="right")
+    plt.tight_layout()
+
+
+def plot_time_to_resolve(resolution_days, avg_time_to_resolve):
+    import matplotlib.pyplot as plt
+    ### HISTOGRAM: Time to Resolution for Closed Issues
+    # Plot distribution of resolution times, the number of issues in each bucket of the sketch is used as weights
+    plt.figure(figsize=(10, 6))
+    plt.hist(resolution_days.index.to_numpy(), weights=resolution_days.to_numpy(), bins=20, color=COLOR_PALETTE["hist"], edgecolor='black')
+    plt.title("Distribution of Time to Resolve Issues")
+    plt.xlabel("Days to Resolution")
+    plt.ylabel("Frequency")
+    plt.axvline(avg_time_to_resolve, color='red', linestyle='--', linewidth=1, label=f'Average: {avg_time_to_resolve:.2f} days')
+    plt.legend()
+    plt.tight_layout()
+
+
+def plot_issues_per_month(monthly_issue_count):
+    import matplotlib.pyplot as plt
+    plt.figure(figsize=(10, 6))
+    monthly_issue_count.plot(kind="line", color=COLOR_PALETTE["time_series"], marker='o')
+    plt.title("Number of Issues Created Per year")
+    plt.xlabel("Year")
+    plt.ylabel("Number of Issues Created")
+    plt.xticks(rotation=45)
+    plt.tight_layout()
 
 if __name__ == '__main__':
     OverallAnalysis().run()
\ No newline at end of file
@@ -0,0 +1,118 @@
+"""
+Instrumentation of the pipeline stages. Code wraps its stages in
+profiling.stage(name), which records the wall time, CPU time and peak
+traced allocations of the stage when a Profiler is active (run.py --profile)
+and costs nothing otherwise.
+
+Stages may nest, e.g. building the rollups inside the aggregate stage of
+the first feature that needs them; the outer stage includes the inner one.
+"""
+
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+
+_active = None
+
+
+class _Frame:
+    def __init__(self, name, feature, depth):
+        self.name = name
+        self.feature = feature
+        self.depth = depth
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.start_bytes, self.peak_bytes = tracemalloc.get_traced_memory()
+
+
+class Profiler:
+    """
+    Records the stages run while it is active. Peak allocations are
+    measured with tracemalloc, which slows down Python code, so the timings
+    are best compared between profiled runs.
+    """
+
+    def __init__(self):
+        self.stages = []
+        self.stack = []
+        self.feature = None
+        self.started_at = datetime.now(timezone.utc).isoformat()
+
+    def start(self):
+        global _active
+        tracemalloc.start()
+        _active = self
+        return self
+
+    def stop(self):
+        global _active
+        _active = None
+        tracemalloc.stop()
+
+    def _update_peaks(self):
+        # tracemalloc has a single peak, reset whenever a stage starts or
+        # ends, so the peak so far is handed to every enclosing stage
+        _, peak = tracemalloc.get_traced_memory()
+        for frame in self.stack:
+            frame.peak_bytes = max(frame.peak_bytes, peak)
+        tracemalloc.reset_peak()
+
+    @contextmanager
+    def stage(self, name):
+        self._update_peaks()
+        frame = _Frame(name, self.feature, len(self.stack))
+        self.stack.append(frame)
+        # The slot is taken when the stage starts so stages are listed in order
+        slot = len(self.stages)
+        self.stages.append(None)
+        try:
+            yield
+        finally:
+            self._update_peaks()
+            self.stack.pop()
+            self.stages[slot] = {
+                'stage': name,
+                'feature': frame.feature,
+                'depth': frame.depth,
+                'wall_s': time.perf_counter() - frame.wall,
+                'cpu_s': time.process_time() - frame.cpu,
+                'peak_bytes': frame.peak_bytes - frame.start_bytes,
+            }
+
+    @contextmanager
+    def for_feature(self, feature):
+        """Attributes the stages run inside it to feature."""
+        self.feature = feature
+        try:
+            yield
+        finally:
+            self.feature = None
+
+    def print_table(self):
+        print(f"\n{'stage':<24}{'feature':>8}{'wall s':>10}{'cpu s':>10}{'peak MiB':>10}")
+        for s in self.stages:
+            name = '  ' * s['depth'] + s['stage']
+            feature = '' if s['feature'] is None else s['feature']
+            print(f"{name:<24}{feature:>8}{s['wall_s']:>10.3f}{s['cpu_s']:>10.3f}{s['peak_bytes'] / 2**20:>10.1f}")
+
+    def write_json_lines(self, path):
+        """Appends one JSON object per stage to path, for metrics ingestion."""
+        with open(path, 'a') as f:
+            for s in self.stages:
+                f.write(json.dumps({'run': self.started_at, **s}) + '\n')
+
+
+def stage(name):
+    """Context manager recording the stage name with the active Profiler, if any."""
+    if _active is None:
+        return nullcontext()
+    return _active.stage(name)
+
+
+def for_feature(feature):
+    """Context manager attributing the stages inside it to feature, if profiling."""
+    if _active is None:
+        return nullcontext()
+    return _active.for_feature(feature)
@@ -0,0 +1,145 @@
+"""
+Renderers that the analyses hand their charts to. Every chart is a
+module-level plot function plus the data it is drawn from, so it can be
+drawn in the current process and shown interactively, or sent to a pool
+of worker processes that write it to image files.
+"""
+
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+import config
+
+MANIFEST_NAME = 'manifest.json'
+
+
+class InteractiveRenderer:
+    """
+    Draws every chart as soon as it is submitted and shows it in a window,
+    blocking until the window is closed.
+    """
+
+    def chart(self, name, plot_fn, *args):
+        import matplotlib.pyplot as plt
+        plot_fn(*args)
+        plt.show()
+
+    def close(self):
+        return None
+
+
+def _use_headless_backend():
+    import matplotlib
+    matplotlib.use('Agg')
+
+
+def _render_chart(output_dir, formats, name, plot_fn, args):
+    """
+    Draws one chart and saves it in every format. Runs in the worker
+    processes of FileRenderer, or in-process when there is one worker.
+    """
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    plot_fn(*args)
+    figure = plt.gcf()
+    files = []
+    for fmt in formats:
+        path = os.path.join(output_dir, f'{name}.{fmt}')
+        figure.savefig(path, format=fmt)
+        files.append(path)
+    plt.close(figure)
+    return {'name': name, 'files': files, 'seconds': time.perf_counter() - start}
+
+
+class FileRenderer:
+    """
+    Collects the charts of one or more analyses and, on close, renders them
+    concurrently across worker processes into image files in output_dir,
+    then writes a manifest of the generated files.
+    """
+
+    def __init__(self, output_dir, formats=('png',), workers=None):
+        _use_headless_backend()
+        self.output_dir = output_dir
+        self.formats = list(formats)
+        self.workers = workers or os.cpu_count()
+        self.jobs = []
+
+    def chart(self, name, plot_fn, *args):
+        self.jobs.append((name, plot_fn, args))
+
+    def close(self):
+        """Renders the collected charts and returns the manifest."""
+        os.makedirs(self.output_dir, exist_ok=True)
+        jobs, self.jobs = self.jobs, []
+        start = time.perf_counter()
+
+        workers = min(self.workers, len(jobs))
+        if workers > 1:
+            with ProcessPoolExecutor(workers, initializer=_use_headless_backend) as executor:
+                futures = [executor.submit(_render_chart, self.output_dir, self.formats, *job) for job in jobs]
+                figures = [future.result() for future in futures]
+        else:
+            figures = [_render_chart(self.output_dir, self.formats, *job) for job in jobs]
+
+        manifest = {
+            'generated_at': datetime.now(timezone.utc).isoformat(),
+            'formats': self.formats,
+            'seconds': time.perf_counter() - start,
+            'figures': figures,
+        }
+        with open(os.path.join(self.output_dir, MANIFEST_NAME), 'w') as f:
+            json.dump(manifest, f, indent=2)
+        print(f"Wrote {len(figures)} charts to {self.output_dir}")
+        return manifest
+
+
+class ScopedRenderer:
+    """
+    Hands the charts to another renderer with their names prefixed by a
+    scope, e.g. a repository, so the charts of several runs of the same
+    analysis do not overwrite each other. Closing it leaves the other
+    renderer open.
+    """
+
+    def __init__(self, renderer, scope):
+        self.renderer = renderer
+        self.scope = scope
+
+    def chart(self, name, plot_fn, *args):
+        self.renderer.chart(f'{self.scope}_{name}', plot_fn, *args)
+
+    def close(self):
+        return None
+
+
+def make_renderer():
+    """
+    The renderer selected by the config: FileRenderer when an output_dir
+    is set (e.g. with --output-dir), otherwise InteractiveRenderer.
+    """
+    output_dir = config.get_parameter('output_dir')
+    if output_dir is None:
+        return InteractiveRenderer()
+    formats = config.get_parameter('figure_format', ['png'])
+    if isinstance(formats, str):
+        formats = [formats]
+    return FileRenderer(str(output_dir), formats, config.get_parameter('render_workers'))
+
+
+def render_with(renderer, render_fn, results):
+    """
+    Calls render_fn(results, renderer). Without a renderer one is made from
+    the config and closed afterwards, so the charts are also produced when
+    an analysis runs on its own.
+    """
+    if renderer is not None:
+        render_fn(results, renderer)
+        return
+    renderer = make_renderer()
+    render_fn(results, renderer)
+    renderer.close()
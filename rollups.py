@@ -0,0 +1,175 @@
+"""
+Materialized summary tables of a dataset: issue counts keyed by creator,
+state, label and month, close-time sketches per label and per creator, the
+sketch of the resolution days and event counts per author. They are
+computed once per dataset version and cached next to it, so the analyses
+read a few thousand groups instead of scanning every issue.
+
+All tables hold counts or exact sums (the sketches are log-bucket
+histograms, see sketches.py), so the rollups of two sets of
+issues can be added and subtracted, which is how an ingested update is
+folded in without recomputing the whole dataset.
+"""
+
+import numpy as np
+import pandas as pd
+
+import aggregations
+from label_matrix import LabelMatrix
+from sketches import DEFAULT_QUANTILES, SketchTable
+
+
+def _count_by(keys, dropna=True):
+    """Number of occurrences of each key, in value_counts order."""
+    return pd.Series(keys).value_counts(dropna=dropna)
+
+
+def _months(dates):
+    """The calendar month (Period[M]) of each timestamp, in UTC."""
+    dates = pd.Series(dates).dropna()
+    if dates.dt.tz is not None:
+        dates = dates.dt.tz_localize(None)
+    return dates.dt.to_period('M')
+
+
+def _combine(table, other, sign):
+    """Adds (sign 1) or subtracts (sign -1) other from table, dropping empty groups."""
+    # Aligned with reindex rather than add(fill_value=0), which would go
+    # through float64 and lose the exactness of large sums
+    index = table.index.union(other.index)
+    combined = table.reindex(index, fill_value=0) + sign * other.reindex(index, fill_value=0)
+    counts = combined['count'] if isinstance(combined, pd.DataFrame) else combined
+    return combined[(counts != 0).to_numpy()]
+
+
+class Rollups:
+    """
+    The summary tables of a set of issues and their events. Build them with
+    Rollups.build, read them through the methods below.
+    """
+
+    # Issue counts by creator, state, label, month of creation and month of
+    # closing, sketches of the close time (ns) by label and by creator and of
+    # the whole days to resolution, and event counts by author
+    TABLES = ['creator', 'state', 'label', 'created_month', 'closed_month',
+              'label_close_time', 'creator_close_time', 'resolution_days', 'event_author']
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    @classmethod
+    def build(cls, issues_df, events, labels=None):
+        """
+        Computes the tables of issues_df and its events table. labels is the
+        LabelMatrix of issues_df, built from its labels column if not given.
+        Issues loaded with only some of the columns get the tables that can
+        be computed from those, and no event_author table if events is None.
+        """
+        columns = set(issues_df.columns)
+        if labels is None and 'labels' in columns:
+            labels = LabelMatrix.from_lists(issues_df['labels'])
+        tables = {}
+        if 'creator' in columns:
+            tables['creator'] = _count_by(issues_df['creator'].to_numpy())
+        if 'state' in columns:
+            tables['state'] = _count_by(issues_df['state'].to_numpy())
+        if labels is not None:
+            tables['label'] = labels.counts().rename_axis(None)
+        if 'created_at' in columns:
+            tables['created_month'] = _count_by(_months(issues_df['created_at'])).sort_index()
+        if {'state', 'closed_at'} <= columns:
+            closed_at = issues_df.loc[aggregations.closed_mask(issues_df), 'closed_at']
+            tables['closed_month'] = _count_by(_months(closed_at)).sort_index()
+        if {'state', 'created_at', 'closed_at'} <= columns:
+            closed = aggregations.closed_mask(issues_df) & issues_df['created_at'].notna().to_numpy()
+            deltas = (issues_df['closed_at'] - issues_df['created_at'])[closed]
+            close_days = deltas.dt.days.to_numpy()
+            # Close time in ns of each closed issue, by position in issues_df
+            close_time = np.zeros(len(issues_df), dtype=np.int64)
+            close_time[closed] = aggregations.timedelta_ns(deltas)
+
+            if labels is not None:
+                rows = labels.entry_rows()
+                closed_pairs = closed[rows]
+                tables['label_close_time'] = SketchTable.build(labels.names()[closed_pairs], close_time[rows[closed_pairs]])
+            if 'creator' in columns:
+                tables['creator_close_time'] = SketchTable.build(issues_df['creator'].to_numpy()[closed], close_time[closed])
+            tables['resolution_days'] = SketchTable.build(np.full(len(close_days), 'all', dtype=object), close_days)
+        if events is not None:
+            # Events without an author are counted too, so the table sums to all events
+            tables['event_author'] = _count_by(events['author'].to_numpy(), dropna=False)
+        return cls(tables)
+
+    def combine(self, other, sign=1):
+        """
+        The rollups of the issues of self plus (or, with sign -1, minus) those
+        of other, for the tables both of them have.
+        """
+        tables = {}
+        for name in self.TABLES:
+            if name not in self.tables or name not in other.tables:
+                continue
+            table, other_table = self.tables[name], other.tables[name]
+            if isinstance(table, SketchTable):
+                tables[name] = table.combine(other_table, sign)
+                continue
+            table = _combine(table, other_table, sign)
+            # Tables in value_counts order are kept that way, the months by key
+            sorted_by_key = name in ('created_month', 'closed_month')
+            tables[name] = table.sort_index() if sorted_by_key else table.sort_values(ascending=False, kind='stable')
+        return Rollups(tables)
+
+    def top_creators(self, n):
+        """The n creators with the most issues and their issue counts."""
+        return self.tables['creator'].nlargest(n)
+
+    def state_counts(self):
+        return self.tables['state']
+
+    def label_counts(self):
+        """Number of issues carrying each label, most frequent first."""
+        return self.tables['label']
+
+    def monthly_issue_count(self):
+        """Number of issues created in each month of each year."""
+        return self.tables['created_month']
+
+    def monthly_opened_closed(self):
+        """
+        Number of issues opened and closed in each calendar month (1-12),
+        summed over all years.
+        """
+        months = pd.RangeIndex(1, 13, name='month')
+        opened, closed = self.tables['created_month'], self.tables['closed_month']
+        return pd.DataFrame({
+            'opened': opened.groupby(opened.index.month).sum().reindex(months, fill_value=0),
+            'closed': closed.groupby(closed.index.month).sum().reindex(months, fill_value=0),
+        })
+
+    def resolution_days(self):
+        """The LogHistogram sketch of the whole days to resolution of the closed issues."""
+        return self.tables['resolution_days'].sketch('all')
+
+    def label_close_times(self):
+        """
+        Average time from creation to closing of the closed issues carrying
+        each label, sorted alphabetically by label.
+        """
+        return aggregations.mean_timedeltas(self.tables['label_close_time'].sums).rename_axis('label')
+
+    def close_time_quantiles(self, by='label', qs=DEFAULT_QUANTILES):
+        """
+        Quantiles qs (columns) of the time from creation to closing of the
+        closed issues of each label, or each creator with by='creator',
+        accurate to the relative accuracy of the sketches.
+        """
+        quantiles = self.tables[f'{by}_close_time'].quantiles(qs)
+        # Rounded to seconds, the sketches are not more precise than that
+        return quantiles.apply(lambda column: pd.to_timedelta(column, unit='ns').dt.round('s')).rename_axis(by)
+
+    def event_count(self, author=None):
+        """Number of events created by author, or of all events if author is None."""
+        counts = self.tables['event_author']
+        if author is None:
+            return int(counts.sum())
+        return int(counts.get(author, 0))
@@ -5,14 +5,25 @@ Starting point of the application. This module is invoked from
 the command line to run the analyses.
 """
 
+import time
+START = time.perf_counter()
+
 import argparse
 
 import config
-from overall_analysis import OverallAnalysis
-from month_issue_analysis import MonthIssueAnalysis
-from issue_close_time_analysis import IssueCloseTimeAnalysis
-from data_loader import DataLoader
-from analysis import Analysis
+from features import FEATURES, parse_features, load_feature, required_fields
+import profiling
+import rendering
+
+def positive_int(value):
+    """argparse type of the counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"expected a whole number of at least 1, got '{value}'")
+    return number
 
 def parse_args():
     """
@@ -27,8 +38,12 @@ def parse_args():
     ap = argparse.ArgumentParser("run.py")
     
     # Required parameter specifying what analysis to run
-    ap.add_argument('--feature', '-f', type=int, required=True,
-                    help='Which of the three features to run')
+    ap.add_argument('--feature', '-f', type=str, nargs='+', required=False,
+                    help='Which of the features to run, e.g. "0", "0 2 3" or "all"')
+
+    # Lists the features instead of running them
+    ap.add_argument('--list-features', action='store_true',
+                    help='List the features that can be run and exit')
     
     # Optional parameter for analyses focusing on a specific user (i.e., contributor)
     ap.add_argument('--user', '-u', type=str, required=False,
@@ -37,42 +52,148 @@ def parse_args():
     # Optional parameter for analyses focusing on a specific label
     ap.add_argument('--label', '-l', type=str, required=False,
                     help='Optional parameter for analyses focusing on a specific label')
+
+    # Optional parameters for the time series of feature 2
+    ap.add_argument('--frequency', type=str, required=False, choices=['day', 'week', 'month', 'year'],
+                    help='Period the issues are counted per in the time series of feature 2 (default: month)')
+    ap.add_argument('--window', type=positive_int, required=False,
+                    help='Number of periods the rolling rates of feature 2 are averaged over (default: 3)')
+
+    # Optional time range the issues are loaded for, applied while the issues file is read
+    ap.add_argument('--since', type=str, required=False,
+                    help='Only load the issues created at or after this date or time (e.g. 2024-01-01)')
+    ap.add_argument('--until', type=str, required=False,
+                    help='Only load the issues created before this date or time')
+
+    # Optional parameters for saving the charts to files instead of showing them
+    ap.add_argument('--output-dir', '-o', type=str, required=False,
+                    help='Render the charts headless into this directory instead of showing them')
+    ap.add_argument('--figure-format', type=str, nargs='+', required=False, choices=['png', 'svg', 'pdf'],
+                    help='Image formats of the charts written to --output-dir (default: png)')
+
+    # Optional repositories of a sharded dataset to run the features on one by one
+    ap.add_argument('--repository', '-r', type=str, nargs='+', required=False,
+                    help='Run the features on each of these repositories of a multi-repository dataset '
+                         'instead of across all of them, or on every repository with "each"')
+
+    # Optional update files merged into the stored dataset before running
+    ap.add_argument('--ingest', type=str, nargs='+', required=False,
+                    help='Delta files or newer snapshots whose new and updated issues are merged into the stored dataset')
+
+    # Reports how long each step of the startup took
+    ap.add_argument('--startup-report', action='store_true',
+                    help='Print the time taken to import, load and run each step')
+
+    # Profiles the pipeline stages, appending the measurements to a JSON lines file
+    ap.add_argument('--profile', type=str, nargs='?', const='profile.jsonl', required=False,
+                    help='Print the wall time, CPU time and peak memory of each pipeline stage '
+                         'and append them to this JSON lines file (default: profile.jsonl)')
     
     return ap.parse_args()
 
 
 
+class StartupReport:
+    """
+    Records the time at which each step finished, counted from the start
+    of run.py, and prints them when enabled with --startup-report.
+    """
+
+    def __init__(self, enabled):
+        self.enabled = enabled
+        self.steps = []
+        self.last = START
+
+    def step(self, name):
+        now = time.perf_counter()
+        self.steps.append((name, now - self.last, now - START))
+        self.last = now
+
+    def print(self):
+        if not self.enabled:
+            return
+        print(f"\n{'step':<30}{'seconds':>10}{'total':>10}")
+        for name, seconds, total in self.steps:
+            print(f"{name:<30}{seconds:>10.3f}{total:>10.3f}")
+
+
 # Parse feature to call from command line arguments
 args = parse_args()
+report = StartupReport(args.startup_report)
+report.step('parse arguments')
+
+if args.list_features:
+    for feature, (_, _, description) in FEATURES.items():
+        print(f"{feature}: {description}")
+    report.step('list features')
+    report.print()
+    raise SystemExit(0)
+
 # Add arguments to config so that they can be accessed in other parts of the application
 config.overwrite_from_args(args)
-    
-# Run the feature specified in the --feature flag
-if args.feature == 0:
-    OverallAnalysis().run() #Analysis of labels
-elif args.feature == 1:
-    # Calling Feature1Analysis with optional filters if provided
-    if args.label == None and args.user == None:
-        print("Please provide a --user or --label argument")
-    else:
-        label = args.label or config.get_parameter('label')  
-        user = args.user or config.get_parameter('creator')  
-        data_loader = DataLoader()
-        df = data_loader.load_and_process_issues()  # This loads your issues data
-    
-    # Initialize the Analysis object
-        analysis = Analysis()  
-    
-    # Filter the issues based on the provided label and creator
-        filtered_df = analysis.filter_issues(df, label=label, creator=user)
-    
-    # Perform the analysis and visualization on the filtered issues
-        analysis.analyze_and_visualize(filtered_df, df)
-    # Initialize the DataLoader and load the DataFrame
-    
-elif args.feature == 2:
-    MonthIssueAnalysis().run() #Analysis of opened and closed tickets based on months
-elif args.feature == 3:
-    IssueCloseTimeAnalysis().run() #Analysis of average time it takes to close various issue types
-else:
+
+try:
+    if not args.feature and not args.ingest:
+        raise ValueError('No feature given.')
+    features = parse_features(args.feature or [])
+except ValueError as e:
+    print(e)
     print('Need to specify which feature to run with --feature flag.')
+    raise SystemExit(2)
+
+analyses = {}
+for feature in features:
+    analyses[feature] = load_feature(feature)
+    report.step(f'import feature {feature}')
+
+# Tracing allocations slows the run down, so it is only started when profiling
+profiler = profiling.Profiler().start() if args.profile else None
+
+# Load the issues once and share them between all selected features, with only
+# the fields they read. Updates are ingested into the dataset with all fields.
+from data_loader import DataLoader, time_range
+try:
+    time_range(args.since, args.until)
+except ValueError as e:
+    print(f"Cannot read the time range of --since/--until: {e}")
+    raise SystemExit(2)
+loader = DataLoader(fields=None if args.ingest else required_fields(analyses.values()))
+dataset = loader.load_dataset()
+report.step('load dataset')
+
+for path in args.ingest or []:
+    loader.ingest(path, dataset)
+    report.step(f'ingest {path}')
+
+# The features run across all repositories, or on each selected repository
+scopes = [(None, dataset)]
+if args.repository:
+    names = dataset.repositories() if args.repository == ['each'] else args.repository
+    unknown = [name for name in names if name not in dataset.shards]
+    if unknown or not names:
+        print(f"Unknown repository {', '.join(unknown) or 'each'}, the dataset has "
+              f"{', '.join(dataset.repositories()) or 'a single repository'}.")
+        raise SystemExit(2)
+    scopes = [(name, dataset.repository(name)) for name in names]
+
+# The charts of all features go to one renderer, so that with --output-dir
+# they are rendered concurrently once every feature has been computed
+renderer = rendering.make_renderer()
+for name, scope in scopes:
+    if name is not None:
+        print(f"\n===== Repository {name} =====")
+    scope_renderer = renderer if name is None else rendering.ScopedRenderer(renderer, name)
+    for feature in features:
+        with profiling.for_feature(feature):
+            analyses[feature]().run(scope, scope_renderer)
+        report.step(f'run feature {feature}' + ('' if name is None else f' on {name}'))
+with profiling.stage('render'):
+    renderer.close()
+report.step('render charts')
+report.print()
+
+if profiler is not None:
+    profiler.stop()
+    profiler.print_table()
+    profiler.write_json_lines(args.profile)
+    print(f"Appended the profile to {args.profile}")
@@ -0,0 +1,291 @@
+"""
+Long-lived query server. It loads the dataset once, keeps it in memory
+together with its label matrix, index and rollups, and answers queries as
+JSON over a local HTTP endpoint, serving requests concurrently:
+
+    GET /features                       the features that can be queried
+    GET /features/<n>?user=&label=      results of feature n, as run.py --feature n
+    GET /issues?label=&creator=&state=  numbers of the matching issues (a filter
+                                        given several times matches any value)
+    GET /status                         size and load time of the dataset
+
+With a dataset of several repositories, the feature and issue queries take
+a repository= parameter to answer for that repository alone.
+
+A background thread polls the issues files and loads them again when one
+changes, or when a shard is added or removed. Queries keep using the
+previous dataset until the new one is ready, then the reference is swapped.
+
+Run from the repository root with:
+    python server.py [--host 127.0.0.1] [--port 8611]
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+import pandas as pd
+
+import config
+from data_loader import DataLoader
+from features import FEATURES, load_feature
+from sketches import LogHistogram
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8611
+
+# Seconds between two checks of the issues files for changes
+DEFAULT_RELOAD_INTERVAL = 2.0
+
+
+class _ThreadOutput(io.TextIOBase):
+    """
+    Stand-in for sys.stdout that sends what a thread prints to that thread's
+    capture buffer, if it has one, so concurrent queries do not mix their
+    output. Everything else goes to the real stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        return (self.stream if buffer is None else buffer).write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+    @contextmanager
+    def capture(self):
+        self.local.buffer = io.StringIO()
+        try:
+            yield self.local.buffer
+        finally:
+            self.local.buffer = None
+
+
+def to_json(value):
+    """Converts analysis results (pandas objects, sketches, numpy scalars) to JSON values."""
+    if isinstance(value, pd.DataFrame):
+        return {
+            'index': [to_json(key) for key in value.index],
+            'columns': [to_json(column) for column in value.columns],
+            'data': [[to_json(v) for v in row] for row in value.itertuples(index=False)],
+        }
+    if isinstance(value, pd.Series):
+        return {'index': [to_json(key) for key in value.index], 'values': [to_json(v) for v in value]}
+    if isinstance(value, LogHistogram):
+        return {'count': value.count, 'mean': to_json(value.mean()),
+                'quantiles': dict(zip(['p50', 'p90', 'p99'], map(to_json, value.quantiles())))}
+    if isinstance(value, dict):
+        return {str(key): to_json(v) for key, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, (pd.Timedelta, np.timedelta64)):
+        value = pd.Timedelta(value)
+        return None if pd.isna(value) else value.total_seconds()
+    if isinstance(value, (pd.Timestamp, pd.Period, datetime)):
+        return None if pd.isna(value) else str(value)
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+class QueryService:
+    """
+    Holds the loaded dataset and answers the queries against it. The dataset
+    is replaced as a whole on reload, so a query works on a single version.
+    """
+
+    def __init__(self, output):
+        self.output = output
+        self.dataset = None
+        # The dataset of each repository of a sharded dataset
+        self.repositories = {}
+        self.loader = None
+        self.source_stat = None
+        self.loaded_at = None
+        self.load_seconds = None
+        self.reloads = 0
+        # Only one load runs at a time
+        self.load_lock = threading.Lock()
+
+    def load(self):
+        with self.load_lock:
+            start = time.perf_counter()
+            loader = DataLoader()
+            source_stat = _stat(loader.file_paths)
+            dataset = loader.load_dataset()
+            repositories = {name: dataset.repository(name) for name in dataset.repositories()}
+            for scope in [dataset, *repositories.values()]:
+                if not scope.issues.empty:
+                    # Build the derived structures now, queries only read them
+                    scope.label_matrix, scope.index, scope.rollups
+            if self.dataset is not None:
+                self.reloads += 1
+            self.loader, self.source_stat = loader, source_stat
+            self.loaded_at = datetime.now(timezone.utc).isoformat()
+            self.load_seconds = time.perf_counter() - start
+            self.dataset, self.repositories = dataset, repositories
+        print(f"Loaded {len(dataset.issues)} issues from {', '.join(loader.file_paths)} in {self.load_seconds:.2f} s")
+
+    def watch(self, interval):
+        """Polls the issues files every interval seconds and reloads them when they changed."""
+        while True:
+            time.sleep(interval)
+            try:
+                # A glob is matched again, to notice added and removed shards
+                if _stat(self.loader.get_file_paths('config.json')) != self.source_stat:
+                    self.load()
+            except Exception as e:
+                # The previous dataset keeps being served
+                print(f"Reloading {', '.join(self.loader.file_paths)} failed: {e}")
+
+    def features(self):
+        return {str(feature): description for feature, (_, _, description) in FEATURES.items()}
+
+    def scope(self, repository=None):
+        """The dataset of the repository, or the whole dataset if None."""
+        if repository is None:
+            return self.dataset
+        if repository not in self.repositories:
+            raise ValueError(f"Unknown repository '{repository}', expected one of {sorted(self.repositories)}")
+        return self.repositories[repository]
+
+    def feature(self, feature, user=None, label=None, repository=None):
+        dataset = self.scope(repository)
+        analysis = load_feature(feature)()
+        analysis.USER = user
+        if hasattr(analysis, 'LABEL'):
+            analysis.LABEL = label
+        with self.output.capture() as output:
+            results = analysis.compute(dataset)
+        return {'feature': feature, 'user': user, 'label': label, 'repository': repository,
+                'output': output.getvalue(), 'results': to_json(results)}
+
+    def issues(self, label=None, creator=None, state=None, limit=None, repository=None):
+        dataset = self.scope(repository)
+        if dataset.issues.empty:
+            return {'count': 0, 'numbers': []}
+        matches = dataset.index.query(label=label, creator=creator, state=state)
+        numbers = dataset.issues['number'].to_numpy()[matches.positions[:limit]]
+        return {'count': len(matches), 'numbers': to_json(list(numbers))}
+
+    def status(self):
+        dataset = self.dataset
+        return {
+            'file_paths': self.loader.file_paths,
+            'repositories': {name: len(scope.issues) for name, scope in self.repositories.items()},
+            'issues': len(dataset.issues),
+            'events': len(dataset.events),
+            'loaded_at': self.loaded_at,
+            'load_seconds': self.load_seconds,
+            'reloads': self.reloads,
+        }
+
+
+def _stat(paths):
+    """Size and modification time of each of the files at paths."""
+    stats = []
+    for path in paths:
+        stat = os.stat(path)
+        stats.append((path, stat.st_size, stat.st_mtime_ns))
+    return stats
+
+
+def _filter(query, name):
+    """A query parameter as a single value, a list if given several times, or None."""
+    values = query.get(name)
+    if not values:
+        return None
+    return values[0] if len(values) == 1 else values
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """Routes GET requests to the QueryService of the server."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        parts = [part for part in url.path.split('/') if part]
+        service = self.server.service
+        try:
+            if parts == ['features']:
+                self.send_json(200, service.features())
+            elif len(parts) == 2 and parts[0] == 'features':
+                feature = int(parts[1]) if parts[1].isdigit() else None
+                if feature not in FEATURES:
+                    self.send_json(404, {'error': f"Unknown feature '{parts[1]}', expected one of {sorted(FEATURES)}"})
+                    return
+                self.send_json(200, service.feature(feature, _filter(query, 'user'), _filter(query, 'label'),
+                                                    _filter(query, 'repository')))
+            elif parts == ['issues']:
+                limit = _filter(query, 'limit')
+                self.send_json(200, service.issues(_filter(query, 'label'), _filter(query, 'creator'),
+                                                   _filter(query, 'state'), int(limit) if limit else None,
+                                                   _filter(query, 'repository')))
+            elif parts == ['status']:
+                self.send_json(200, service.status())
+            else:
+                self.send_json(404, {'error': f"Unknown path '{url.path}'"})
+        except ValueError as e:
+            self.send_json(400, {'error': str(e)})
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+
+def parse_args():
+    ap = argparse.ArgumentParser("server.py")
+    ap.add_argument('--host', type=str, required=False,
+                    help=f'Interface to listen on (default: {DEFAULT_HOST})')
+    ap.add_argument('--port', '-p', type=int, required=False,
+                    help=f'Port to listen on (default: {DEFAULT_PORT})')
+    return ap.parse_args()
+
+
+def main():
+    args = parse_args()
+    host = args.host or config.get_parameter('server_host', DEFAULT_HOST)
+    port = args.port or int(config.get_parameter('server_port', DEFAULT_PORT))
+    interval = float(config.get_parameter('reload_interval', DEFAULT_RELOAD_INTERVAL))
+
+    output = _ThreadOutput(sys.stdout)
+    sys.stdout = output
+    service = QueryService(output)
+    service.load()
+    threading.Thread(target=service.watch, args=(interval,), daemon=True).start()
+
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.service = service
+    print(f"Serving queries on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
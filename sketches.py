@@ -0,0 +1,175 @@
+"""
+Log-bucket histograms: quantile sketches with bounded memory that can be
+updated one value at a time and merged across shards or worker processes.
+
+A value v > 0 falls in bucket ceil(log(v) / log(GAMMA)), with GAMMA =
+(1 + a) / (1 - a) for the relative accuracy a. Every value of a bucket is
+within a relative error a of the bucket's representative value, so any
+quantile is accurate to that error whatever the distribution. Values <= 0
+share ZERO_BUCKET. The number of buckets only grows with the logarithm of
+the range of the values: at 1% accuracy, nanosecond close times from one
+second to a century need fewer than 1100 buckets.
+
+Next to the bucket counts the sketches keep the exact count and sum of the
+values, so means are exact and not estimated from the buckets.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+import aggregations
+
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Bucket of the values <= 0
+ZERO_BUCKET = -(1 << 31)
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+
+def bucket_index(values):
+    """The bucket of each value of the array values."""
+    values = np.asarray(values, dtype=np.float64)
+    buckets = np.full(len(values), ZERO_BUCKET, dtype=np.int64)
+    positive = values > 0
+    buckets[positive] = np.ceil(np.log(values[positive]) / LOG_GAMMA)
+    return buckets
+
+
+def bucket_value(buckets):
+    """The representative value of each bucket, 0 for ZERO_BUCKET."""
+    buckets = np.asarray(buckets, dtype=np.int64)
+    values = 2 * np.power(GAMMA, buckets.astype(np.float64)) / (GAMMA + 1)
+    return np.where(buckets == ZERO_BUCKET, 0.0, values)
+
+
+def _quantiles(buckets, counts, qs):
+    """Quantiles qs of the values counted in the sorted buckets."""
+    cumulative = np.cumsum(counts)
+    if not len(cumulative) or cumulative[-1] <= 0:
+        return [math.nan for _ in qs]
+    # Nearest-rank quantile: the bucket holding the ceil(q * n)-th value
+    ranks = np.maximum(np.ceil(np.asarray(qs) * cumulative[-1]), 1)
+    return list(bucket_value(np.asarray(buckets)[np.searchsorted(cumulative, ranks)]))
+
+
+class LogHistogram:
+    """
+    A single sketch, updated one value (or one array of values) at a time.
+    Sketches of disjoint sets of values merge into the sketch of their union.
+    """
+
+    def __init__(self):
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+
+    def add(self, value, count=1):
+        bucket = ZERO_BUCKET if value <= 0 else math.ceil(math.log(value) / LOG_GAMMA)
+        self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+
+    def update(self, values):
+        """Adds every value of the int64 array values."""
+        values = np.asarray(values, dtype=np.int64)
+        buckets, counts = np.unique(bucket_index(values), return_counts=True)
+        for bucket, count in zip(buckets.tolist(), counts.tolist()):
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += len(values)
+        # Summed as 32 bit halves like exact_sums, so the int64 sum cannot overflow
+        high, low = np.divmod(values, 1 << 32)
+        self.total += (int(high.sum()) << 32) + int(low.sum())
+
+    def merge(self, other):
+        """Adds the values of the sketch other to this one."""
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        buckets = sorted(self.counts)
+        return _quantiles(buckets, [self.counts[b] for b in buckets], qs)
+
+    def quantile(self, q):
+        return self.quantiles([q])[0]
+
+    def histogram(self):
+        """Number of values in each bucket, indexed by its representative value."""
+        buckets = sorted(b for b, count in self.counts.items() if count)
+        return pd.Series([self.counts[b] for b in buckets], index=bucket_value(buckets), dtype=np.int64)
+
+
+class SketchTable:
+    """
+    One log-bucket sketch per key, e.g. of the close times of each label,
+    held as two tables so that many sketches are built, merged and queried
+    with vectorized operations: the bucket counts indexed by (key, bucket)
+    and the exact_sums of the values of each key.
+    """
+
+    def __init__(self, buckets, sums):
+        self.buckets = buckets
+        self.sums = sums
+
+    @classmethod
+    def build(cls, keys, values):
+        """Sketches of the int64 array values, grouped by the matching keys."""
+        keys = np.asarray(keys, dtype=object)
+        values = np.asarray(values, dtype=np.int64)
+        buckets = pd.Series(1, index=pd.MultiIndex.from_arrays([keys, bucket_index(values)], names=['key', 'bucket']),
+                            dtype=np.int64)
+        return cls(buckets.groupby(level=[0, 1], sort=True).sum(), aggregations.exact_sums(keys, values))
+
+    def combine(self, other, sign=1):
+        """The sketches of the values of self plus (or, with sign -1, minus) those of other."""
+        def combine(table, other_table):
+            index = table.index.union(other_table.index)
+            combined = table.reindex(index, fill_value=0) + sign * other_table.reindex(index, fill_value=0)
+            counts = combined['count'] if isinstance(combined, pd.DataFrame) else combined
+            return combined[(counts != 0).to_numpy()].sort_index()
+        return SketchTable(combine(self.buckets, other.buckets), combine(self.sums, other.sums))
+
+    def keys(self):
+        return self.sums.index
+
+    def counts(self):
+        return self.sums['count']
+
+    def totals(self):
+        """The exact sum of the values of each key, as Python ints."""
+        return pd.Series(aggregations.total(self.sums), index=self.sums.index, dtype=object)
+
+    def quantiles(self, qs=DEFAULT_QUANTILES):
+        """DataFrame of the quantiles qs (columns) of the values of each key (rows)."""
+        counts = self.buckets.to_numpy()
+        buckets = self.buckets.index.get_level_values(1).to_numpy()
+        totals = self.buckets.groupby(level=0, sort=True).sum()
+        # The buckets of a key are contiguous, so the rank within a key plus the
+        # counts of all keys before it finds its bucket in the global cumulative counts
+        cumulative = np.cumsum(counts)
+        offsets = np.cumsum(totals.to_numpy()) - totals.to_numpy()
+        columns = {}
+        for q in qs:
+            ranks = np.maximum(np.ceil(q * totals.to_numpy()), 1)
+            columns[q] = bucket_value(buckets[np.searchsorted(cumulative, offsets + ranks)])
+        return pd.DataFrame(columns, index=totals.index.rename(None)).reindex(self.sums.index)
+
+    def sketch(self, key):
+        """The LogHistogram of a single key."""
+        sketch = LogHistogram()
+        if key in self.sums.index:
+            group = self.buckets.xs(key, level=0)
+            sketch.counts = dict(zip(group.index.tolist(), group.tolist()))
+            sketch.count = int(self.sums.at[key, 'count'])
+            sketch.total = aggregations.total(self.sums.loc[[key]])[0]
+        return sketch
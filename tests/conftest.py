@@ -0,0 +1,70 @@
+import json
+import os
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+
+
+def edge_issues():
+    """A small export with the odd issues real exports contain."""
+    return [
+        {'number': 3, 'creator': 'Alice', 'title': ' Crash on install ', 'state': 'closed',
+         'created_date': '2024-01-05T10:00:00+00:00', 'updated_date': '2024-02-01T00:00:00Z',
+         'labels': ['kind/bug'],
+         'events': [{'event_type': 'reopened', 'author': 'carol', 'event_date': '2024-01-20T00:00:00+00:00'},
+                    {'event_type': 'closed', 'author': 'bob', 'event_date': '2024-01-10T00:00:00+00:00'},
+                    {'event_type': 'closed', 'author': ' Dave ', 'event_date': '2024-02-01T00:00:00Z'},
+                    {'event_type': 'labeled', 'author': 'bob', 'event_date': '2024-01-06T00:00:00+00:00',
+                     'label': 'kind/bug'}]},
+        {'number': 1, 'creator': 'bob', 'title': 'Lock is slow', 'state': 'open',
+         'created_date': '2023-11-30T23:00:00-02:00', 'updated_date': '2023-12-01 12:00:00',
+         'labels': ['area/solver', 'kind/feature'], 'events': []},
+        # A second copy of an issue and an issue without a number are dropped
+        {'number': 3, 'creator': 'zed', 'title': 'Duplicate', 'state': 'open',
+         'created_date': '2024-01-05T10:00:00+00:00', 'labels': [], 'events': []},
+        {'creator': 'zed', 'title': 'No number', 'state': 'open', 'created_date': '2024-01-01T00:00:00+00:00'},
+        {'number': 7, 'creator': None, 'title': None, 'state': None, 'created_date': None, 'events': None},
+        {'number': 8, 'creator': None, 'title': None, 'state': 'closed',
+         'created_date': '2024-03-01T00:00:00+00:00', 'labels': None,
+         'events': [{'event_type': 'closed', 'author': 'bob', 'event_date': 'March 2 2024'}]},
+        {'number': 5, 'creator': 'carol', 'title': 'Docs', 'state': 'closed',
+         'created_date': '2024-02-10T08:00:00Z', 'updated_date': '2024-02-12T08:00:00Z',
+         'labels': ['area/docs'],
+         'events': [{'event_type': 'closed', 'author': 'alice', 'event_date': '2024-02-12T08:00:00Z'},
+                    {'event_type': 'commented', 'author': 'bob', 'event_date': '2024-02-11T08:00:00Z'}]},
+    ]
+
+
+def write_export(directory, issues, name='issues.json'):
+    """Writes issues as an export into directory with a config.json naming it, returns the config path."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+    with open(path, 'w') as f:
+        json.dump(issues, f)
+    config_path = os.path.join(directory, 'config.json')
+    with open(config_path, 'w') as f:
+        json.dump({'file_path': path}, f)
+    return config_path
+
+
+@pytest.fixture(params=['edge', 'synthetic'])
+def export(request, tmp_path):
+    """The config path of a small export of odd issues, or of synthetic ones."""
+    issues = edge_issues() if request.param == 'edge' else list(generate_issues(300, seed=1))
+    return write_export(str(tmp_path), issues)
+
+
+def assert_same_rollups(left, right):
+    """Asserts that two Rollups hold the same tables, whatever the order of their rows."""
+    from rollups import Rollups
+    for name in Rollups.TABLES:
+        a, b = left.tables[name], right.tables[name]
+        if hasattr(a, 'buckets'):
+            pd.testing.assert_series_equal(a.buckets.sort_index(), b.buckets.sort_index(), check_names=False)
+            pd.testing.assert_frame_equal(a.sums.sort_index(), b.sums.sort_index())
+        elif isinstance(a, pd.DataFrame):
+            pd.testing.assert_frame_equal(a.sort_index(), b.sort_index(), check_names=False)
+        else:
+            pd.testing.assert_series_equal(a.sort_index(), b.sort_index(), check_names=False)
@@ -0,0 +1,47 @@
+import os
+
+import pandas as pd
+
+from cache import IssueCache
+
+
+def write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def test_store_and_load(tmp_path):
+    source = tmp_path / 'issues.json'
+    write(source, '[]')
+    cache = IssueCache(str(tmp_path / 'cache'))
+    df = pd.DataFrame({'number': [1, 2], 'title': ['a', 'b']})
+    assert cache.load(str(source)) is None
+    cache.store(str(source), df)
+    pd.testing.assert_frame_equal(cache.load(str(source)), df)
+    # Variants are separate entries
+    assert cache.load(str(source), 'events') is None
+
+
+def test_changed_source_invalidates(tmp_path):
+    source = tmp_path / 'issues.json'
+    write(source, '[1]')
+    cache = IssueCache(str(tmp_path / 'cache'))
+    cache.store(str(source), pd.DataFrame({'number': [1]}))
+    stat = os.stat(source)
+    # Same size and modification time, different content
+    write(source, '[2]')
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.load(str(source)) is None
+
+
+def test_updates_are_recorded(tmp_path):
+    source, update = tmp_path / 'issues.json', tmp_path / 'delta.json'
+    write(source, '[]')
+    write(update, '[]')
+    cache = IssueCache(str(tmp_path / 'cache'))
+    cache.store(str(source), pd.DataFrame({'number': [1]}))
+    cache.store(str(source), pd.DataFrame({'number': [1, 2]}), update=str(update))
+    assert [entry['path'] for entry in cache.updates(str(source))] == [str(update)]
+    assert len(cache.load(str(source))) == 2
+    cache.clear(str(source))
+    assert cache.load(str(source)) is None
@@ -0,0 +1,106 @@
+import json
+
+import pandas as pd
+import pytest
+
+from cache import IssueCache
+from data_loader import DataLoader, time_range
+
+
+def load(config_path, **options):
+    options.setdefault('use_cache', False)
+    options.setdefault('workers', 1)
+    return DataLoader(config_path, **options).load_dataset()
+
+
+def assert_same_dataset(left, right):
+    pd.testing.assert_frame_equal(left.to_frame(), right.to_frame())
+    pd.testing.assert_frame_equal(left.events, right.events)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 10000])
+def test_stream_load_matches_list_load(export, chunk_size):
+    assert_same_dataset(load(export), load(export, stream=True, chunk_size=chunk_size))
+
+
+def test_load_and_process_issues_matches_dataset(export):
+    pd.testing.assert_frame_equal(DataLoader(export, use_cache=False, workers=1).load_and_process_issues(),
+                                  load(export).issues)
+
+
+def test_issues_are_cleaned(tmp_path):
+    from tests.conftest import edge_issues, write_export
+    issues = load(write_export(str(tmp_path), edge_issues())).issues
+    assert list(issues['number']) == [1, 3, 5, 8, 7]
+    issue = issues.set_index('number').loc[3]
+    assert issue['title'] == 'crash on install'
+    assert issue['closed_by'] == 'dave'
+    assert issue['closed_at'] == pd.Timestamp('2024-02-01', tz='UTC')
+
+
+def test_date_columns_share_a_time_zone(tmp_path):
+    from tests.conftest import write_export
+    # No issue is closed, and the update dates are naive
+    issues = [{'number': 1, 'creator': 'a', 'title': 'x', 'state': 'open', 'labels': ['kind/bug'],
+               'created_date': '2024-01-05T10:00:00+00:00', 'updated_date': '2024-01-06 10:00:00', 'events': []}]
+    dataset = load(write_export(str(tmp_path), issues))
+    assert {str(dataset.issues[column].dt.tz) for column in ('created_at', 'updated_at', 'closed_at')} == {'UTC'}
+    assert dataset.rollups.label_close_times().empty
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_parallel_load_matches_serial_load(export, stream):
+    assert_same_dataset(load(export), load(export, workers=2, chunk_size=3, stream=stream))
+
+
+def cached_loader(config_path, cache_dir, **options):
+    loader = DataLoader(config_path, use_cache=False, workers=1, **options)
+    loader.cache = IssueCache(cache_dir)
+    return loader
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_cached_load_matches_fresh_load(export, tmp_path, compact):
+    cache_dir = str(tmp_path / 'cache')
+    fresh = cached_loader(export, cache_dir, compact=compact).load_dataset()
+    cached = cached_loader(export, cache_dir, compact=compact).load_dataset()
+    assert_same_dataset(fresh, load(export, compact=compact))
+    assert_same_dataset(cached, fresh)
+    pd.testing.assert_frame_equal(cached.issues, fresh.issues)
+    assert cached.rollups.event_count() == fresh.rollups.event_count()
+
+
+def test_cached_projection_and_range(export, tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    cached_loader(export, cache_dir).load_dataset()
+    fields = ['state', 'closed_at']
+    created = time_range('2020-01-01', '2024-02-01')
+    projected = cached_loader(export, cache_dir, fields=fields, created=created).load_dataset()
+    expected = load(export, fields=fields, created=created)
+    assert_same_dataset(projected, expected)
+    assert list(projected.issues.columns) == ['number', 'state', 'created_at', 'closed_at']
+
+
+def by_issue(events):
+    return events.sort_values('number', kind='stable').reset_index(drop=True)
+
+
+def test_columnar_load_matches_json_load(export, tmp_path):
+    from columnar import write_columnar
+    dataset = load(export, compact=True)
+    write_columnar(dataset, str(tmp_path / 'issues.columnar'))
+    with open(tmp_path / 'columnar.json', 'w') as f:
+        json.dump({'file_path': str(tmp_path / 'issues.columnar')}, f)
+    columnar = load(str(tmp_path / 'columnar.json'))
+    assert columnar.compact
+    pd.testing.assert_frame_equal(columnar.issues, dataset.issues)
+    pd.testing.assert_frame_equal(columnar.to_frame(), dataset.to_frame())
+    # The columnar events are grouped by issue
+    pd.testing.assert_frame_equal(by_issue(columnar.events), by_issue(dataset.events))
+
+    fields, created = ['creator', 'labels', 'events'], time_range('2020-01-01', '2024-02-01')
+    projected = load(str(tmp_path / 'columnar.json'), fields=fields, created=created)
+    expected = load(export, fields=fields, created=created, compact=True)
+    # A range of the columnar dataset keeps the categories of the whole one
+    pd.testing.assert_frame_equal(projected.to_frame(), expected.to_frame(), check_categorical=False)
+    pd.testing.assert_frame_equal(by_issue(projected.events), by_issue(expected.events), check_categorical=False)
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from benchmarks.bench_fetch import expected_export
+from benchmarks.mock_github import REPOSITORY, MockApi, start_server
+from fetch_issues import fetch
+
+
+@pytest.fixture
+def api():
+    api = MockApi(120)
+    server = start_server(api)
+    yield api
+    server.shutdown()
+    server.server_close()
+
+
+def run_fetch(api, output, **options):
+    return asyncio.run(fetch(REPOSITORY, str(output), api.base_url, **options))
+
+
+def read(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def test_fetch_writes_the_export(api, tmp_path):
+    output = tmp_path / 'issues.json'
+    client = run_fetch(api, output, concurrency=4)
+    assert read(output) == expected_export(api, 120)
+    assert client.not_modified == 0
+
+
+def test_conditional_fetch(api, tmp_path):
+    output, cache_dir = tmp_path / 'issues.json', str(tmp_path / 'api')
+    first = run_fetch(api, output, concurrency=4, cache_dir=cache_dir)
+    api.comment(60, 'user1', 'A new comment', '2024-10-02T12:00:00+00:00')
+    second = run_fetch(api, output, concurrency=4, cache_dir=cache_dir)
+    # Only the page listing the commented issue and its timeline changed
+    assert second.requests == first.requests
+    assert second.requests - second.not_modified == 2
+    issue = next(issue for issue in read(output) if issue['number'] == 60)
+    assert issue['events'][-1]['comment'] == 'A new comment'
+
+
+def test_since_fetches_updated_issues(api, tmp_path):
+    output = tmp_path / 'delta.json'
+    api.comment(7, 'user1', 'Late comment', '2030-01-02T12:00:00+00:00')
+    run_fetch(api, output, since='2030-01-01T00:00:00Z')
+    assert [issue['number'] for issue in read(output)] == [7]
+
+
+def test_waits_for_the_rate_limit(tmp_path):
+    api = MockApi(5, rate_limit=3, window=1)
+    server = start_server(api)
+    try:
+        start = time.perf_counter()
+        run_fetch(api, tmp_path / 'issues.json', concurrency=2)
+        # 6 requests at 3 per window have to wait for a reset
+        assert time.perf_counter() - start >= 1
+        assert read(tmp_path / 'issues.json') == expected_export(api, 5)
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,83 @@
+import copy
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from cache import IssueCache
+from data_loader import DataLoader, sort_issues
+from rollups import Rollups
+from tests.conftest import assert_same_rollups, write_export
+
+LATER = '2024-11-01T00:00:00+00:00'
+
+
+def updated_issues():
+    """The base issues, the delta changing them, and the snapshot after the delta."""
+    base = list(generate_issues(200, seed=3))
+    snapshot = copy.deepcopy(base)
+    delta = []
+    for issue in snapshot[::10]:
+        # Closed and relabeled later
+        issue['updated_date'] = LATER
+        issue['state'] = 'closed'
+        issue['labels'] = issue['labels'][1:] + ['status/new-label']
+        issue['events'].append({'event_type': 'closed', 'author': 'maintainer', 'event_date': LATER})
+        delta.append(issue)
+    for issue in generate_issues(210, seed=4):
+        if issue['number'] > 200:
+            issue['created_date'] = '2018-01-01T00:00:00+00:00'
+            snapshot.append(issue)
+            delta.append(issue)
+    # An older version than the stored one is ignored
+    stale = copy.deepcopy(base[5])
+    stale['updated_date'], stale['title'] = '2000-01-01T00:00:00+00:00', 'Stale'
+    delta.append(stale)
+    return base, delta, snapshot
+
+
+def issue_frame(dataset):
+    return sort_issues(dataset.to_frame())
+
+
+def by_issue(events):
+    return events.sort_values(['number', 'event_date'], kind='stable').reset_index(drop=True)
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_upsert_matches_full_reload(tmp_path, compact):
+    base, delta, snapshot = updated_issues()
+    base_config = write_export(str(tmp_path / 'base'), base)
+    delta_path = str(tmp_path / 'delta.json')
+    with open(delta_path, 'w') as f:
+        json.dump(delta, f)
+    snapshot_config = write_export(str(tmp_path / 'snapshot'), snapshot)
+
+    loader = DataLoader(base_config, use_cache=False, workers=1, compact=compact)
+    loader.cache = IssueCache(str(tmp_path / 'cache'))
+    dataset = loader.load_dataset()
+    # The derived structures are patched rather than rebuilt
+    dataset.label_matrix, dataset.index, dataset.rollups
+    dataset = loader.ingest(delta_path, dataset)
+
+    expected = DataLoader(snapshot_config, use_cache=False, workers=1, compact=compact).load_dataset()
+    pd.testing.assert_frame_equal(issue_frame(dataset), issue_frame(expected), check_categorical=False)
+    pd.testing.assert_frame_equal(by_issue(dataset.events), by_issue(expected.events), check_categorical=False)
+    assert_same_rollups(dataset.rollups, Rollups.build(expected.to_frame(), expected.events))
+    for query in ({'label': 'status/new-label'}, {'label': 'kind/bug', 'state': 'closed'}, {'creator': 'user1'}):
+        numbers = sorted(dataset.issues['number'].to_numpy()[dataset.index.query(**query).positions])
+        assert numbers == sorted(expected.issues['number'].to_numpy()[expected.index.query(**query).positions])
+
+    # The next load starts from the stored, updated dataset
+    stored = loader.load_dataset()
+    pd.testing.assert_frame_equal(issue_frame(stored), issue_frame(expected), check_categorical=False)
+    assert_same_rollups(stored.rollups, dataset.rollups)
+
+
+def test_unchanged_issues_are_skipped(tmp_path):
+    base, _, _ = updated_issues()
+    loader = DataLoader(write_export(str(tmp_path), base), use_cache=False, workers=1)
+    dataset = loader.load_dataset()
+    updates, events = loader.load_updates(loader.file_path, dataset.issues)
+    assert updates.empty and events.empty
@@ -0,0 +1,72 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from issue_index import IssueIndex, IssueSet
+from label_matrix import LabelMatrix
+
+
+@pytest.fixture(scope='module')
+def issues():
+    return pd.DataFrame([{'number': raw['number'], 'creator': raw['creator'], 'state': raw['state'],
+                          'labels': raw['labels']} for raw in generate_issues(500, seed=7)])
+
+
+def expected(issues, label=None, creator=None, state=None):
+    mask = np.ones(len(issues), dtype=bool)
+    for column, values in (('creator', creator), ('state', state)):
+        if values is not None:
+            mask &= issues[column].isin(values if isinstance(values, list) else [values]).to_numpy()
+    if label is not None:
+        wanted = set(label if isinstance(label, list) else [label])
+        mask &= issues['labels'].map(lambda labels: bool(wanted & set(labels))).to_numpy()
+    return list(np.flatnonzero(mask))
+
+
+QUERIES = [
+    {},
+    {'label': 'kind/bug'},
+    {'label': ['area/docs', 'area/cli'], 'state': 'open'},
+    {'creator': 'user0', 'state': 'closed'},
+    {'creator': ['user1', 'user2'], 'label': 'kind/bug'},
+    {'label': 'no-such-label'},
+]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_query_matches_scan(issues, query):
+    index = IssueIndex(issues, LabelMatrix.from_lists(issues['labels']))
+    assert list(index.query(**query).positions) == expected(issues, **query)
+
+
+def test_set_operations():
+    a, b = IssueSet(np.array([1, 3, 5]), 7), IssueSet(np.array([3, 4]), 7)
+    assert list((a & b).positions) == [3]
+    assert list((a | b).positions) == [1, 3, 4, 5]
+    assert list((a - b).positions) == [1, 5]
+    assert list((~a).positions) == [0, 2, 4, 6]
+
+
+@pytest.mark.parametrize('query', QUERIES)
+def test_remove_and_insert_match_rebuild(issues, query):
+    labels = LabelMatrix.from_lists(issues['labels'])
+    index = IssueIndex(issues, labels)
+    changed = np.array([0, 10, 20], dtype=np.int64)
+    index.remove(changed)
+
+    updated = issues.copy()
+    new_labels = [['kind/bug'], [], ['area/docs', 'status/new']]
+    updated['labels'] = updated['labels'].astype(object)
+    for position, new in zip(changed, new_labels):
+        updated.at[position, 'labels'] = new
+    updated.loc[changed, 'state'] = 'closed'
+    added = pd.DataFrame({'number': [501], 'creator': ['user0'], 'state': ['open'], 'labels': [['kind/bug']]})
+    updated = pd.concat([updated, added], ignore_index=True)
+    positions = np.append(changed, len(issues))
+    updated_labels = labels.update(positions, LabelMatrix.from_lists(new_labels + [['kind/bug']]))
+    index.insert(updated, updated_labels, positions)
+
+    rebuilt = IssueIndex(updated, LabelMatrix.from_lists(updated['labels']))
+    assert list(index.query(**query).positions) == list(rebuilt.query(**query).positions)
+    assert list(index.query(**query).positions) == expected(updated, **query)
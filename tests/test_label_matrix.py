@@ -0,0 +1,73 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregations
+from data_loader import Dataset, compact_issues, expand_issues
+from label_matrix import LabelMatrix
+
+LISTS = [['kind/bug', 'area/docs'], [], ['area/docs'], ['kind/feature', 'kind/bug', 'area/cli'], []]
+
+
+@pytest.fixture
+def matrix():
+    return LabelMatrix.from_lists(LISTS)
+
+
+def test_round_trip(matrix):
+    assert matrix.to_lists() == LISTS
+    assert matrix.shape == (5, 4)
+    assert list(matrix.lengths()) == [2, 0, 1, 3, 0]
+
+
+def test_counts_match_value_counts(matrix):
+    df = pd.DataFrame({'labels': LISTS})
+    expected = aggregations.label_counts(aggregations.explode_labels(df))
+    pd.testing.assert_series_equal(matrix.counts(), expected, check_names=False, check_index_type=False)
+    mask = np.array([True, False, False, True, True])
+    assert matrix.counts(mask).to_dict() == {'kind/bug': 2, 'area/docs': 1, 'kind/feature': 1, 'area/cli': 1}
+
+
+def test_issue_labels_match_explode(matrix):
+    expected = aggregations.explode_labels(pd.DataFrame({'labels': LISTS}))
+    pd.testing.assert_frame_equal(matrix.issue_labels(), expected)
+
+
+def test_mask_and_postings(matrix):
+    assert list(matrix.mask('area/docs')) == [True, False, True, False, False]
+    assert list(matrix.mask(['area/cli', 'unknown'])) == [False, False, False, True, False]
+    postings = matrix.postings()
+    assert {label: list(rows) for label, rows in postings.items()} == \
+        {'kind/bug': [0, 3], 'area/docs': [0, 2], 'kind/feature': [3], 'area/cli': [3]}
+
+
+def test_take_and_update(matrix):
+    assert matrix.take([3, 0]).to_lists() == [LISTS[3], LISTS[0]]
+    other = LabelMatrix.from_lists([['status/new'], ['area/docs']])
+    updated = matrix.update([1, 5], other)
+    assert updated.to_lists() == [LISTS[0], ['status/new'], *LISTS[2:], ['area/docs']]
+
+
+def test_explode_matches_pandas(matrix):
+    df = pd.DataFrame({'number': range(5), 'labels': LISTS})
+    exploded = matrix.explode(df[['number']])
+    expected = df.explode('labels')
+    assert exploded['number'].tolist() == expected['number'].tolist()
+    assert exploded['labels'].fillna('').tolist() == expected['labels'].fillna('').tolist()
+
+
+def test_compact_dataset_round_trip():
+    issues = pd.DataFrame({
+        'number': [1, 2, 3],
+        'creator': ['a', 'b', None],
+        'title': ['x', 'y', 'z'],
+        'state': ['open', 'closed', 'open'],
+        'labels': [['kind/bug'], [], ['area/docs', 'kind/bug']],
+        'closed_by': [None, 'b', None],
+    })
+    dataset = Dataset(issues).compacted()
+    assert dataset.compact
+    assert str(dataset.issues['creator'].dtype) == 'category'
+    pd.testing.assert_frame_equal(dataset.to_frame(), issues)
+    pd.testing.assert_frame_equal(expand_issues(compact_issues(issues), LabelMatrix.from_lists(issues['labels'])),
+                                  issues)
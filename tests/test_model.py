@@ -0,0 +1,63 @@
+import pandas as pd
+
+from model import pack_dates, parse_date, parse_dates, unpack_dates
+
+
+def test_parse_date_iso_and_fallback():
+    assert parse_date('2024-01-05T10:00:00Z') == parse_date('2024-01-05T10:00:00+00:00')
+    assert parse_date('March 3 2024').month == 3
+    assert parse_date('') is None
+    assert parse_date('not a date') is None
+
+
+def test_parse_dates_github_timestamps():
+    parsed = parse_dates(['2024-01-05T10:00:00Z', '2024-01-06T11:30:00+00:00', None])
+    assert str(parsed.dt.tz) == 'UTC'
+    assert parsed[0] == pd.Timestamp('2024-01-05 10:00', tz='UTC')
+    assert parsed[1] == pd.Timestamp('2024-01-06 11:30', tz='UTC')
+    assert pd.isna(parsed[2])
+
+
+def test_parse_dates_same_dtype_as_pandas():
+    values = ['2024-01-05T10:00:00+00:00', '2024-02-01T00:00:00+00:00']
+    assert parse_dates(values).dtype == pd.to_datetime(pd.Series(values)).dtype
+
+
+def test_parse_dates_mixed_offsets():
+    parsed = parse_dates(['2024-01-05T00:00:00+00:00', '2024-03-01T12:00:00+02:00'])
+    assert list(parsed) == [pd.Timestamp('2024-01-05', tz='UTC'), pd.Timestamp('2024-03-01 10:00', tz='UTC')]
+
+
+def test_parse_dates_offset_and_naive():
+    # Naive timestamps next to ones with an offset are taken to be UTC
+    parsed = parse_dates(['2024-01-05T00:00:00+00:00', '2024-03-01 12:00:00'])
+    assert list(parsed) == [pd.Timestamp('2024-01-05', tz='UTC'), pd.Timestamp('2024-03-01 12:00', tz='UTC')]
+
+
+def test_parse_dates_non_iso_and_invalid():
+    parsed = parse_dates(['2024-01-05T00:00:00+00:00', 'March 3 2024 10:00 +0100', 'junk', '', None])
+    assert parsed[0] == pd.Timestamp('2024-01-05', tz='UTC')
+    assert parsed[1] == pd.Timestamp('2024-03-03 09:00', tz='UTC')
+    assert parsed[2:].isna().all()
+
+
+def test_parse_dates_naive_only():
+    parsed = parse_dates(['2024-01-05 10:00:00', 'March 3 2024'])
+    assert parsed.dt.tz is None
+    assert list(parsed) == [pd.Timestamp('2024-01-05 10:00'), pd.Timestamp('2024-03-03')]
+
+
+def test_parse_dates_all_missing():
+    assert parse_dates([None, None]).isna().all()
+    assert len(parse_dates([])) == 0
+
+
+def test_unpack_dates_matches_parse_dates():
+    cases = [
+        ['2024-01-05T10:00:00Z', None, '2024-02-01T00:00:00+00:00'],
+        ['2024-01-05T00:00:00+00:00', '2024-03-01T12:00:00+02:00', 'junk'],
+        ['2024-01-05T00:00:00+00:00', '2024-03-01 12:00:00'],
+    ]
+    for values in cases:
+        parts = [pack_dates(values[:1]), pack_dates(values[1:])]
+        pd.testing.assert_series_equal(unpack_dates(parts), parse_dates(values))
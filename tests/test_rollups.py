@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from data_loader import Dataset
+from rollups import Rollups
+from tests.conftest import assert_same_rollups, write_export
+
+
+@pytest.fixture(scope='module')
+def dataset(tmp_path_factory):
+    from data_loader import DataLoader
+    config_path = write_export(str(tmp_path_factory.mktemp('export')), list(generate_issues(400, seed=5)))
+    return DataLoader(config_path, use_cache=False, workers=1).load_dataset()
+
+
+def test_tables_match_the_issues(dataset):
+    issues, rollups = dataset.issues, dataset.rollups
+    labels = issues['labels'].explode().dropna()
+    pd.testing.assert_series_equal(rollups.label_counts().sort_index(), labels.value_counts().sort_index(),
+                                   check_names=False)
+    assert rollups.state_counts().to_dict() == issues['state'].value_counts().to_dict()
+    assert rollups.monthly_issue_count().sum() == len(issues)
+    assert rollups.event_count() == len(dataset.events)
+    author = dataset.events['author'].iloc[0]
+    assert rollups.event_count(author) == int((dataset.events['author'] == author).sum())
+
+
+def test_label_close_times(dataset):
+    issues = dataset.issues
+    closed = issues[(issues['state'] == 'closed') & issues['closed_at'].notna()]
+    close_times = (closed['closed_at'] - closed['created_at']).rename('close_time')
+    expected = closed[['labels']].join(close_times).explode('labels').groupby('labels')['close_time'].mean()
+    actual = dataset.rollups.label_close_times()
+    assert list(actual.index) == list(expected.index)
+    assert (actual - expected).abs().max() <= pd.Timedelta(1, 'us')
+
+
+def test_combined_halves_equal_whole(dataset):
+    issues, events = dataset.issues, dataset.events
+    half = len(issues) // 2
+    first, second = issues.iloc[:half], issues.iloc[half:]
+    first_events = events[events['number'].isin(first['number'])]
+    second_events = events[events['number'].isin(second['number'])]
+    left, right = Rollups.build(first, first_events), Rollups.build(second, second_events)
+    assert_same_rollups(left.combine(right), dataset.rollups)
+    assert_same_rollups(dataset.rollups.combine(right, sign=-1), left)
+
+
+def test_projected_rollups_have_their_tables(dataset):
+    rollups = Dataset(dataset.issues[['number', 'state', 'created_at']], fields=('number', 'state', 'created_at')).rollups
+    assert set(rollups.tables) == {'state', 'created_month'}
@@ -0,0 +1,65 @@
+import io
+import json
+import threading
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from data_loader import DataLoader
+from server import QueryHandler, QueryService, ThreadingHTTPServer, _ThreadOutput
+from tests.conftest import write_export
+
+
+@pytest.fixture(scope='module')
+def server(tmp_path_factory):
+    config_path = write_export(str(tmp_path_factory.mktemp('export')), list(generate_issues(200, seed=2)))
+    service = QueryService(_ThreadOutput(io.StringIO()))
+    service.loader = DataLoader(config_path, use_cache=False, workers=1)
+    service.dataset = service.loader.load_dataset()
+    http = ThreadingHTTPServer(('127.0.0.1', 0), QueryHandler)
+    http.service = service
+    threading.Thread(target=http.serve_forever, daemon=True).start()
+    yield f'http://127.0.0.1:{http.server_address[1]}', service
+    http.shutdown()
+    http.server_close()
+
+
+def get(base_url, path):
+    try:
+        with urlopen(base_url + path) as response:
+            return response.status, json.load(response)
+    except HTTPError as e:
+        return e.code, json.load(e)
+
+
+def test_feature_without_user_or_label_is_rejected(server):
+    base_url, _ = server
+    status, body = get(base_url, '/features/1')
+    assert status == 400
+    assert 'user or label' in body['error']
+
+
+def test_feature_with_user(server):
+    base_url, service = server
+    user = service.dataset.issues['creator'].mode()[0]
+    status, body = get(base_url, f'/features/1?user={user}')
+    assert status == 200
+    assert body['user'] == user
+    assert body['results']['creator'] == user
+
+
+def test_issues_query_matches_frame(server):
+    base_url, service = server
+    status, body = get(base_url, '/issues?label=kind/bug&state=open')
+    issues = service.dataset.issues
+    expected = issues[issues['labels'].map(lambda labels: 'kind/bug' in labels) & (issues['state'] == 'open')]
+    assert status == 200
+    assert sorted(body['numbers']) == sorted(expected['number'].tolist())
+    assert body['count'] == len(expected)
+
+
+def test_unknown_feature(server):
+    base_url, _ = server
+    assert get(base_url, '/features/9')[0] == 404
@@ -0,0 +1,62 @@
+import json
+
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from data_loader import DataLoader, repository_names, time_range
+from rollups import Rollups
+from tests.conftest import assert_same_rollups, write_export
+
+
+@pytest.fixture
+def shards(tmp_path):
+    """Config of two shards of the same file name in different folders, and the config of each."""
+    singles = {}
+    for folder, seed, count in (('a', 8, 150), ('b', 9, 100)):
+        singles[f'{folder}-poetry'] = write_export(str(tmp_path / folder), list(generate_issues(count, seed)),
+                                                   name='poetry.json')
+    config_path = str(tmp_path / 'config.json')
+    with open(config_path, 'w') as f:
+        json.dump({'file_path': str(tmp_path / '*' / 'poetry.json')}, f)
+    return config_path, singles
+
+
+def test_repository_names():
+    assert repository_names(['x/poetry.json', 'x/core.json']) == ['poetry', 'core']
+    assert repository_names(['a/poetry.json', 'b/poetry.json']) == ['a-poetry', 'b-poetry']
+    assert repository_names(['poetry.json', 'poetry.json']) == ['poetry-1', 'poetry-2']
+
+
+@pytest.mark.parametrize('compact', [False, True])
+def test_repositories_match_single_loads(shards, compact):
+    config_path, singles = shards
+    dataset = DataLoader(config_path, use_cache=False, workers=1, compact=compact).load_dataset()
+    assert dataset.repositories() == list(singles)
+    assert len(dataset.issues) == 250
+    for name, single_config in singles.items():
+        part = dataset.repository(name)
+        single = DataLoader(single_config, use_cache=False, workers=1).load_dataset()
+        pd.testing.assert_frame_equal(part.to_frame().drop(columns='repository'), single.issues,
+                                      check_categorical=False, check_dtype=False)
+        pd.testing.assert_frame_equal(part.events.drop(columns='repository'), single.events, check_categorical=False)
+        assert_same_rollups(part.rollups, single.rollups)
+    assert_same_rollups(dataset.rollups, Rollups.build(dataset.to_frame(), dataset.events))
+
+
+def test_range_keeps_repositories(shards):
+    config_path, singles = shards
+    created = time_range('2022-01-01', '2023-01-01')
+    dataset = DataLoader(config_path, use_cache=False, workers=1, created=created).load_dataset()
+    for name, single_config in singles.items():
+        single = DataLoader(single_config, use_cache=False, workers=1, created=created).load_dataset()
+        assert list(dataset.repository(name).issues['number']) == list(single.issues['number'])
+
+
+def test_issues_of_every_shard(shards):
+    config_path, _ = shards
+    loader = DataLoader(config_path, use_cache=False, workers=1)
+    assert len(loader.load_and_process_issues()) == 250
+    with pytest.raises(ValueError):
+        loader.load_issues()
+    assert len(loader.load_issues(loader.file_paths[1])) == 100
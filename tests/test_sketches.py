@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from sketches import RELATIVE_ACCURACY, LogHistogram, SketchTable
+
+
+def nearest_rank(values, q):
+    values = np.sort(values)
+    return values[max(math.ceil(q * len(values)), 1) - 1]
+
+
+@pytest.fixture
+def values():
+    return np.random.default_rng(0).lognormal(20, 3, 5000).astype(np.int64)
+
+
+def test_quantiles_within_relative_accuracy(values):
+    sketch = LogHistogram()
+    sketch.update(values)
+    for q, estimate in zip((0.5, 0.9, 0.99), sketch.quantiles()):
+        exact = nearest_rank(values, q)
+        assert abs(estimate - exact) <= RELATIVE_ACCURACY * exact
+
+
+def test_mean_is_exact():
+    sketch = LogHistogram()
+    big = np.full(10, 2**62, dtype=np.int64)
+    sketch.update(big)
+    assert sketch.count == 10
+    assert sketch.total == 10 * 2**62
+    assert sketch.mean() == 2**62
+
+
+def test_add_and_update_agree(values):
+    one, many = LogHistogram(), LogHistogram()
+    for value in values[:500]:
+        one.add(int(value))
+    many.update(values[:500])
+    assert one.counts == many.counts
+    assert one.total == many.total
+
+
+def test_merge_is_sketch_of_union(values):
+    left, right, whole = LogHistogram(), LogHistogram(), LogHistogram()
+    left.update(values[:2000])
+    right.update(values[2000:])
+    whole.update(values)
+    merged = left.merge(right)
+    assert merged.counts == whole.counts
+    assert merged.quantiles() == whole.quantiles()
+
+
+def test_zero_and_empty():
+    sketch = LogHistogram()
+    assert all(math.isnan(q) for q in sketch.quantiles())
+    sketch.update(np.array([0, 0, 5]))
+    assert sketch.quantile(0.5) == 0
+
+
+def test_sketch_table_matches_single_sketches(values):
+    keys = np.array(['a', 'b', 'c'], dtype=object)[np.arange(len(values)) % 3]
+    table = SketchTable.build(keys, values)
+    quantiles = table.quantiles()
+    for key in ('a', 'b', 'c'):
+        sketch = LogHistogram()
+        sketch.update(values[keys == key])
+        assert list(quantiles.loc[key]) == pytest.approx(sketch.quantiles())
+        assert table.sketch(key).counts == sketch.counts
+        assert table.totals()[key] == int(values[keys == key].sum())
+
+
+def test_sketch_table_combine_and_subtract(values):
+    keys = np.array(['a', 'b'], dtype=object)[np.arange(len(values)) % 2]
+    whole = SketchTable.build(keys, values)
+    left, right = SketchTable.build(keys[:1000], values[:1000]), SketchTable.build(keys[1000:], values[1000:])
+    combined = left.combine(right)
+    assert combined.buckets.equals(whole.buckets)
+    assert combined.sums.equals(whole.sums)
+    back = whole.combine(right, sign=-1)
+    assert back.buckets.equals(left.buckets)
+    assert back.sums.equals(left.sums)
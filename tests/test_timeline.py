@@ -0,0 +1,96 @@
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_issues
+from data_loader import DataLoader
+from tests.conftest import write_export
+
+
+def issue(number, created, events, state='closed', labels=()):
+    return {'number': number, 'creator': 'a', 'title': 't', 'state': state, 'labels': list(labels),
+            'created_date': created, 'updated_date': created, 'events': events}
+
+
+def event(event_type, date, label=None):
+    event = {'event_type': event_type, 'author': 'b', 'event_date': date}
+    if label is not None:
+        event['label'] = label
+    return event
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    issues = [
+        # Events out of order: closed, reopened, closed again
+        issue(1, '2024-01-05T00:00:00Z', [event('closed', '2024-02-01T00:00:00Z'),
+                                          event('reopened', '2024-01-20T00:00:00Z'),
+                                          event('closed', '2024-01-10T00:00:00Z')]),
+        # A second close of a closed issue changes nothing
+        issue(2, '2024-01-01T00:00:00Z', [event('closed', '2024-01-03T00:00:00Z'),
+                                          event('closed', '2024-01-09T00:00:00Z')]),
+        # Reopened last, so it is open
+        issue(3, '2024-01-01T00:00:00Z', [event('closed', '2024-01-02T00:00:00Z'),
+                                          event('reopened', '2024-01-04T00:00:00Z')], state='open',
+              labels=['kind/bug']),
+        issue(4, '2024-01-01T00:00:00Z', [event('labeled', '2024-01-02T00:00:00Z', 'area/docs'),
+                                          event('unlabeled', '2024-01-05T00:00:00Z', 'area/docs'),
+                                          event('labeled', '2024-01-03T00:00:00Z', 'kind/bug')],
+              state='open', labels=['kind/bug', 'status/triage']),
+    ]
+    return DataLoader(write_export(str(tmp_path), issues), use_cache=False, workers=1).load_dataset()
+
+
+def utc(*dates):
+    return [pd.Timestamp(date, tz='UTC') for date in dates]
+
+
+def test_intervals_and_reopens(dataset):
+    timeline = dataset.timeline
+    numbers = list(timeline.numbers)
+    intervals = timeline.open_intervals()
+    first = intervals[intervals['number'] == 1]
+    assert list(first['start']) == utc('2024-01-05', '2024-01-20')
+    assert list(first['end']) == utc('2024-01-10', '2024-02-01')
+    assert dict(zip(numbers, timeline.reopen_counts)) == {1: 1, 2: 0, 3: 1, 4: 0}
+    closes = dict(zip(numbers, timeline.final_closes()))
+    assert closes[1] == utc('2024-02-01')[0] and closes[2] == utc('2024-01-03')[0]
+    assert pd.isna(closes[3]) and pd.isna(closes[4])
+    time_open = dict(zip(numbers, timeline.time_open(until='2024-01-10')))
+    assert time_open[1] == pd.Timedelta(days=17)
+    assert time_open[3] == pd.Timedelta(days=7)
+
+
+def test_closed_at_is_final_close(dataset):
+    issues = dataset.issues.set_index('number')
+    assert issues.loc[1, 'closed_at'] == utc('2024-02-01')[0]
+    assert issues.loc[2, 'closed_at'] == utc('2024-01-03')[0]
+    assert pd.isna(issues.loc[3, 'closed_at'])
+
+
+def test_open_at(dataset):
+    timeline = dataset.timeline
+    assert dict(zip(timeline.numbers, timeline.open_at('2024-01-15'))) == {1: False, 2: False, 3: True, 4: True}
+    assert dict(zip(timeline.numbers, timeline.open_at('2024-01-25'))) == {1: True, 2: False, 3: True, 4: True}
+
+
+def test_labels_at(dataset):
+    labels = dataset.timeline.labels_at('2024-01-04')
+    assert sorted(map(tuple, labels[labels['number'] == 4].to_numpy())) == \
+        [(4, 'area/docs'), (4, 'kind/bug'), (4, 'status/triage')]
+    labels = dataset.timeline.labels_at('2024-01-02T12:00:00Z')
+    # kind/bug was added later, status/triage has no event and was there all along
+    assert sorted(labels.loc[labels['number'] == 4, 'label']) == ['area/docs', 'status/triage']
+
+
+def test_closed_at_matches_timeline_with_shuffled_events(tmp_path):
+    issues = list(generate_issues(300, seed=6))
+    rnd = random.Random(0)
+    for raw in issues:
+        rnd.shuffle(raw['events'])
+    dataset = DataLoader(write_export(str(tmp_path), issues), use_cache=False, workers=1).load_dataset()
+    closed = (dataset.issues['state'] == 'closed').to_numpy()
+    final = dataset.timeline.final_closes().to_numpy()
+    assert np.array_equal(dataset.issues['closed_at'].to_numpy()[closed], final[closed])
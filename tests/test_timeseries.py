@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import timeseries
+
+
+def issues(created, closed):
+    return pd.DataFrame({
+        'created_at': pd.to_datetime(created, utc=True),
+        'closed_at': pd.to_datetime(closed, utc=True),
+        'state': ['closed' if date is not None else 'open' for date in closed],
+    })
+
+
+def test_opened_closed_by_month():
+    df = issues(['2024-01-03', '2024-01-20', '2024-03-05', None],
+                ['2024-01-25 00:00', None, '2024-04-01 10:00', '2024-02-01 00:00'])
+    series = timeseries.opened_closed(df, 'month')
+    assert list(series.index) == list(pd.to_datetime(['2024-01-01', '2024-02-01', '2024-03-01', '2024-04-01']))
+    assert series['opened'].tolist() == [2, 0, 1, 0]
+    # The issue without a creation date is left out
+    assert series['closed'].tolist() == [1, 0, 0, 1]
+    assert series['backlog'].tolist() == [1, 1, 2, 1]
+
+
+def test_weeks_start_on_monday():
+    # 2024-01-07 is a Sunday, 2024-01-08 a Monday
+    df = issues(['2024-01-07 23:00', '2024-01-08 00:00'], [None, None])
+    series = timeseries.opened_closed(df, 'week')
+    assert list(series.index) == list(pd.to_datetime(['2024-01-01', '2024-01-08']))
+    assert series['opened'].tolist() == [1, 1]
+
+
+@pytest.mark.parametrize('frequency, alias', [('day', 'D'), ('month', 'MS'), ('year', 'YS')])
+def test_opened_matches_resample(frequency, alias):
+    rng = np.random.default_rng(0)
+    created = pd.to_datetime('2020-01-01', utc=True) + pd.to_timedelta(rng.integers(0, 3 * 365 * 86400, 500), 's')
+    df = pd.DataFrame({'created_at': created, 'closed_at': pd.NaT, 'state': 'open'})
+    series = timeseries.opened_closed(df, frequency)
+    expected = pd.Series(1, index=created.tz_convert(None)).resample(alias).sum()
+    assert series['opened'].tolist() == expected.tolist()
+
+
+def test_no_issues():
+    series = timeseries.opened_closed(issues([], []), 'month')
+    assert series.empty
+
+
+def test_rolling_rates():
+    series = pd.DataFrame({'opened': [3, 0, 3], 'closed': [0, 3, 0]})
+    rates = timeseries.rolling_rates(series, 2)
+    assert rates['opened'].tolist() == [3.0, 1.5, 1.5]
+    assert rates['net'].tolist() == [3.0, 0.0, 0.0]
+
+
+def test_window_must_be_positive(monkeypatch):
+    from month_issue_analysis import MonthIssueAnalysis
+    monkeypatch.setenv('window', '0')
+    with pytest.raises(ValueError):
+        MonthIssueAnalysis()
@@ -0,0 +1,204 @@
+"""
+Timeline of every issue built from the flat events table in one vectorized
+pass: the intervals in which the issue was open, its reopens and final
+close, and the labels it carried at any time.
+
+The closed and reopened events are sorted by issue and date, and an event
+only counts as a transition if it changes the state, so closing an issue
+that is already closed is ignored. Every issue is open from its creation,
+which makes its k-th close the end of its k-th open interval and its k-th
+reopen the start of the next one. All dates are in UTC.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Event types that open or close an issue, and that add or remove a label
+STATE_EVENTS = ['closed', 'reopened']
+LABEL_EVENTS = ['labeled', 'unlabeled']
+
+
+def _naive(dates):
+    """The datetime Series dates as a naive datetime64[ns] array in UTC."""
+    # An empty events table has object columns
+    dates = pd.to_datetime(dates, utc=True)
+    return dates.dt.tz_convert(None).to_numpy().astype('datetime64[ns]')
+
+
+def _utc(dates):
+    """A naive datetime64 array in UTC as a tz-aware datetime Series."""
+    return pd.Series(dates).dt.tz_localize('UTC')
+
+
+def _timestamp(time):
+    """time, anything pd.Timestamp accepts, as a naive datetime64[ns] in UTC (naive times are UTC)."""
+    time = pd.Timestamp(time)
+    if time.tz is not None:
+        time = time.tz_convert('UTC').tz_localize(None)
+    return time.to_datetime64().astype('datetime64[ns]')
+
+
+def issue_positions(issues_df, events):
+    """
+    The position in issues_df of the issue of each event, -1 if it is not one
+    of its issues. In a dataset of several repositories the issue numbers
+    repeat, so the issues are matched by repository and number.
+    """
+    if 'repository' in issues_df.columns and 'repository' in events.columns:
+        issues = pd.MultiIndex.from_arrays([issues_df['repository'].to_numpy(dtype=object),
+                                            issues_df['number'].to_numpy()])
+        return issues.get_indexer(pd.MultiIndex.from_arrays([events['repository'].to_numpy(dtype=object),
+                                                             events['number'].to_numpy()]))
+    return pd.Index(issues_df['number']).get_indexer(events['number'])
+
+
+def _group_starts(groups):
+    """Positions where a new group starts in the sorted array groups."""
+    return np.flatnonzero(np.concatenate([[True], groups[1:] != groups[:-1]])) if len(groups) else np.array([], dtype=np.int64)
+
+
+def _count_before(groups, flags):
+    """Number of set flags before each item within its group, for sorted groups."""
+    counts = np.cumsum(flags) - flags
+    starts = _group_starts(groups)
+    return counts - np.repeat(counts[starts], np.diff(np.append(starts, len(groups))))
+
+
+class Timeline:
+    """
+    The open intervals, reopens and label history of the issues of a
+    DataFrame. Build it with Timeline.build; per-issue arrays are in the
+    order of the issues.
+    """
+
+    def __init__(self, numbers, intervals, reopen_counts, final_close, label_events, labels):
+        self.numbers = numbers
+        # One row per open interval: 'row' (position of the issue), 'start' and
+        # 'end' as naive UTC datetime64, end NaT while the issue is still open
+        self.intervals = intervals
+        # Number of times each issue was reopened
+        self.reopen_counts = reopen_counts
+        # Date of the close that left each issue closed, NaT if it is open
+        self.final_close = final_close
+        # labeled and unlabeled events: 'row', 'label', 'date' and 'added',
+        # sorted by row, label and date
+        self.label_events = label_events
+        # The labels each issue carries now, as a LabelMatrix, or None
+        self.labels = labels
+
+    @classmethod
+    def build(cls, issues_df, events, labels=None):
+        """
+        Computes the timeline of the issues in issues_df from their events
+        table. labels, the LabelMatrix of issues_df, gives the labels of the
+        issues that carry a label without an event that added it.
+        """
+        rows = issue_positions(issues_df, events)
+        dates = _naive(events['event_date'])
+        event_types = events['event_type'].to_numpy(dtype=object)
+        created = _naive(issues_df['created_at'])
+
+        # State events in the order they happened, of each issue in turn
+        state = np.isin(event_types, STATE_EVENTS) & (rows >= 0) & ~np.isnat(dates)
+        row, date, closes = rows[state], dates[state], event_types[state] == 'closed'
+        order = np.lexsort((date, row))
+        row, date, closes = row[order], date[order], closes[order]
+        # Every issue is open before its first event
+        was_open = np.ones(len(row), dtype=bool)
+        was_open[1:] = ~closes[:-1]
+        was_open[_group_starts(row)] = True
+        transition = closes == was_open
+        row, date, closes = row[transition], date[transition], closes[transition]
+        reopens = ~closes
+
+        reopen_counts = np.bincount(row[reopens], minlength=len(issues_df))
+        # Interval k of an issue starts at its creation (k = 0) or its k-th reopen
+        # and ends at its k-th close; the intervals of an issue are consecutive rows
+        first_interval = np.cumsum(reopen_counts + 1) - (reopen_counts + 1)
+        interval_rows = np.repeat(np.arange(len(issues_df)), reopen_counts + 1)
+        starts = created[interval_rows]
+        ordinals = _count_before(row, reopens)
+        starts[first_interval[row[reopens]] + ordinals[reopens] + 1] = date[reopens]
+        ends = np.full(len(interval_rows), np.datetime64('NaT'), dtype='datetime64[ns]')
+        ordinals = _count_before(row, closes)
+        ends[first_interval[row[closes]] + ordinals[closes]] = date[closes]
+
+        # The final close is the last transition of an issue, if it is a close
+        final_close = np.full(len(issues_df), np.datetime64('NaT'), dtype='datetime64[ns]')
+        last = np.append(_group_starts(row)[1:], len(row)) - 1 if len(row) else np.array([], dtype=np.int64)
+        final_close[row[last[closes[last]]]] = date[last[closes[last]]]
+
+        label_event = np.isin(event_types, LABEL_EVENTS) & (rows >= 0) & ~np.isnat(dates) & events['label'].notna().to_numpy()
+        label_events = pd.DataFrame({
+            'row': rows[label_event],
+            'label': events['label'].to_numpy(dtype=object)[label_event],
+            'date': dates[label_event],
+            'added': event_types[label_event] == 'labeled',
+        }).sort_values(['row', 'label', 'date'], kind='stable', ignore_index=True)
+
+        intervals = pd.DataFrame({'row': interval_rows, 'start': starts, 'end': ends})
+        return cls(issues_df['number'].to_numpy(), intervals, reopen_counts, final_close, label_events, labels)
+
+    def open_intervals(self):
+        """Every open interval of every issue, with the issue number and UTC start and end."""
+        return pd.DataFrame({
+            'number': self.numbers[self.intervals['row'].to_numpy()],
+            'start': _utc(self.intervals['start'].to_numpy()),
+            'end': _utc(self.intervals['end'].to_numpy()),
+        })
+
+    def final_closes(self):
+        """The UTC date of the final close of each issue, NaT for the open issues."""
+        return _utc(self.final_close)
+
+    def time_open(self, until=None):
+        """
+        Total time each issue was open, summed over its open intervals. The
+        interval of an issue that is still open counts up to until, or makes
+        its total NaT if until is not given.
+        """
+        starts, ends = self.intervals['start'].to_numpy(), self.intervals['end'].to_numpy()
+        if until is not None:
+            ends = np.where(np.isnat(ends), _timestamp(until), ends)
+        durations = ends - starts
+        missing = np.isnat(durations)
+        if not len(durations):
+            return pd.Series(durations)
+        # Every issue has at least one interval, in consecutive rows
+        starts = _group_starts(self.intervals['row'].to_numpy())
+        totals = np.add.reduceat(np.where(missing, 0, durations.view(np.int64)), starts).view('timedelta64[ns]')
+        totals[np.add.reduceat(missing, starts) > 0] = np.timedelta64('NaT')
+        return pd.Series(totals)
+
+    def open_at(self, time):
+        """Boolean array of the issues that were open at time."""
+        time = _timestamp(time)
+        starts, ends = self.intervals['start'].to_numpy(), self.intervals['end'].to_numpy()
+        within = (starts <= time) & (np.isnat(ends) | (ends > time))
+        return np.bincount(self.intervals['row'].to_numpy()[within], minlength=len(self.numbers)) > 0
+
+    def labels_at(self, time):
+        """
+        The labels the issues carried at time, as a table of (number, label)
+        pairs ordered by issue. A label is on an issue if its last labeled or
+        unlabeled event up to time added it. Without such an event, the first
+        later event tells whether it was there before, and a label without
+        any event is taken to have been there all along.
+        """
+        time = _timestamp(time)
+        events = self.label_events
+        before = (events['date'] <= time).to_numpy()
+        pairs = ['row', 'label']
+        last_before = events[before].drop_duplicates(pairs, keep='last')
+        first_after = events[~before].drop_duplicates(pairs, keep='first')
+        # Pairs with an event up to time are decided by it, the others by their first later event
+        first_after = first_after[~pd.MultiIndex.from_frame(first_after[pairs]).isin(
+            pd.MultiIndex.from_frame(last_before[pairs]))]
+        present = [last_before.loc[last_before['added'], pairs], first_after.loc[~first_after['added'], pairs]]
+        if self.labels is not None:
+            current = self.labels.issue_labels()
+            current = current[~pd.MultiIndex.from_frame(current[pairs]).isin(pd.MultiIndex.from_frame(events[pairs]))]
+            present.append(current[pairs])
+        present = pd.concat(present, ignore_index=True).sort_values('row', kind='stable')
+        return pd.DataFrame({'number': self.numbers[present['row'].to_numpy()],
+                             'label': present['label'].to_numpy(dtype=object)})
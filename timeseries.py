@@ -0,0 +1,83 @@
+"""
+Time series of the issues opened and closed per day, week, month or year,
+with the open-issue backlog at the end of every period.
+
+Dates are binned with datetime64 arithmetic: every timestamp is turned into
+an integer period number counted from the epoch, so the counts of all
+periods come out of one np.bincount over the whole column and the backlog
+is the cumulative sum of the +1 (opened) and -1 (closed) counts. Periods
+are in UTC; weeks start on Monday.
+"""
+
+import numpy as np
+import pandas as pd
+
+import aggregations
+from data_loader import _datetime_keys
+
+# numpy unit and number of units of a period of each frequency
+FREQUENCIES = {
+    'day': ('D', 1),
+    'week': ('D', 7),
+    'month': ('M', 1),
+    'year': ('Y', 1),
+}
+
+# 1970-01-01 was a Thursday, the Monday before it is 3 days earlier
+_WEEK_SHIFT = 3
+
+
+def period_numbers(dates, frequency):
+    """The number of the period of each datetime64 value, counted from the epoch."""
+    unit, step = FREQUENCIES[frequency]
+    numbers = dates.astype(f'datetime64[{unit}]').astype(np.int64)
+    if step > 1:
+        numbers = (numbers + _WEEK_SHIFT) // step
+    return numbers
+
+
+def period_starts(numbers, frequency):
+    """The first instant of each of the numbered periods, as a datetime64 array."""
+    unit, step = FREQUENCIES[frequency]
+    if step > 1:
+        numbers = numbers * step - _WEEK_SHIFT
+    return np.asarray(numbers, dtype=np.int64).astype(f'datetime64[{unit}]').astype('datetime64[s]')
+
+
+def opened_closed(issues_df, frequency='month'):
+    """
+    Number of issues opened and closed in every period from the first to
+    the last one with an issue opened or closed, including empty periods,
+    and the backlog of issues still open at the end of each period. The
+    index holds the start of each period.
+    """
+    created_at = issues_df['created_at']
+    valid = created_at.notna().to_numpy()
+    closed = aggregations.closed_mask(issues_df) & valid
+    opened = period_numbers(_datetime_keys(created_at)[valid], frequency)
+    closed = period_numbers(_datetime_keys(issues_df['closed_at'])[closed], frequency)
+    if not len(opened):
+        return pd.DataFrame({'opened': [], 'closed': [], 'backlog': []}, dtype=np.int64,
+                            index=pd.DatetimeIndex([], name=frequency))
+
+    first = min(opened.min(), closed.min() if len(closed) else opened.min())
+    last = max(opened.max(), closed.max() if len(closed) else opened.max())
+    size = int(last - first + 1)
+    opened_counts = np.bincount(opened - first, minlength=size)
+    closed_counts = np.bincount(closed - first, minlength=size)
+    index = pd.DatetimeIndex(period_starts(np.arange(first, last + 1), frequency), name=frequency)
+    return pd.DataFrame({
+        'opened': opened_counts,
+        'closed': closed_counts,
+        'backlog': np.cumsum(opened_counts - closed_counts),
+    }, index=index)
+
+
+def rolling_rates(series, window):
+    """
+    Issues opened and closed per period, averaged over the trailing window
+    of window periods, and the net growth of the backlog per period.
+    """
+    rates = series[['opened', 'closed']].rolling(window, min_periods=1).mean()
+    rates['net'] = rates['opened'] - rates['closed']
+    return rates